@@ -0,0 +1,24 @@
+import fs from 'fs/promises';
+import path from 'path';
+import { randomUUID } from 'crypto';
+
+// Replace a file's contents all at once: write a temporary file next to it,
+// flush it to disk and rename it over the original, so a crash leaves
+// either the old contents or the new ones, never a mix
+export async function writeFileAtomic(filePath: string, data: string | Buffer) {
+  // Dot-prefixed, so idea index and page readers never pick it up
+  const temporary = path.join(path.dirname(filePath), `.${path.basename(filePath)}.${randomUUID()}.tmp`);
+  try {
+    const file = await fs.open(temporary, 'w');
+    try {
+      await file.writeFile(data);
+      await file.sync();
+    } finally {
+      await file.close();
+    }
+    await fs.rename(temporary, filePath);
+  } catch (error) {
+    await fs.rm(temporary, { force: true });
+    throw error;
+  }
+}
@@ -0,0 +1,299 @@
+import fs from 'fs/promises';
+import path from 'path';
+import readline from 'readline';
+import { pipeline } from 'stream/promises';
+import type { Readable } from 'stream';
+import type { Response } from 'express';
+import JSZip from 'jszip';
+import { PROJECT_IDEAS_DIR, UPLOAD_MAX_FILE_BYTES } from './config.js';
+import { ideaFromMetadata, ideaMetadata, isSafeName, metadataError } from './idea-metadata.js';
+import type { ZipReader } from './zip-reader.js';
+import type { HackathonIdea, IdeaPage } from './types.js';
+
+// Bulk export and import of the catalog, either as NDJSON or as a ZIP with
+// one folder per idea (the same layout POST /upload accepts).
+//
+// NDJSON holds an "idea" record (metadata plus page titles and filenames)
+// followed by one "page" record per page:
+//   {"type":"idea","id":"...","name":"...",...,"pages":[{"title":"...","filename":"..."}]}
+//   {"type":"page","ideaId":"...","title":"...","filename":"...","content":"<h1>...</h1>"}
+
+// Ideas written per batch during an import; progress is reported and the
+// checkpoint saved after each one
+const IMPORT_BATCH_SIZE = 64;
+
+// Ideas written at once within a batch
+const IMPORT_CONCURRENCY = 8;
+
+// Without ZIP64 an archive can't hold more entries than this
+export const MAX_ARCHIVE_ENTRIES = 0xffff;
+
+// Per-idea failures kept for the final report
+const MAX_REPORTED_ERRORS = 100;
+
+// Ids of ideas completed by each import, so an interrupted one can resume
+const CHECKPOINT_DIR = path.join(PROJECT_IDEAS_DIR, '.imports');
+
+export type ImportItem =
+  | { id: string; idea: HackathonIdea }
+  | { id: string; skipped: true }
+  | { id: string; error: string };
+
+// Write one NDJSON line, waiting for the client when its buffer is full.
+// Returns false once the client has gone away.
+export async function writeLine(res: Response, record: unknown): Promise<boolean> {
+  if (res.destroyed) return false;
+  if (!res.write(JSON.stringify(record) + '\n')) {
+    await new Promise<void>(resolve => {
+      const done = () => {
+        res.off('drain', done);
+        res.off('close', done);
+        resolve();
+      };
+      res.on('drain', done);
+      res.on('close', done);
+    });
+  }
+  return !res.destroyed;
+}
+
+export async function exportNdjson(res: Response, ideas: HackathonIdea[]) {
+  res.setHeader('Content-Type', 'application/x-ndjson; charset=utf-8');
+  res.setHeader('Content-Disposition', `attachment; filename="ideas-${exportDate()}.ndjson"`);
+
+  for (const idea of ideas) {
+    if (!await writeLine(res, { type: 'idea', id: idea.id, ...ideaMetadata(idea) })) return;
+    for (const page of idea.pages) {
+      if (!await writeLine(res, { type: 'page', ideaId: idea.id, ...page })) return;
+    }
+  }
+  res.end();
+}
+
+// Whether exportArchive can hold these ideas (one entry per file)
+export function fitsInArchive(ideas: HackathonIdea[]): boolean {
+  const entries = ideas.reduce((total, idea) => total + 1 + idea.pages.length, 0);
+  return entries <= MAX_ARCHIVE_ENTRIES;
+}
+
+export async function exportArchive(res: Response, ideas: HackathonIdea[]) {
+  // Contents are the strings already held by the index, so building the
+  // archive doesn't copy them; output is compressed and sent file by file
+  const zip = new JSZip();
+  for (const idea of ideas) {
+    zip.file(`${idea.id}/metadata.json`, JSON.stringify(ideaMetadata(idea), null, 2));
+    for (const page of idea.pages) {
+      zip.file(`${idea.id}/pages/${page.filename}`, page.content);
+    }
+  }
+
+  res.setHeader('Content-Type', 'application/zip');
+  res.setHeader('Content-Disposition', `attachment; filename="ideas-${exportDate()}.zip"`);
+  await pipeline(
+    zip.generateNodeStream({ type: 'nodebuffer', streamFiles: true, compression: 'DEFLATE' }),
+    res
+  );
+}
+
+function exportDate(): string {
+  return new Date().toISOString().slice(0, 10);
+}
+
+// Validate an imported idea and pair its pages with their contents
+function importedIdea(id: unknown, metadata: any, contents: Map<string, string>): ImportItem {
+  if (!isSafeName(id)) {
+    return { id: String(id), error: 'Invalid idea id' };
+  }
+  // The same checks as POST /upload
+  const invalid = metadataError(metadata);
+  if (invalid) {
+    return { id, error: invalid };
+  }
+
+  const pages: IdeaPage[] = [];
+  for (const pageMeta of metadata.pages) {
+    const content = contents.get(pageMeta.filename);
+    if (content === undefined) {
+      return { id, error: `Missing content for page ${pageMeta.filename}` };
+    }
+    pages.push({ title: pageMeta.title, content, filename: pageMeta.filename });
+  }
+  return { id, idea: ideaFromMetadata(id, metadata, pages) };
+}
+
+// Ideas from an NDJSON stream, one at a time; page contents of skipped
+// ideas are never kept
+export async function* ideasFromNdjson(input: Readable, skip: (id: string) => boolean): AsyncGenerator<ImportItem> {
+  const lines = readline.createInterface({ input, crlfDelay: Infinity });
+  let current: { record: any; contents: Map<string, string>; skipped: boolean } | null = null;
+
+  const finish = (entry: NonNullable<typeof current>): ImportItem => entry.skipped
+    ? { id: entry.record.id, skipped: true }
+    : importedIdea(entry.record.id, entry.record, entry.contents);
+
+  let lineNumber = 0;
+  for await (const line of lines) {
+    lineNumber++;
+    if (!line.trim()) continue;
+
+    let record;
+    try {
+      record = JSON.parse(line);
+    } catch {
+      yield { id: `line ${lineNumber}`, error: 'Invalid JSON' };
+      continue;
+    }
+
+    if (record.type === 'idea') {
+      if (current) yield finish(current);
+      current = { record, contents: new Map(), skipped: skip(record.id) };
+    } else if (record.type === 'page') {
+      if (!current || record.ideaId !== current.record.id) {
+        yield { id: String(record.ideaId), error: `Page record on line ${lineNumber} doesn't follow its idea` };
+      } else if (!current.skipped && typeof record.content === 'string') {
+        current.contents.set(record.filename, record.content);
+      }
+    } else {
+      yield { id: `line ${lineNumber}`, error: `Unknown record type ${record.type}` };
+    }
+  }
+  // A dropped connection ends the lines like a complete upload would
+  if (input.readableAborted) {
+    throw new Error('The upload was interrupted');
+  }
+  if (current) yield finish(current);
+}
+
+// Ideas from a ZIP with one folder per idea, reading one idea at a time
+export async function* ideasFromArchive(zip: ZipReader, skip: (id: string) => boolean): AsyncGenerator<ImportItem> {
+  const ids = new Set<string>();
+  for (const entry of zip.entries) {
+    const id = entry.name.split('/')[0];
+    if (id) ids.add(id);
+  }
+
+  for (const id of ids) {
+    if (skip(id)) {
+      yield { id, skipped: true };
+      continue;
+    }
+
+    const metadataEntry = zip.getEntry(`${id}/metadata.json`);
+    if (!metadataEntry) {
+      yield { id, error: 'Missing metadata.json' };
+      continue;
+    }
+
+    try {
+      const metadata = JSON.parse(await zip.readText(metadataEntry, UPLOAD_MAX_FILE_BYTES));
+      const contents = new Map<string, string>();
+      for (const pageMeta of Array.isArray(metadata.pages) ? metadata.pages : []) {
+        const pageEntry = isSafeName(pageMeta?.filename) && zip.getEntry(`${id}/pages/${pageMeta.filename}`);
+        if (pageEntry) {
+          contents.set(pageMeta.filename, await zip.readText(pageEntry, UPLOAD_MAX_FILE_BYTES));
+        }
+      }
+      yield importedIdea(id, metadata, contents);
+    } catch (error: any) {
+      yield { id, error: error.message };
+    }
+  }
+}
+
+function checkpointPath(importId: string): string {
+  return path.join(CHECKPOINT_DIR, `${importId}.ndjson`);
+}
+
+export function isValidImportId(importId: string): boolean {
+  return /^[A-Za-z0-9_-]{1,64}$/.test(importId);
+}
+
+// Ids already completed by an earlier run of this import
+export async function loadCheckpoint(importId: string): Promise<Set<string>> {
+  try {
+    const data = await fs.readFile(checkpointPath(importId), 'utf-8');
+    return new Set(data.split('\n').filter(Boolean).map(line => JSON.parse(line)));
+  } catch (error: any) {
+    if (error.code === 'ENOENT') return new Set();
+    throw error;
+  }
+}
+
+async function appendCheckpoint(importId: string, ids: string[]) {
+  if (ids.length === 0) return;
+  await fs.mkdir(CHECKPOINT_DIR, { recursive: true });
+  await fs.appendFile(checkpointPath(importId), ids.map(id => JSON.stringify(id) + '\n').join(''));
+}
+
+// Write imported ideas in parallel batches, streaming progress to the
+// client as NDJSON. The checkpoint is removed once the import finishes.
+export async function runImport(
+  res: Response,
+  items: AsyncIterable<ImportItem>,
+  writeIdea: (idea: HackathonIdea) => Promise<void>,
+  importId: string
+) {
+  const counts = { processed: 0, imported: 0, skipped: 0, failed: 0 };
+  const errors: { id: string; error: string }[] = [];
+  const fail = (id: string, error: string) => {
+    counts.failed++;
+    if (errors.length < MAX_REPORTED_ERRORS) errors.push({ id, error });
+  };
+
+  res.setHeader('Content-Type', 'application/x-ndjson; charset=utf-8');
+  await writeLine(res, { type: 'start', importId });
+
+  let reportedAt = 0;
+  const report = async () => {
+    reportedAt = counts.processed;
+    await writeLine(res, { type: 'progress', ...counts });
+  };
+
+  let batch: HackathonIdea[] = [];
+  const flush = async () => {
+    const written: string[] = [];
+    let next = 0;
+    const worker = async () => {
+      while (next < batch.length) {
+        const idea = batch[next++];
+        try {
+          await writeIdea(idea);
+          written.push(idea.id);
+          counts.imported++;
+        } catch (error: any) {
+          fail(idea.id, error.message);
+        }
+      }
+    };
+    await Promise.all(Array.from({ length: Math.min(IMPORT_CONCURRENCY, batch.length) }, worker));
+    batch = [];
+
+    await appendCheckpoint(importId, written);
+    await report();
+  };
+
+  for await (const item of items) {
+    counts.processed++;
+    if ('skipped' in item) {
+      counts.skipped++;
+    } else if ('error' in item) {
+      fail(item.id, item.error);
+    } else {
+      batch.push(item.idea);
+    }
+
+    if (batch.length >= IMPORT_BATCH_SIZE) {
+      await flush();
+    } else if (batch.length === 0 && counts.processed - reportedAt >= IMPORT_BATCH_SIZE) {
+      // Keep reporting while skipping through an already imported stretch
+      await report();
+    }
+  }
+  if (batch.length > 0) {
+    await flush();
+  }
+
+  await fs.rm(checkpointPath(importId), { force: true });
+  await writeLine(res, { type: 'done', ...counts, errors });
+  res.end();
+}
@@ -0,0 +1,75 @@
+import cluster, { type Worker } from 'cluster';
+
+interface BusMessage {
+  bus: string;
+  payload: unknown;
+  // Process id of the worker that published it
+  from: number;
+}
+
+// Sent by the primary when a worker has exited, with its process id
+export const WORKER_EXIT_CHANNEL = 'worker-exit';
+
+function isBusMessage(message: any): message is BusMessage {
+  return typeof message?.bus === 'string';
+}
+
+// Messages between the workers of cluster mode, relayed by the primary, so
+// a change made on one worker (an idea saved, a session ended, a job's
+// progress) reaches the in-memory state of the others. Outside cluster
+// mode there are no other workers and publishing does nothing.
+class ClusterBus {
+  private handlers = new Map<string, ((payload: any, from: number) => void)[]>();
+
+  constructor() {
+    if (cluster.isWorker) {
+      process.on('message', message => {
+        if (isBusMessage(message)) {
+          for (const handler of this.handlers.get(message.bus) ?? []) {
+            handler(message.payload, message.from);
+          }
+        }
+      });
+    }
+  }
+
+  get enabled(): boolean {
+    return cluster.isWorker;
+  }
+
+  // Deliver payload to the channel's handlers in every other worker
+  publish(channel: string, payload: unknown) {
+    if (cluster.isWorker && process.connected) {
+      process.send!({ bus: channel, payload, from: process.pid } satisfies BusMessage);
+    }
+  }
+
+  // handler also gets the process id of the worker that published
+  subscribe(channel: string, handler: (payload: any, from: number) => void) {
+    const handlers = this.handlers.get(channel) ?? [];
+    handlers.push(handler);
+    this.handlers.set(channel, handlers);
+  }
+
+  // In the primary: pass a worker's message on to all the other workers
+  relay(from: Worker, message: unknown) {
+    if (!isBusMessage(message)) return;
+    this.broadcast(message, from);
+  }
+
+  // In the primary: tell the remaining workers that one has exited, so they
+  // can drop state they mirror from it
+  workerExited(worker: Worker) {
+    this.broadcast({ bus: WORKER_EXIT_CHANNEL, payload: worker.process.pid, from: process.pid }, worker);
+  }
+
+  private broadcast(message: BusMessage, except: Worker) {
+    for (const worker of Object.values(cluster.workers ?? {})) {
+      if (worker && worker !== except && worker.isConnected()) {
+        worker.send(message);
+      }
+    }
+  }
+}
+
+export const clusterBus = new ClusterBus();
@@ -0,0 +1,96 @@
+import cluster, { type Worker } from 'cluster';
+import { CLUSTER_WORKERS, PORT, SHUTDOWN_TIMEOUT_MS } from './config.js';
+import { clusterBus } from './cluster-bus.js';
+
+// Cluster mode: runs CLUSTER_WORKERS copies of the server (one per core by
+// default) sharing the port, so request handling uses every core.
+//
+//   SIGHUP           restart the workers one at a time (e.g. after a deploy)
+//   SIGTERM/SIGINT   stop the workers gracefully, then exit
+//
+// Workers that crash are replaced. Changes made by one worker reach the
+// others' in-memory state through the cluster bus.
+
+// A worker that dies sooner than this after starting is replaced only
+// after a pause, so a crash on startup doesn't spin
+const MIN_UPTIME_MS = 5000;
+const RESPAWN_DELAY_MS = 1000;
+
+if (cluster.isPrimary) {
+  const startedAt = new Map<Worker, number>();
+  // Workers being stopped on purpose, which mustn't be replaced
+  const retiring = new Set<Worker>();
+  let shuttingDown = false;
+  let restarting = false;
+
+  const fork = (): Worker => {
+    const worker = cluster.fork();
+    startedAt.set(worker, Date.now());
+    worker.on('message', message => clusterBus.relay(worker, message));
+    return worker;
+  };
+
+  // Ask a worker to finish its requests and exit; resolves once it has
+  const stop = (worker: Worker): Promise<void> => new Promise(resolve => {
+    retiring.add(worker);
+    if (worker.isDead()) return resolve();
+    worker.once('exit', () => resolve());
+    worker.process.kill('SIGTERM');
+    // Its own shutdown has a timeout too; this only catches a stuck process
+    setTimeout(() => worker.process.kill('SIGKILL'), SHUTDOWN_TIMEOUT_MS * 2).unref();
+  });
+
+  const rollingRestart = async () => {
+    if (restarting || shuttingDown) return;
+    restarting = true;
+    console.log('🔄 Restarting workers one at a time...');
+    try {
+      for (const worker of Object.values(cluster.workers ?? {})) {
+        if (!worker || retiring.has(worker)) continue;
+        // Start the replacement first so there is never one worker fewer serving
+        const replacement = fork();
+        await new Promise<void>((resolve, reject) => {
+          replacement.once('listening', () => resolve());
+          replacement.once('exit', () => reject(new Error('Replacement worker exited during startup')));
+        });
+        await stop(worker);
+      }
+      console.log('✅ All workers restarted');
+    } catch (error: any) {
+      console.error('Rolling restart stopped:', error.message);
+    } finally {
+      restarting = false;
+    }
+  };
+
+  const shutdown = async () => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log('🛑 Stopping workers...');
+    await Promise.all(Object.values(cluster.workers ?? {}).map(worker => worker && stop(worker)));
+    process.exit(0);
+  };
+
+  cluster.on('exit', (worker, code, signal) => {
+    const uptime = Date.now() - (startedAt.get(worker) ?? 0);
+    startedAt.delete(worker);
+    clusterBus.workerExited(worker);
+    if (retiring.delete(worker) || shuttingDown) return;
+
+    console.error(`Worker ${worker.process.pid} died (${signal ?? code}); starting a replacement`);
+    setTimeout(() => {
+      if (!shuttingDown) fork();
+    }, uptime < MIN_UPTIME_MS ? RESPAWN_DELAY_MS : 0);
+  });
+
+  process.on('SIGHUP', rollingRestart);
+  process.on('SIGTERM', shutdown);
+  process.on('SIGINT', shutdown);
+
+  console.log(`🧩 Starting ${CLUSTER_WORKERS} workers on port ${PORT} (primary ${process.pid})`);
+  for (let i = 0; i < CLUSTER_WORKERS; i++) {
+    fork();
+  }
+} else {
+  await import('./server.js');
+}
@@ -0,0 +1,68 @@
+import os from 'os';
+import path from 'path';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+// Server
+export const PORT = Number(process.env.PORT) || 3001;
+export const CORS_ORIGIN = process.env.CORS_ORIGIN || 'http://localhost:5173';
+
+// Storage locations (overridable so test workers can each use their own copy)
+export const PROJECT_IDEAS_DIR = process.env.PROJECT_IDEAS_DIR
+  ? path.resolve(process.env.PROJECT_IDEAS_DIR)
+  : path.join(__dirname, '../project_ideas');
+export const SETTINGS_FILE = process.env.SETTINGS_FILE
+  ? path.resolve(process.env.SETTINGS_FILE)
+  : path.join(__dirname, '../settings.json');
+export const SESSIONS_DIR = process.env.SESSIONS_DIR
+  ? path.resolve(process.env.SESSIONS_DIR)
+  : path.join(__dirname, '../sessions');
+
+// Uploads and imports are assembled here before being moved into place;
+// the idea index ignores dot directories
+export const STAGING_DIR = path.join(PROJECT_IDEAS_DIR, '.staging');
+
+// OpenAI-compatible endpoint (point at tests/mock_openai.py to run offline)
+export const OPENAI_BASE_URL = process.env.OPENAI_BASE_URL || undefined;
+
+// Limits for uploaded idea ZIPs, in bytes unless noted
+export const UPLOAD_MAX_ZIP_BYTES = Number(process.env.UPLOAD_MAX_ZIP_BYTES) || 20 * 1024 * 1024;
+export const UPLOAD_MAX_FILE_BYTES = Number(process.env.UPLOAD_MAX_FILE_BYTES) || 2 * 1024 * 1024;
+export const UPLOAD_MAX_EXTRACTED_BYTES = Number(process.env.UPLOAD_MAX_EXTRACTED_BYTES) || 50 * 1024 * 1024;
+export const UPLOAD_MAX_ENTRIES = Number(process.env.UPLOAD_MAX_ENTRIES) || 1000;
+
+// Largest archive accepted by the admin catalog import
+export const IMPORT_MAX_ARCHIVE_BYTES = Number(process.env.IMPORT_MAX_ARCHIVE_BYTES) || 2 * 1024 * 1024 * 1024;
+
+// AI generation jobs: calls to the model at once, tries per job (including
+// the first) and jobs allowed to wait before new ones are turned away
+export const GENERATION_CONCURRENCY = Number(process.env.GENERATION_CONCURRENCY) || 4;
+export const GENERATION_MAX_ATTEMPTS = Number(process.env.GENERATION_MAX_ATTEMPTS) || 3;
+export const GENERATION_MAX_QUEUED = Number(process.env.GENERATION_MAX_QUEUED) || 100;
+
+// Finished AI generations kept for identical requests: where they are
+// saved, how many are kept and for how long
+export const GENERATION_CACHE_FILE = process.env.GENERATION_CACHE_FILE
+  ? path.resolve(process.env.GENERATION_CACHE_FILE)
+  : path.join(__dirname, '../generation-cache.json');
+export const GENERATION_CACHE_MAX_ENTRIES = Number(process.env.GENERATION_CACHE_MAX_ENTRIES) || 500;
+export const GENERATION_CACHE_TTL_MS = Number(process.env.GENERATION_CACHE_TTL_MS) || 24 * 60 * 60 * 1000;
+
+// Where ideas and settings are kept: "files" (project_ideas/ and
+// settings.json) or "sqlite" (a single database; needs better-sqlite3)
+export const STORAGE_ENGINE = process.env.STORAGE_ENGINE === 'sqlite' ? 'sqlite' : 'files';
+export const SQLITE_FILE = process.env.SQLITE_FILE
+  ? path.resolve(process.env.SQLITE_FILE)
+  : path.join(__dirname, '../ideas.db');
+
+// Login sessions: how many are kept in memory in front of storage, and how
+// often expired ones are deleted from it
+export const SESSION_CACHE_MAX_ENTRIES = Number(process.env.SESSION_CACHE_MAX_ENTRIES) || 10000;
+export const SESSION_SWEEP_INTERVAL_MS = Number(process.env.SESSION_SWEEP_INTERVAL_MS) || 10 * 60 * 1000;
+
+// Cluster mode (src/cluster.ts): worker processes sharing the port, and how
+// long a stopping process waits for open requests before closing them
+export const CLUSTER_WORKERS = Number(process.env.CLUSTER_WORKERS) || os.availableParallelism();
+export const SHUTDOWN_TIMEOUT_MS = Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
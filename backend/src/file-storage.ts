@@ -0,0 +1,244 @@
+import fs from 'fs/promises';
+import { mkdirSync, watch } from 'fs';
+import path from 'path';
+import { createHash, randomUUID } from 'crypto';
+import { PROJECT_IDEAS_DIR, SESSIONS_DIR, SETTINGS_FILE, STAGING_DIR } from './config.js';
+import { writeFileAtomic } from './atomic-file.js';
+import { ideaFromMetadata, ideaMetadata, isIdeaId } from './idea-metadata.js';
+import type { StorageEngine, StoredSession } from './storage.js';
+import type { AppSettings, HackathonIdea } from './types.js';
+
+// Idea directories read at once while loading every idea
+const LOAD_CONCURRENCY = 32;
+
+// Session ids come from cookies, so they're hashed rather than used as names
+function sessionPath(sid: string): string {
+  return path.join(SESSIONS_DIR, `${createHash('sha256').update(sid).digest('hex')}.json`);
+}
+
+function serializeMetadata(idea: HackathonIdea): string {
+  return JSON.stringify(ideaMetadata(idea), null, 2);
+}
+
+// Ideas as project_ideas/<id>/metadata.json plus one HTML file per page in
+// project_ideas/<id>/pages, settings in settings.json and one file per login
+// session in sessions/. Files are replaced atomically, and only the ones
+// that changed are written.
+export class FileStorage implements StorageEngine {
+  async loadIdeas(): Promise<HackathonIdea[]> {
+    await fs.mkdir(PROJECT_IDEAS_DIR, { recursive: true });
+    const entries = await fs.readdir(PROJECT_IDEAS_DIR, { withFileTypes: true });
+    const ids = entries.filter(entry => entry.isDirectory() && isIdeaId(entry.name)).map(entry => entry.name);
+
+    const ideas: HackathonIdea[] = [];
+    let next = 0;
+    const worker = async () => {
+      while (next < ids.length) {
+        const idea = await this.loadIdea(ids[next++]);
+        if (idea) {
+          ideas.push(idea);
+        }
+      }
+    };
+    await Promise.all(Array.from({ length: Math.min(LOAD_CONCURRENCY, ids.length) }, worker));
+    return ideas;
+  }
+
+  // Null if missing or unreadable
+  async loadIdea(id: string): Promise<HackathonIdea | null> {
+    const ideaPath = path.join(PROJECT_IDEAS_DIR, id);
+    const pagesDir = path.join(ideaPath, 'pages');
+
+    let metadata;
+    try {
+      const metadataContent = await fs.readFile(path.join(ideaPath, 'metadata.json'), 'utf-8');
+      metadata = JSON.parse(metadataContent);
+    } catch (error: any) {
+      if (error.code !== 'ENOENT' && error.code !== 'ENOTDIR') {
+        console.error(`Error loading idea ${id}:`, error);
+      }
+      return null;
+    }
+
+    // Read pages in parallel, keeping the order specified in metadata
+    const metadataPages: { title: string; filename: string }[] = metadata.pages || [];
+    const contents = await Promise.all(metadataPages.map(async pageMeta => {
+      try {
+        return await fs.readFile(path.join(pagesDir, pageMeta.filename), 'utf-8');
+      } catch (error) {
+        console.error(`Error loading page ${pageMeta.filename}:`, error);
+        return null;
+      }
+    }));
+
+    const pages = [];
+    for (let i = 0; i < metadataPages.length; i++) {
+      const content = contents[i];
+      if (content !== null) {
+        pages.push({
+          title: metadataPages[i].title,
+          content,
+          filename: metadataPages[i].filename
+        });
+      }
+    }
+
+    return ideaFromMetadata(id, metadata, pages);
+  }
+
+  async saveIdea(idea: HackathonIdea, stored: HackathonIdea | undefined): Promise<boolean> {
+    const pagesDir = path.join(PROJECT_IDEAS_DIR, idea.id, 'pages');
+    if (!stored) {
+      await fs.mkdir(pagesDir, { recursive: true });
+    }
+
+    // New and changed pages first, so metadata.json never lists a page
+    // that isn't on disk yet
+    const storedPages = new Map(stored?.pages.map(page => [page.filename, page.content]));
+    const changedPages = idea.pages.filter(page => storedPages.get(page.filename) !== page.content);
+    await Promise.all(changedPages.map(page =>
+      writeFileAtomic(path.join(pagesDir, page.filename), page.content)
+    ));
+
+    const metadata = serializeMetadata(idea);
+    const metadataChanged = !stored || metadata !== serializeMetadata(stored);
+    if (metadataChanged) {
+      await writeFileAtomic(path.join(PROJECT_IDEAS_DIR, idea.id, 'metadata.json'), metadata);
+    }
+
+    // Dropped pages last, once metadata.json no longer lists them
+    const kept = new Set(idea.pages.map(page => page.filename));
+    await Promise.all([...storedPages.keys()]
+      .filter(filename => !kept.has(filename))
+      .map(filename => fs.rm(path.join(pagesDir, filename), { force: true })));
+
+    return metadataChanged || changedPages.length > 0;
+  }
+
+  // The idea is assembled in a staging directory and swapped into place
+  // with renames, so readers never see a partially written idea
+  async replaceIdea(idea: HackathonIdea, stagedDir?: string) {
+    const stagingDir = stagedDir ?? path.join(STAGING_DIR, randomUUID());
+    try {
+      if (!stagedDir) {
+        await fs.mkdir(path.join(stagingDir, 'pages'), { recursive: true });
+        await Promise.all(idea.pages.map(page =>
+          fs.writeFile(path.join(stagingDir, 'pages', page.filename), page.content)
+        ));
+      }
+      await fs.writeFile(path.join(stagingDir, 'metadata.json'), serializeMetadata(idea));
+
+      const ideaDir = path.join(PROJECT_IDEAS_DIR, idea.id);
+      const replacedDir = `${stagingDir}-replaced`;
+      try {
+        await fs.rename(ideaDir, replacedDir);
+      } catch (error: any) {
+        if (error.code !== 'ENOENT') throw error;
+      }
+      await fs.rename(stagingDir, ideaDir);
+      await fs.rm(replacedDir, { recursive: true, force: true });
+    } finally {
+      if (!stagedDir) {
+        await fs.rm(stagingDir, { recursive: true, force: true });
+      }
+    }
+  }
+
+  async deleteIdea(id: string) {
+    await fs.rm(path.join(PROJECT_IDEAS_DIR, id), { recursive: true, force: true });
+  }
+
+  async loadSettings(): Promise<AppSettings> {
+    try {
+      const data = await fs.readFile(SETTINGS_FILE, 'utf-8');
+      return JSON.parse(data);
+    } catch (error: any) {
+      // Only a missing file means the defaults; saves are atomic, so any
+      // other failure is a real problem rather than a write in progress
+      if (error.code === 'ENOENT') {
+        return { requireAdminApproval: false };
+      }
+      throw error;
+    }
+  }
+
+  async saveSettings(settings: AppSettings) {
+    await writeFileAtomic(SETTINGS_FILE, JSON.stringify(settings, null, 2));
+  }
+
+  async loadSession(sid: string): Promise<StoredSession | null> {
+    try {
+      return JSON.parse(await fs.readFile(sessionPath(sid), 'utf-8'));
+    } catch (error: any) {
+      if (error.code !== 'ENOENT') {
+        console.error('Error loading session:', error.message);
+      }
+      return null;
+    }
+  }
+
+  async saveSession(sid: string, session: StoredSession) {
+    await fs.mkdir(SESSIONS_DIR, { recursive: true });
+    await writeFileAtomic(sessionPath(sid), JSON.stringify(session));
+  }
+
+  async deleteSession(sid: string) {
+    await fs.rm(sessionPath(sid), { force: true });
+  }
+
+  async sweepSessions(now: number): Promise<number> {
+    let swept = 0;
+    for (const name of await this.sessionFiles()) {
+      const file = path.join(SESSIONS_DIR, name);
+      try {
+        const session: StoredSession = JSON.parse(await fs.readFile(file, 'utf-8'));
+        if (session.expiresAt > now) continue;
+      } catch (error: any) {
+        // Deleted meanwhile, or unreadable and of no use to anyone
+        if (error.code === 'ENOENT') continue;
+      }
+      await fs.rm(file, { force: true });
+      swept++;
+    }
+    return swept;
+  }
+
+  async countSessions(): Promise<number> {
+    return (await this.sessionFiles()).length;
+  }
+
+  private async sessionFiles(): Promise<string[]> {
+    try {
+      const names = await fs.readdir(SESSIONS_DIR);
+      // Skip temporary files of writes in progress
+      return names.filter(name => name.endsWith('.json') && !name.startsWith('.'));
+    } catch (error: any) {
+      if (error.code === 'ENOENT') return [];
+      throw error;
+    }
+  }
+
+  // Changes made to project_ideas by other tools (init-ideas, the catalog
+  // generator, manual edits), and also this engine's own writes
+  watch(onChange: (id: string) => void): () => void {
+    try {
+      mkdirSync(PROJECT_IDEAS_DIR, { recursive: true });
+      const watcher = watch(PROJECT_IDEAS_DIR, { recursive: true }, (_event, filename) => {
+        if (!filename) return;
+        const id = filename.toString().split(path.sep)[0];
+        if (isIdeaId(id)) {
+          onChange(id);
+        }
+      });
+      watcher.on('error', error => {
+        console.error('Idea watcher error:', error);
+      });
+      return () => watcher.close();
+    } catch (error) {
+      console.error('Could not watch project ideas directory; external changes need a restart:', error);
+      return () => {};
+    }
+  }
+
+  async close() {}
+}
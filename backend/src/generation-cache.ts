@@ -0,0 +1,232 @@
+import fs from 'fs/promises';
+import path from 'path';
+import { createHash } from 'crypto';
+import { writeFileAtomic } from './atomic-file.js';
+import { clusterBus } from './cluster-bus.js';
+import { GENERATION_CACHE_FILE, GENERATION_CACHE_MAX_ENTRIES, GENERATION_CACHE_TTL_MS } from './config.js';
+
+// Quiet period after the last change before the cache is written to disk
+const PERSIST_DEBOUNCE_MS = 1000;
+
+interface CacheEntry<T> {
+  value: T;
+  expiresAt: number;
+}
+
+// Case and whitespace don't change what the model is asked for
+export function normalizePrompt(text: string): string {
+  return text.normalize('NFKC').trim().replace(/\s+/g, ' ').toLowerCase();
+}
+
+// Results of AI generations, so repeating a request (a double click, a retry
+// after a dropped connection) costs no model call. Identical requests that
+// arrive while one is still running share its call. Entries expire after a
+// TTL, the least recently used are dropped past a size limit, and the cache
+// is saved to disk so it survives restarts. Only successful results are
+// kept.
+class GenerationCache<T> {
+  private entries = new Map<string, CacheEntry<T>>();
+  private inFlight = new Map<string, Promise<T>>();
+  private loading: Promise<void> | null = null;
+  private persistTimer: NodeJS.Timeout | null = null;
+  // Keys dropped since the last save, which mustn't come back from the file
+  private dropped = new Set<string>();
+  hits = 0;
+  coalesced = 0;
+  misses = 0;
+
+  // channel names this cache on the cluster bus; results stored or dropped
+  // by one worker are stored or dropped by the others too
+  constructor(
+    private channel: string,
+    private file: string,
+    private maxEntries: number,
+    private ttlMs: number
+  ) {
+    clusterBus.subscribe(channel, ({ key, entry }: { key: string; entry: CacheEntry<T> | null }) => {
+      this.entries.delete(key);
+      if (entry) {
+        this.entries.set(key, entry);
+        this.trim();
+      } else {
+        this.dropped.add(key);
+      }
+    });
+  }
+
+  // Cache key for a request: everything that affects the model's answer
+  key(params: Record<string, unknown>): string {
+    return createHash('sha256').update(JSON.stringify(params)).digest('hex');
+  }
+
+  // Resolves once the saved cache has been read (starting it if needed)
+  ready(): Promise<void> {
+    if (!this.loading) {
+      this.loading = this.load();
+    }
+    return this.loading;
+  }
+
+  // Whether a result is ready for this key without calling the model
+  async has(key: string): Promise<boolean> {
+    await this.ready();
+    return this.fresh(key) !== undefined;
+  }
+
+  // The cached result for key, if any, without counting it as a hit
+  async peek(key: string): Promise<T | undefined> {
+    await this.ready();
+    return this.fresh(key)?.value;
+  }
+
+  // The cached result for key, else the result of the call already running
+  // for it, else the result of generate()
+  async get(key: string, generate: () => Promise<T>): Promise<T> {
+    await this.ready();
+
+    const cached = this.fresh(key);
+    if (cached) {
+      this.hits++;
+      // Move to the back so the least recently used entry is evicted first
+      this.entries.delete(key);
+      this.entries.set(key, cached);
+      return cached.value;
+    }
+
+    let pending = this.inFlight.get(key);
+    if (pending) {
+      this.coalesced++;
+      return pending;
+    }
+
+    this.misses++;
+    pending = generate().then(value => {
+      this.store(key, value);
+      return value;
+    }).finally(() => {
+      this.inFlight.delete(key);
+    });
+    this.inFlight.set(key, pending);
+    return pending;
+  }
+
+  // Forget a result, so the next request for key calls the model again
+  delete(key: string) {
+    this.dropped.add(key);
+    if (this.entries.delete(key)) {
+      this.schedulePersist();
+    }
+    clusterBus.publish(this.channel, { key, entry: null });
+  }
+
+  stats() {
+    const requests = this.hits + this.coalesced + this.misses;
+    return {
+      entries: this.entries.size,
+      inFlight: this.inFlight.size,
+      hits: this.hits,
+      coalesced: this.coalesced,
+      misses: this.misses,
+      // Share of requests answered without a model call of their own
+      hitRate: requests > 0 ? (this.hits + this.coalesced) / requests : 0
+    };
+  }
+
+  private fresh(key: string): CacheEntry<T> | undefined {
+    const entry = this.entries.get(key);
+    if (entry && entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      this.schedulePersist();
+      return undefined;
+    }
+    return entry;
+  }
+
+  private store(key: string, value: T) {
+    const entry = { value, expiresAt: Date.now() + this.ttlMs };
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.trim();
+    this.schedulePersist();
+    clusterBus.publish(this.channel, { key, entry });
+  }
+
+  // Drop the least recently used entries past the size limit
+  private trim() {
+    for (const oldest of this.entries.keys()) {
+      if (this.entries.size <= this.maxEntries) break;
+      this.entries.delete(oldest);
+    }
+  }
+
+  private async load() {
+    // Saved least recently used first, so insertion order is LRU order again
+    for (const [key, entry] of await this.readSaved()) {
+      this.entries.set(key, entry);
+    }
+  }
+
+  // Unexpired entries in the file, least recently used first
+  private async readSaved(): Promise<[string, CacheEntry<T>][]> {
+    let saved: [string, CacheEntry<T>][];
+    try {
+      saved = JSON.parse(await fs.readFile(this.file, 'utf-8'));
+    } catch (error: any) {
+      if (error.code !== 'ENOENT') {
+        console.error('Could not read the saved generation cache:', error.message);
+      }
+      return [];
+    }
+    const now = Date.now();
+    return saved.filter(([, entry]) => entry.expiresAt > now);
+  }
+
+  private schedulePersist() {
+    if (this.persistTimer) return;
+    this.persistTimer = setTimeout(() => {
+      this.persistTimer = null;
+      this.persist().catch(error => {
+        console.error('Failed to save the generation cache:', error);
+      });
+    }, PERSIST_DEBOUNCE_MS);
+    this.persistTimer.unref();
+  }
+
+  // In cluster mode every worker saves to the same file, so entries in it
+  // that this worker doesn't hold (saved by a worker started earlier, or
+  // one that has exited) are kept rather than overwritten
+  private async persist() {
+    const saved = await this.readSaved();
+    const dropped = this.dropped;
+    this.dropped = new Set();
+
+    const merged = new Map<string, CacheEntry<T>>();
+    for (const [key, entry] of saved) {
+      if (!dropped.has(key) && !this.entries.has(key)) {
+        merged.set(key, entry);
+      }
+    }
+    for (const [key, entry] of this.entries) {
+      merged.set(key, entry);
+    }
+    this.entries = merged;
+    this.trim();
+
+    await fs.mkdir(path.dirname(this.file), { recursive: true });
+    await writeFileAtomic(this.file, JSON.stringify([...this.entries]));
+  }
+}
+
+// Validated model output for POST /generate (before it becomes an idea)
+export interface GeneratedIdea {
+  name: string;
+  description: string;
+  pages: { title: string; filename: string; content: string }[];
+}
+
+export const ideaGenerations = new GenerationCache<GeneratedIdea>(
+  'generation',
+  GENERATION_CACHE_FILE,
+  GENERATION_CACHE_MAX_ENTRIES,
+  GENERATION_CACHE_TTL_MS
+);
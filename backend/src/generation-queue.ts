@@ -0,0 +1,306 @@
+import { EventEmitter } from 'events';
+import { randomUUID } from 'crypto';
+import { clusterBus, WORKER_EXIT_CHANNEL } from './cluster-bus.js';
+import { GENERATION_CONCURRENCY, GENERATION_MAX_ATTEMPTS, GENERATION_MAX_QUEUED } from './config.js';
+
+// Exponential backoff between attempts, with jitter so retries of a burst
+// don't hit the provider together
+const RETRY_BASE_DELAY_MS = 1000;
+const RETRY_MAX_DELAY_MS = 30000;
+
+// How long a request for an unknown job waits for another cluster worker to
+// announce it (the client may reach a different worker than started it)
+const REMOTE_JOB_WAIT_MS = 1500;
+
+// How long a finished job's result stays available to late subscribers
+const FINISHED_JOB_TTL_MS = 10 * 60 * 1000;
+
+export type JobKind = 'idea' | 'page';
+export type JobStatus = 'queued' | 'running' | 'retrying' | 'succeeded' | 'failed';
+
+export interface JobSnapshot {
+  id: string;
+  kind: JobKind;
+  owner: string;
+  status: JobStatus;
+  // 1-based place in the queue while status is 'queued'
+  position: number | null;
+  attempts: number;
+  maxAttempts: number;
+  // When the next attempt starts while status is 'retrying'
+  retryAt: string | null;
+  error: string | null;
+  result: unknown;
+  createdAt: string;
+  updatedAt: string;
+}
+
+// Receives output as the model streams it
+export type JobOutput = (text: string) => void;
+
+interface Job extends Omit<JobSnapshot, 'position'> {
+  work: (output: JobOutput) => Promise<unknown>;
+  // Output streamed so far by the current attempt
+  partial: string;
+}
+
+// Failures that another attempt can't fix (bad input, a deleted idea, ...)
+export class PermanentJobError extends Error {}
+
+// Too many jobs are already waiting
+export class QueueFullError extends Error {}
+
+export function isFinished(status: JobStatus): boolean {
+  return status === 'succeeded' || status === 'failed';
+}
+
+function isRetryable(error: any): boolean {
+  if (error instanceof PermanentJobError) return false;
+  // Provider errors: retry rate limits, timeouts and server errors only
+  const status = error?.status;
+  if (typeof status === 'number') {
+    return status === 408 || status === 409 || status === 429 || status >= 500;
+  }
+  // Connection failures and unusable model output
+  return true;
+}
+
+function retryDelay(attempt: number, error: any): number {
+  const retryAfter = Number(error?.headers?.get?.('retry-after'));
+  if (retryAfter > 0) {
+    return Math.min(retryAfter * 1000, RETRY_MAX_DELAY_MS);
+  }
+  const backoff = Math.min(RETRY_BASE_DELAY_MS * 2 ** (attempt - 1), RETRY_MAX_DELAY_MS);
+  return backoff / 2 + Math.random() * backoff / 2;
+}
+
+// AI generations run as background jobs on a fixed number of workers, so a
+// burst of requests waits in line here instead of holding sockets open and
+// tripping the provider's rate limits. Progress is published per job id,
+// and in cluster mode to the other workers too. Each worker has its own
+// pool, so the limit on concurrent generations applies per worker.
+class GenerationQueue {
+  private jobs = new Map<string, Job>();
+  // Jobs running on other cluster workers, as last reported by them, with
+  // the process id of the worker running each
+  private remote = new Map<string, { snapshot: JobSnapshot; partial: string; worker: number }>();
+  private pending: Job[] = [];
+  private running = 0;
+  private events = new EventEmitter();
+
+  constructor(
+    private concurrency: number,
+    private maxAttempts: number,
+    private maxQueued: number
+  ) {
+    // One listener per open progress stream
+    this.events.setMaxListeners(0);
+
+    // In cluster mode a job's progress stream may be opened on any worker
+    clusterBus.subscribe('job', (snapshot: JobSnapshot, worker: number) => this.mirror(snapshot, worker));
+    clusterBus.subscribe('job-output', ({ id, text }: { id: string; text: string }) => {
+      const mirrored = this.remote.get(id);
+      if (mirrored) {
+        mirrored.partial += text;
+        this.events.emit(`${id}:output`, text);
+      }
+    });
+    // Jobs of a worker that crashed or was restarted will never finish
+    clusterBus.subscribe(WORKER_EXIT_CHANNEL, (pid: number) => {
+      for (const { snapshot, worker } of this.remote.values()) {
+        if (worker === pid && !isFinished(snapshot.status)) {
+          this.mirror({
+            ...snapshot,
+            status: 'failed',
+            position: null,
+            retryAt: null,
+            error: 'The server running this generation stopped; please try again',
+            updatedAt: new Date().toISOString()
+          }, worker);
+        }
+      }
+    });
+  }
+
+  // Jobs that won't call the model (e.g. a cached generation) can start
+  // immediately instead of waiting for a worker
+  enqueue(
+    kind: JobKind,
+    owner: string,
+    work: (output: JobOutput) => Promise<unknown>,
+    options: { immediate?: boolean } = {}
+  ): JobSnapshot {
+    if (!options.immediate && this.pending.length >= this.maxQueued) {
+      throw new QueueFullError('Too many generations are waiting; please try again shortly');
+    }
+
+    const now = new Date().toISOString();
+    const job: Job = {
+      id: randomUUID(),
+      kind,
+      owner,
+      status: 'queued',
+      attempts: 0,
+      maxAttempts: this.maxAttempts,
+      retryAt: null,
+      error: null,
+      result: null,
+      createdAt: now,
+      updatedAt: now,
+      work,
+      partial: ''
+    };
+    this.jobs.set(job.id, job);
+    if (options.immediate) {
+      this.run(job);
+    } else {
+      this.pending.push(job);
+      this.pump();
+    }
+    // A job that started has been published already; one left waiting must
+    // be too, so the other cluster workers can answer for it
+    if (job.status === 'queued') {
+      this.publish(job);
+    }
+    return this.snapshot(job);
+  }
+
+  get(id: string): JobSnapshot | undefined {
+    const job = this.jobs.get(id);
+    return job ? this.snapshot(job) : this.remote.get(id)?.snapshot;
+  }
+
+  // Like get(), but in cluster mode waits a little for a job that another
+  // worker has just started and not yet announced here
+  async find(id: string): Promise<JobSnapshot | undefined> {
+    const job = this.get(id);
+    if (job || !clusterBus.enabled) return job;
+    return new Promise(resolve => {
+      const done = () => {
+        clearTimeout(timer);
+        this.events.off(id, done);
+        resolve(this.get(id));
+      };
+      const timer = setTimeout(done, REMOTE_JOB_WAIT_MS);
+      this.events.on(id, done);
+    });
+  }
+
+  // Output streamed so far by the job's current attempt
+  partial(id: string): string {
+    return this.jobs.get(id)?.partial ?? this.remote.get(id)?.partial ?? '';
+  }
+
+  // Call listener with every change to a job, and onOutput with each piece
+  // of streamed output; returns the unsubscribe function. A new attempt
+  // starts its output from scratch.
+  subscribe(id: string, listener: (job: JobSnapshot) => void, onOutput?: JobOutput): () => void {
+    this.events.on(id, listener);
+    if (onOutput) this.events.on(`${id}:output`, onOutput);
+    return () => {
+      this.events.off(id, listener);
+      if (onOutput) this.events.off(`${id}:output`, onOutput);
+    };
+  }
+
+  stats() {
+    return {
+      queued: this.pending.length,
+      running: this.running,
+      concurrency: this.concurrency,
+      jobs: this.jobs.size
+    };
+  }
+
+  private snapshot(job: Job): JobSnapshot {
+    const { work, partial, ...fields } = job;
+    return {
+      ...fields,
+      position: job.status === 'queued' ? this.pending.indexOf(job) + 1 : null
+    };
+  }
+
+  private update(job: Job, changes: Partial<Job>) {
+    Object.assign(job, changes, { updatedAt: new Date().toISOString() });
+    this.publish(job);
+  }
+
+  private publish(job: Job) {
+    const snapshot = this.snapshot(job);
+    this.events.emit(job.id, snapshot);
+    clusterBus.publish('job', snapshot);
+  }
+
+  private mirror(snapshot: JobSnapshot, worker: number) {
+    const mirrored = this.remote.get(snapshot.id);
+    // A new attempt starts its output from scratch
+    const partial = mirrored && mirrored.snapshot.attempts === snapshot.attempts ? mirrored.partial : '';
+    this.remote.set(snapshot.id, { snapshot, partial: isFinished(snapshot.status) ? '' : partial, worker });
+    this.events.emit(snapshot.id, snapshot);
+    if (isFinished(snapshot.status)) {
+      setTimeout(() => this.remote.delete(snapshot.id), FINISHED_JOB_TTL_MS).unref();
+    }
+  }
+
+  private pump() {
+    let started = false;
+    while (this.running < this.concurrency && this.pending.length > 0) {
+      const job = this.pending.shift()!;
+      this.running++;
+      started = true;
+      this.run(job).finally(() => {
+        this.running--;
+        this.pump();
+      });
+    }
+
+    // Everyone still waiting moved up
+    if (started) {
+      for (const job of this.pending) {
+        this.publish(job);
+      }
+    }
+  }
+
+  private async run(job: Job) {
+    this.update(job, { status: 'running', attempts: job.attempts + 1, retryAt: null, partial: '' });
+    try {
+      const result = await job.work(text => {
+        job.partial += text;
+        this.events.emit(`${job.id}:output`, text);
+        clusterBus.publish('job-output', { id: job.id, text });
+      });
+      this.finish(job, { status: 'succeeded', result, error: null });
+    } catch (error: any) {
+      if (job.attempts < job.maxAttempts && isRetryable(error)) {
+        const delay = retryDelay(job.attempts, error);
+        console.warn(`Generation job ${job.id} attempt ${job.attempts} failed, retrying in ${Math.round(delay)}ms:`, error.message);
+        this.update(job, {
+          status: 'retrying',
+          error: error.message,
+          retryAt: new Date(Date.now() + delay).toISOString()
+        });
+        // Back off without holding a worker; the job then goes to the front of the line
+        setTimeout(() => {
+          this.pending.unshift(job);
+          this.update(job, { status: 'queued', retryAt: null });
+          this.pump();
+        }, delay);
+      } else {
+        console.error(`Generation job ${job.id} failed:`, error);
+        this.finish(job, { status: 'failed', error: error.message });
+      }
+    }
+  }
+
+  private finish(job: Job, changes: Partial<Job>) {
+    this.update(job, { ...changes, partial: '' });
+    setTimeout(() => this.jobs.delete(job.id), FINISHED_JOB_TTL_MS).unref();
+  }
+}
+
+export const generationQueue = new GenerationQueue(
+  GENERATION_CONCURRENCY,
+  GENERATION_MAX_ATTEMPTS,
+  GENERATION_MAX_QUEUED
+);
@@ -0,0 +1,198 @@
+import { clusterBus } from './cluster-bus.js';
+import { searchIndex } from './search-index.js';
+import { storage } from './storage.js';
+import type { HackathonIdea, IdeaSummary } from './types.js';
+
+// Quiet period after the last change before an idea is re-read
+const WATCH_DEBOUNCE_MS = 100;
+
+// How long after the idea writer finishes with an idea the storage engine's
+// reports of that write are still taken as its echo and ignored
+const OWN_WRITE_ECHO_MS = 1000;
+
+// A changed idea found missing is looked for once more after this long
+// before it is dropped: replacing an idea briefly moves its directory away
+const MISSING_RECHECK_MS = 1000;
+
+// Every idea held in memory, loaded once from storage and then kept up to
+// date by the write routes, by other cluster workers' writes and by the
+// storage engine's reports of changes made elsewhere (with file storage:
+// init-ideas, the catalog generator, manual edits)
+class IdeaIndex {
+  private ideas = new Map<string, HackathonIdea>();
+  private summaries = new Map<string, IdeaSummary>();
+  private sorted: HackathonIdea[] | null = null;
+  private loading: Promise<void> | null = null;
+  private stopWatching: (() => void) | null = null;
+  private pendingRefreshes = new Map<string, NodeJS.Timeout>();
+  // Ideas the idea writer is writing (with how many writes), and those it
+  // finished with lately
+  private writing = new Map<string, number>();
+  private recentlyWritten = new Map<string, NodeJS.Timeout>();
+
+  // Bumped on every change, so derived data (cached responses) can tell it is stale
+  version = 0;
+
+  constructor() {
+    // Another cluster worker changed an idea
+    clusterBus.subscribe('idea', (id: string) => {
+      this.refresh(id).catch(error => {
+        console.error(`Error refreshing idea ${id}:`, error);
+      });
+    });
+  }
+
+  // Resolves once the initial load has finished (starting it if needed)
+  ready(): Promise<void> {
+    if (!this.loading) {
+      this.loading = this.load().catch(error => {
+        // Let the next request retry instead of caching the failure
+        this.loading = null;
+        throw error;
+      });
+    }
+    return this.loading;
+  }
+
+  get size(): number {
+    return this.ideas.size;
+  }
+
+  // All ideas, ordered by id
+  list(): HackathonIdea[] {
+    if (!this.sorted) {
+      this.sorted = [...this.ideas.values()].sort((a, b) => a.id.localeCompare(b.id));
+    }
+    return this.sorted;
+  }
+
+  get(id: string): HackathonIdea | undefined {
+    return this.ideas.get(id);
+  }
+
+  getSummary(id: string): IdeaSummary | undefined {
+    return this.summaries.get(id);
+  }
+
+  // Position in list() of the first idea whose id sorts after the given one
+  positionAfter(id: string): number {
+    const ideas = this.list();
+    let low = 0;
+    let high = ideas.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (ideas[middle].id.localeCompare(id) <= 0) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return low;
+  }
+
+  set(idea: HackathonIdea) {
+    const { pages, ...metadata } = idea;
+    this.ideas.set(idea.id, idea);
+    this.summaries.set(idea.id, {
+      ...metadata,
+      pages: pages.map(page => ({ title: page.title, filename: page.filename }))
+    });
+    searchIndex.add(idea);
+    this.sorted = null;
+    this.version++;
+  }
+
+  remove(id: string) {
+    this.summaries.delete(id);
+    searchIndex.remove(id);
+    if (this.ideas.delete(id)) {
+      this.sorted = null;
+      this.version++;
+    }
+  }
+
+  // Re-read one idea from storage, dropping it if it no longer exists
+  async refresh(id: string) {
+    const idea = await storage.loadIdea(id);
+    if (idea) {
+      this.set(idea);
+    } else {
+      this.remove(id);
+    }
+  }
+
+  // Called by the idea writer around each write it makes. It updates the
+  // index itself, so the storage engine's reports of the write are ignored
+  beginWrite(id: string) {
+    this.writing.set(id, (this.writing.get(id) ?? 0) + 1);
+  }
+
+  endWrite(id: string) {
+    const count = (this.writing.get(id) ?? 1) - 1;
+    if (count > 0) {
+      this.writing.set(id, count);
+      return;
+    }
+    this.writing.delete(id);
+    clearTimeout(this.recentlyWritten.get(id));
+    const timer = setTimeout(() => this.recentlyWritten.delete(id), OWN_WRITE_ECHO_MS);
+    timer.unref();
+    this.recentlyWritten.set(id, timer);
+  }
+
+  close() {
+    this.stopWatching?.();
+    this.stopWatching = null;
+    for (const timer of [...this.pendingRefreshes.values(), ...this.recentlyWritten.values()]) {
+      clearTimeout(timer);
+    }
+    this.pendingRefreshes.clear();
+    this.recentlyWritten.clear();
+  }
+
+  private async load() {
+    // Start watching first so changes made during the load aren't missed
+    this.stopWatching ??= storage.watch(id => this.scheduleRefresh(id));
+
+    for (const idea of await storage.loadIdeas()) {
+      this.set(idea);
+    }
+  }
+
+  private isOwnWrite(id: string): boolean {
+    return this.writing.has(id) || this.recentlyWritten.has(id);
+  }
+
+  // Coalesce bursts of events (metadata + every page file) into one re-read
+  private scheduleRefresh(id: string) {
+    if (this.isOwnWrite(id)) return;
+    this.refreshLater(id, WATCH_DEBOUNCE_MS, false);
+  }
+
+  private refreshLater(id: string, delayMs: number, missingBefore: boolean) {
+    clearTimeout(this.pendingRefreshes.get(id));
+    this.pendingRefreshes.set(id, setTimeout(() => {
+      this.pendingRefreshes.delete(id);
+      this.refreshChanged(id, missingBefore).catch(error => {
+        console.error(`Error refreshing idea ${id}:`, error);
+      });
+    }, delayMs));
+  }
+
+  // Re-read an idea the storage engine reported changed. One found missing
+  // is looked for again after MISSING_RECHECK_MS and only dropped if it is
+  // still missing then; another reported change starts the wait over
+  private async refreshChanged(id: string, missingBefore: boolean) {
+    if (this.isOwnWrite(id)) return;
+    const idea = await storage.loadIdea(id);
+    if (idea) {
+      this.set(idea);
+    } else if (missingBefore) {
+      this.remove(id);
+    } else {
+      this.refreshLater(id, MISSING_RECHECK_MS, true);
+    }
+  }
+}
+
+export const ideaIndex = new IdeaIndex();
@@ -0,0 +1,68 @@
+import path from 'path';
+import type { HackathonIdea, IdeaPage, IdeaType } from './types.js';
+
+const IDEA_TYPES: IdeaType[] = ['Hackathon idea', 'Project idea', 'Resume project idea'];
+
+// Dot directories (e.g. .staging for uploads in progress) aren't ideas
+export function isIdeaId(name: string): boolean {
+  return name !== '' && !name.startsWith('.');
+}
+
+// Whether a name from user input can be used as an idea directory or page
+// filename: a single path segment that isn't hidden
+export function isSafeName(name: unknown): name is string {
+  return typeof name === 'string' && isIdeaId(name) && path.basename(name) === name;
+}
+
+// Why metadata.json from outside (an upload or an import) can't be stored,
+// or null if it can
+export function metadataError(metadata: any): string | null {
+  if (!metadata?.name || !metadata.author || !metadata.description || !metadata.visibility || !metadata.ideaType || !Array.isArray(metadata.pages)) {
+    return 'Invalid metadata.json format. Required fields: name, author, description, visibility, ideaType, pages (array with title and filename)';
+  }
+  if (metadata.visibility !== 'public' && metadata.visibility !== 'private' && !Array.isArray(metadata.visibility)) {
+    return 'visibility must be "public", "private", or an array of usernames';
+  }
+  if (!IDEA_TYPES.includes(metadata.ideaType)) {
+    return 'ideaType must be one of: "Hackathon idea", "Project idea", "Resume project idea"';
+  }
+  for (const page of metadata.pages) {
+    if (!page?.title || !page.filename) {
+      return 'Each page in metadata must have title and filename';
+    }
+    // Filenames become paths on disk, so they can't point outside pages/
+    if (!isSafeName(page.filename)) {
+      return `Invalid page filename ${page.filename}`;
+    }
+  }
+  return null;
+}
+
+// Build an idea from the contents of its metadata.json, filling in defaults
+export function ideaFromMetadata(id: string, metadata: any, pages: IdeaPage[]): HackathonIdea {
+  return {
+    id,
+    name: metadata.name,
+    author: metadata.author,
+    description: metadata.description || '',
+    visibility: metadata.visibility || 'public',
+    ideaType: metadata.ideaType || 'Hackathon idea',
+    approved: metadata.approved !== undefined ? metadata.approved : true,
+    createdAt: metadata.createdAt || new Date().toISOString(),
+    pages
+  };
+}
+
+// Contents of metadata.json for an idea (the inverse of ideaFromMetadata)
+export function ideaMetadata(idea: HackathonIdea) {
+  return {
+    name: idea.name,
+    author: idea.author,
+    description: idea.description,
+    visibility: idea.visibility,
+    ideaType: idea.ideaType,
+    approved: idea.approved,
+    createdAt: idea.createdAt,
+    pages: idea.pages.map(p => ({ title: p.title, filename: p.filename }))
+  };
+}
@@ -0,0 +1,90 @@
+import { clusterBus } from './cluster-bus.js';
+import { ideaIndex } from './idea-index.js';
+import { storage } from './storage.js';
+import type { HackathonIdea } from './types.js';
+
+interface QueuedSave {
+  idea: HackathonIdea;
+  done: Promise<void>;
+}
+
+// Writes ideas to storage incrementally. Each save is compared with the
+// stored idea and only what changed is written (with file storage,
+// approving an idea rewrites metadata.json and nothing else).
+//
+// Writes to one idea run one at a time. Saves that arrive while one is in
+// progress are batched: only the most recent is written once it finishes,
+// and all of their callers resolve together. In cluster mode the other
+// workers are told which idea changed so they re-read it.
+class IdeaWriter {
+  // Last write scheduled for each idea (never rejects)
+  private tails = new Map<string, Promise<void>>();
+  // Save waiting for its turn, per idea
+  private queued = new Map<string, QueuedSave>();
+
+  save(idea: HackathonIdea): Promise<void> {
+    const queued = this.queued.get(idea.id);
+    if (queued) {
+      queued.idea = idea;
+      return queued.done;
+    }
+
+    const save = { idea } as QueuedSave;
+    save.done = this.after(idea.id, () => {
+      this.queued.delete(idea.id);
+      return this.write(save.idea);
+    });
+    this.queued.set(idea.id, save);
+    return save.done;
+  }
+
+  // Store a complete idea in one step (see StorageEngine.replaceIdea)
+  replace(idea: HackathonIdea, stagedDir?: string): Promise<void> {
+    // Saves made after this must not be folded into one made before it
+    this.queued.delete(idea.id);
+    return this.after(idea.id, async () => {
+      await storage.replaceIdea(idea, stagedDir);
+      ideaIndex.set(idea);
+      clusterBus.publish('idea', idea.id);
+    });
+  }
+
+  remove(id: string): Promise<void> {
+    this.queued.delete(id);
+    return this.after(id, async () => {
+      await storage.deleteIdea(id);
+      ideaIndex.remove(id);
+      clusterBus.publish('idea', id);
+    });
+  }
+
+  // Run task once every earlier write to the idea has finished
+  private after(id: string, task: () => Promise<void>): Promise<void> {
+    const run = (this.tails.get(id) ?? Promise.resolve()).then(async () => {
+      ideaIndex.beginWrite(id);
+      try {
+        await task();
+      } finally {
+        ideaIndex.endWrite(id);
+      }
+    });
+    const tail = run.then(() => {}, () => {});
+    this.tails.set(id, tail);
+    tail.then(() => {
+      if (this.tails.get(id) === tail) this.tails.delete(id);
+    });
+    return run;
+  }
+
+  private async write(idea: HackathonIdea) {
+    await ideaIndex.ready();
+    const changed = await storage.saveIdea(idea, ideaIndex.get(idea.id));
+    // A save that changed nothing leaves cached responses valid
+    if (changed) {
+      ideaIndex.set(idea);
+      clusterBus.publish('idea', idea.id);
+    }
+  }
+}
+
+export const ideaWriter = new IdeaWriter();
@@ -1,11 +1,6 @@
 import fs from 'fs/promises';
 import path from 'path';
-import { fileURLToPath } from 'url';
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
-
-const PROJECT_IDEAS_DIR = path.join(__dirname, '../project_ideas');
+import { PROJECT_IDEAS_DIR } from './config.js';
 
 const defaultIdeas = [
   {
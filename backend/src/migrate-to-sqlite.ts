@@ -0,0 +1,35 @@
+import { PROJECT_IDEAS_DIR, SETTINGS_FILE, SQLITE_FILE } from './config.js';
+import { FileStorage } from './file-storage.js';
+import { SqliteStorage } from './sqlite-storage.js';
+
+// Copy every idea in project_ideas and the settings in settings.json into
+// the SQLite database, in one transaction. Ideas already in the database
+// are replaced, so it is safe to run again. The files are left untouched.
+//
+//   npm run migrate:sqlite   (then start the server with STORAGE_ENGINE=sqlite)
+
+async function migrate() {
+  const files = new FileStorage();
+  const database = new SqliteStorage(SQLITE_FILE);
+
+  console.log(`📁 Reading ideas from ${PROJECT_IDEAS_DIR}`);
+  const started = Date.now();
+  const ideas = await files.loadIdeas();
+  const pages = ideas.reduce((total, idea) => total + idea.pages.length, 0);
+
+  console.log(`🗄️  Writing ${ideas.length} ideas (${pages} pages) to ${SQLITE_FILE}`);
+  try {
+    await database.replaceIdeas(ideas);
+    console.log(`⚙️  Copying settings from ${SETTINGS_FILE}`);
+    await database.saveSettings(await files.loadSettings());
+  } finally {
+    await database.close();
+  }
+
+  console.log(`\n✅ Migrated ${ideas.length} ideas in ${Date.now() - started}ms`);
+}
+
+migrate().catch(error => {
+  console.error('Migration failed:', error.message);
+  process.exitCode = 1;
+});
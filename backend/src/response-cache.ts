@@ -0,0 +1,171 @@
+import type { Request, Response } from 'express';
+import zlib from 'zlib';
+import { promisify } from 'util';
+import { createHash } from 'crypto';
+import { ideaIndex } from './idea-index.js';
+
+const gzip = promisify(zlib.gzip);
+const brotliCompress = promisify(zlib.brotliCompress);
+
+// Bodies smaller than this aren't worth compressing
+const MIN_COMPRESS_BYTES = 1024;
+
+// Upper bound on memory held by cached bodies (raw + encoded variants)
+const MAX_CACHE_BYTES = 64 * 1024 * 1024;
+
+// Brotli's default quality (11) is too slow to run on request paths
+const BROTLI_QUALITY = 5;
+
+type Encoding = 'br' | 'gzip';
+
+interface CachedBody {
+  body: Buffer;
+  etag: string;
+  encoded: Partial<Record<Encoding, Promise<Buffer>>>;
+  size: number;
+}
+
+// Responses differ per visibility class: anonymous, admin (sees everything)
+// or a specific logged-in user (private and shared ideas)
+function viewerKey(req: Request): string {
+  const user = req.session.user;
+  if (!user) return 'anonymous';
+  if (user.role === 'admin') return 'admin';
+  return `user:${user.username}`;
+}
+
+function preferredEncoding(req: Request): Encoding | null {
+  const accepted = String(req.headers['accept-encoding'] ?? '');
+  if (/\bbr\b/.test(accepted)) return 'br';
+  if (/\bgzip\b/.test(accepted)) return 'gzip';
+  return null;
+}
+
+// Serialized (and lazily compressed) GET responses for idea reads. The
+// cache is tied to the idea index version, so any write to the catalog
+// (upload, generate, patch, delete, page changes or files changed on disk)
+// invalidates it. ETags are hashes of the body, so they stay valid across
+// restarts and between cluster workers, whose index versions differ.
+class ResponseCache {
+  private entries = new Map<string, CachedBody>();
+  private bytes = 0;
+  private version = -1;
+  hits = 0;
+  misses = 0;
+  notModified = 0;
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get cachedBytes(): number {
+    return this.bytes;
+  }
+
+  // Send the JSON produced by build(), reusing the cached body (and its
+  // compressed variants) until the catalog changes
+  async send(req: Request, res: Response, build: () => unknown) {
+    // Everything cached for an older catalog is stale
+    const version = ideaIndex.version;
+    if (version !== this.version) {
+      this.clear();
+      this.version = version;
+    }
+
+    const key = `${viewerKey(req)} ${req.originalUrl}`;
+    let entry = this.entries.get(key);
+    if (entry) {
+      this.hits++;
+      // Move to the back so the least recently used entry is evicted first
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+    } else {
+      this.misses++;
+      const body = Buffer.from(JSON.stringify(build()));
+      const etag = `"${createHash('sha1').update(body).digest('base64url')}"`;
+      entry = { body, etag, encoded: {}, size: body.length };
+      this.store(key, entry);
+    }
+
+    res.setHeader('ETag', entry.etag);
+    res.setHeader('Cache-Control', 'private, no-cache');
+    res.setHeader('Vary', 'Accept-Encoding, Cookie');
+
+    const ifNoneMatch = req.headers['if-none-match'];
+    if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === entry.etag)) {
+      this.notModified++;
+      return res.status(304).end();
+    }
+
+    res.setHeader('Content-Type', 'application/json; charset=utf-8');
+
+    const encoding = entry.body.length >= MIN_COMPRESS_BYTES ? preferredEncoding(req) : null;
+    if (!encoding) {
+      return res.end(entry.body);
+    }
+
+    const encoded = await this.encode(key, entry, encoding);
+    res.setHeader('Content-Encoding', encoding);
+    res.end(encoded);
+  }
+
+  clear() {
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  stats() {
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      hits: this.hits,
+      misses: this.misses,
+      notModified: this.notModified
+    };
+  }
+
+  private encode(key: string, entry: CachedBody, encoding: Encoding): Promise<Buffer> {
+    let encoded = entry.encoded[encoding];
+    if (!encoded) {
+      // Cache the promise so concurrent requests share one compression
+      encoded = encoding === 'br'
+        ? brotliCompress(entry.body, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: BROTLI_QUALITY } })
+        : gzip(entry.body);
+      entry.encoded[encoding] = encoded;
+      encoded.then(buffer => {
+        // Only count it if the entry wasn't evicted while compressing
+        if (this.entries.get(key) === entry) {
+          entry.size += buffer.length;
+          this.bytes += buffer.length;
+          this.trim();
+        }
+      }, () => {
+        delete entry.encoded[encoding];
+      });
+    }
+    return encoded;
+  }
+
+  private store(key: string, entry: CachedBody) {
+    this.entries.set(key, entry);
+    this.bytes += entry.size;
+    this.trim();
+  }
+
+  private evict(key: string) {
+    const entry = this.entries.get(key);
+    if (entry) {
+      this.bytes -= entry.size;
+      this.entries.delete(key);
+    }
+  }
+
+  private trim() {
+    for (const key of this.entries.keys()) {
+      if (this.bytes <= MAX_CACHE_BYTES || this.entries.size <= 1) break;
+      this.evict(key);
+    }
+  }
+}
+
+export const responseCache = new ResponseCache();
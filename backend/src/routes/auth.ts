@@ -1,4 +1,5 @@
 import express from 'express';
+import { sessionStore } from '../session-store.js';
 import type { User } from '../types.js';
 
 const router = express.Router();
@@ -74,4 +75,13 @@ export const requireAdmin = (req: express.Request, res: express.Response, next:
   next();
 };
 
+// Stored and cached login sessions (admin only)
+router.get('/sessions/stats', requireAdmin, async (req, res) => {
+  try {
+    res.json(await sessionStore.stats());
+  } catch (error: any) {
+    res.status(500).json({ error: 'Failed to count sessions', message: error.message });
+  }
+});
+
 export default router;
@@ -1,12 +1,45 @@
 import express from 'express';
 import multer from 'multer';
-import JSZip from 'jszip';
 import fs from 'fs/promises';
+import { createWriteStream } from 'fs';
+import { pipeline } from 'stream/promises';
 import path from 'path';
+import { randomUUID } from 'crypto';
 import { fileURLToPath } from 'url';
 import OpenAI from 'openai';
 import { requireAuth, requireAdmin } from './auth.js';
-import type { HackathonIdea, AppSettings } from '../types.js';
+import {
+  STAGING_DIR,
+  OPENAI_BASE_URL,
+  UPLOAD_MAX_ZIP_BYTES,
+  UPLOAD_MAX_FILE_BYTES,
+  UPLOAD_MAX_EXTRACTED_BYTES,
+  UPLOAD_MAX_ENTRIES,
+  IMPORT_MAX_ARCHIVE_BYTES
+} from '../config.js';
+import { clusterBus } from '../cluster-bus.js';
+import { ideaIndex } from '../idea-index.js';
+import { isSafeName, metadataError } from '../idea-metadata.js';
+import { ideaWriter } from '../idea-writer.js';
+import { settingsStore } from '../settings-store.js';
+import { searchIndex } from '../search-index.js';
+import { responseCache } from '../response-cache.js';
+import { ZipReader, ZipFormatError, ZipLimitError } from '../zip-reader.js';
+import { ideaGenerations, normalizePrompt, type GeneratedIdea } from '../generation-cache.js';
+import { generationQueue, isFinished, PermanentJobError, QueueFullError, type JobSnapshot } from '../generation-queue.js';
+import {
+  MAX_ARCHIVE_ENTRIES,
+  exportArchive,
+  exportNdjson,
+  fitsInArchive,
+  ideasFromArchive,
+  ideasFromNdjson,
+  isValidImportId,
+  loadCheckpoint,
+  runImport,
+  writeLine
+} from '../catalog-transfer.js';
+import type { HackathonIdea, IdeaSummary, AppSettings } from '../types.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -14,130 +47,88 @@ const __dirname = path.dirname(__filename);
 const router = express.Router();
 const upload = multer({ storage: multer.memoryStorage() });
 
-// Initialize OpenAI
+// Idea ZIPs are spooled to the OS temp directory rather than held in memory
+const uploadZip = multer({
+  storage: multer.diskStorage({}),
+  limits: { fileSize: UPLOAD_MAX_ZIP_BYTES, files: 1 }
+});
+
+// Catalog imports (admin only) can be much larger than a single idea
+const uploadArchive = multer({
+  storage: multer.diskStorage({}),
+  limits: { fileSize: IMPORT_MAX_ARCHIVE_BYTES, files: 1 }
+});
+
+// Initialize OpenAI (retries are left to the generation queue)
 const openai = new OpenAI({
-  apiKey: process.env.OPENAI_API_KEY
+  apiKey: process.env.OPENAI_API_KEY,
+  baseURL: OPENAI_BASE_URL,
+  maxRetries: 0
 });
 
-// Project ideas directory
-const PROJECT_IDEAS_DIR = path.join(__dirname, '../../project_ideas');
-const SETTINGS_FILE = path.join(__dirname, '../../settings.json');
+// Interval between keep-alive comments on job event streams
+const SSE_HEARTBEAT_MS = 15000;
 
-// Helper functions
-async function ensureDirectoryExists() {
-  try {
-    await fs.access(PROJECT_IDEAS_DIR);
-  } catch {
-    await fs.mkdir(PROJECT_IDEAS_DIR, { recursive: true });
-  }
+// Model settings for POST /generate (part of the generation cache key)
+const IDEA_GENERATION_PARAMS = { model: 'gpt-4', temperature: 0.8, max_tokens: 3000 };
+
+// Unfinished /generate jobs by user and generation cache key, including
+// those started by other cluster workers
+const activeGenerateJobs = new Map<string, string>();
+
+function trackGenerateJob(activeKey: string, jobId: string) {
+  const job = generationQueue.get(jobId);
+  if (job && isFinished(job.status)) return;
+  activeGenerateJobs.set(activeKey, jobId);
+  const unsubscribe = generationQueue.subscribe(jobId, snapshot => {
+    if (isFinished(snapshot.status)) {
+      // A newer job may have taken the key since
+      if (activeGenerateJobs.get(activeKey) === jobId) {
+        activeGenerateJobs.delete(activeKey);
+      }
+      unsubscribe();
+    }
+  });
 }
 
+// So a repeated request on another worker follows the same job
+clusterBus.subscribe('generate-job', ({ activeKey, jobId }: { activeKey: string; jobId: string }) => {
+  trackGenerateJob(activeKey, jobId);
+});
+
+// Helper functions
+// Settings are held in memory and saved to the storage engine on change
 async function loadSettings(): Promise<AppSettings> {
-  try {
-    const data = await fs.readFile(SETTINGS_FILE, 'utf-8');
-    return JSON.parse(data);
-  } catch {
-    return { requireAdminApproval: false };
-  }
+  return settingsStore.get();
 }
 
 async function saveSettings(settings: AppSettings) {
-  await fs.writeFile(SETTINGS_FILE, JSON.stringify(settings, null, 2));
+  await settingsStore.update(settings);
 }
 
+// Reads are served from the in-memory index, loaded once on first use
 async function loadIdeas(): Promise<HackathonIdea[]> {
-  await ensureDirectoryExists();
-  
-  const ideas: HackathonIdea[] = [];
-  const entries = await fs.readdir(PROJECT_IDEAS_DIR, { withFileTypes: true });
-  
-  for (const entry of entries) {
-    if (entry.isDirectory()) {
-      try {
-        const ideaPath = path.join(PROJECT_IDEAS_DIR, entry.name);
-        const metadataPath = path.join(ideaPath, 'metadata.json');
-        const pagesDir = path.join(ideaPath, 'pages');
-        
-        // Read metadata
-        const metadataContent = await fs.readFile(metadataPath, 'utf-8');
-        const metadata = JSON.parse(metadataContent);
-        
-        // Read pages in the order specified in metadata
-        const pages = [];
-        const metadataPages = metadata.pages || [];
-        
-        for (const pageMeta of metadataPages) {
-          const pagePath = path.join(pagesDir, pageMeta.filename);
-          try {
-            const content = await fs.readFile(pagePath, 'utf-8');
-            pages.push({
-              title: pageMeta.title,
-              content,
-              filename: pageMeta.filename
-            });
-          } catch (error) {
-            console.error(`Error loading page ${pageMeta.filename}:`, error);
-          }
-        }
-        
-        ideas.push({
-          id: entry.name,
-          name: metadata.name,
-          author: metadata.author,
-          description: metadata.description || '',
-          visibility: metadata.visibility || 'public',
-          ideaType: metadata.ideaType || 'Hackathon idea',
-          approved: metadata.approved !== undefined ? metadata.approved : true,
-          createdAt: metadata.createdAt || new Date().toISOString(),
-          pages
-        });
-      } catch (error) {
-        console.error(`Error loading idea ${entry.name}:`, error);
-      }
-    }
-  }
-  
-  return ideas;
+  await ideaIndex.ready();
+  return ideaIndex.list();
 }
 
+// Generated ideas are stored under an id derived from their name
+function ideaIdFromName(name: string): string {
+  return name.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-|-$/g, '');
+}
+
+async function findIdea(id: string): Promise<HackathonIdea | undefined> {
+  await ideaIndex.ready();
+  return ideaIndex.get(id);
+}
+
+// Writes only what changed (see idea-writer.ts)
 async function saveIdea(idea: HackathonIdea) {
-  await ensureDirectoryExists();
-  
-  const ideaDir = path.join(PROJECT_IDEAS_DIR, idea.id);
-  const pagesDir = path.join(ideaDir, 'pages');
-  
-  // Create directories
-  await fs.mkdir(ideaDir, { recursive: true });
-  await fs.mkdir(pagesDir, { recursive: true });
-  
-  // Save metadata
-  const metadata = {
-    name: idea.name,
-    author: idea.author,
-    description: idea.description,
-    visibility: idea.visibility,
-    ideaType: idea.ideaType,
-    approved: idea.approved,
-    createdAt: idea.createdAt,
-    pages: idea.pages.map(p => ({ title: p.title, filename: p.filename }))
-  };
-  await fs.writeFile(
-    path.join(ideaDir, 'metadata.json'),
-    JSON.stringify(metadata, null, 2)
-  );
-  
-  // Save pages
-  for (const page of idea.pages) {
-    await fs.writeFile(
-      path.join(pagesDir, page.filename),
-      page.content
-    );
-  }
+  await ideaWriter.save(idea);
 }
 
 async function deleteIdea(ideaId: string) {
-  const ideaPath = path.join(PROJECT_IDEAS_DIR, ideaId);
-  await fs.rm(ideaPath, { recursive: true, force: true });
+  await ideaWriter.remove(ideaId);
 }
 
 // Helper to check if user can view an idea
@@ -162,6 +153,38 @@ function canViewIdea(idea: HackathonIdea, username: string | undefined, role: st
   return false;
 }
 
+// Summary listing: fields that can be requested (page bodies never are) and page sizes
+const SUMMARY_FIELDS = ['name', 'author', 'description', 'visibility', 'ideaType', 'approved', 'createdAt', 'pages'] as const;
+type SummaryField = typeof SUMMARY_FIELDS[number];
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+const DEFAULT_SEARCH_LIMIT = 20;
+const MAX_SEARCH_LIMIT = 100;
+
+// Parse ?fields= into a list of summary fields, or an error message
+function parseFields(value: unknown): SummaryField[] | null | { error: string } {
+  if (!value) return null;
+  const requested = String(value).split(',').map(f => f.trim()).filter(f => f && f !== 'id');
+  const invalid = requested.filter(f => !(SUMMARY_FIELDS as readonly string[]).includes(f));
+  if (invalid.length > 0) {
+    return { error: `Unknown fields: ${invalid.join(', ')}. Valid fields: ${SUMMARY_FIELDS.join(', ')}` };
+  }
+  return requested as SummaryField[];
+}
+
+function parseLimit(value: unknown, fallback: number, max: number): number {
+  return Math.min(Math.max(parseInt(String(value ?? fallback), 10) || fallback, 1), max);
+}
+
+function pickFields(summary: IdeaSummary, fields: SummaryField[] | null): Partial<IdeaSummary> {
+  if (!fields) return summary;
+  const picked: Partial<IdeaSummary> = { id: summary.id };
+  for (const field of fields) {
+    (picked as any)[field] = summary[field];
+  }
+  return picked;
+}
+
 // Routes
 
 // Get context file for upload modal
@@ -175,27 +198,267 @@ router.get('/context-file', async (req, res) => {
 });
 
 // Get all ideas (public route - no auth required)
+//
+// Idea reads are served through responseCache: they carry an ETag that
+// changes with the catalog (answering If-None-Match with 304) and reuse
+// the serialized, compressed body until then.
+//
+// With ?summary=1 returns metadata only, a page at a time:
+//   limit   ideas per page (default 50, max 200)
+//   cursor  nextCursor from the previous page
+//   fields  comma-separated subset of SUMMARY_FIELDS (id is always included)
 router.get('/', async (req, res) => {
   try {
     const ideas = await loadIdeas();
     const user = req.session.user;
     
+    if (req.query.summary === '1') {
+      const limit = parseLimit(req.query.limit, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE);
+      const fields = parseFields(req.query.fields);
+      if (fields && 'error' in fields) {
+        return res.status(400).json({ error: fields.error });
+      }
+      
+      return await responseCache.send(req, res, () => {
+        // The cursor is the (encoded) id of the last idea on the previous page
+        let position = 0;
+        if (req.query.cursor) {
+          const afterId = Buffer.from(String(req.query.cursor), 'base64url').toString('utf-8');
+          position = ideaIndex.positionAfter(afterId);
+        }
+        
+        const page: Partial<IdeaSummary>[] = [];
+        let lastId: string | null = null;
+        for (; position < ideas.length && page.length < limit; position++) {
+          const idea = ideas[position];
+          if (canViewIdea(idea, user?.username, user?.role)) {
+            page.push(pickFields(ideaIndex.getSummary(idea.id)!, fields));
+            lastId = idea.id;
+          }
+        }
+        
+        // Only hand out a cursor if another visible idea actually follows
+        let hasMore = false;
+        for (let i = position; i < ideas.length && !hasMore; i++) {
+          hasMore = canViewIdea(ideas[i], user?.username, user?.role);
+        }
+        return {
+          ideas: page,
+          nextCursor: hasMore && lastId ? Buffer.from(lastId, 'utf-8').toString('base64url') : null
+        };
+      });
+    }
+    
     // Filter ideas based on visibility and approval
-    const filteredIdeas = ideas.filter(idea => 
+    await responseCache.send(req, res, () => ideas.filter(idea => 
       canViewIdea(idea, user?.username, user?.role)
+    ));
+  } catch (error: any) {
+    res.status(500).json({ error: 'Failed to load ideas', message: error.message });
+  }
+});
+
+// Search ideas by name, author, description, type and page text (public route - no auth required)
+//   q       search words; every word must match
+//   prefix  set to 1 for type-ahead, where the last word matches as a prefix
+//   limit   maximum results (default 20, max 100)
+//   fields  as for the summary listing
+router.get('/search', async (req, res) => {
+  try {
+    await ideaIndex.ready();
+    const user = req.session.user;
+    
+    const query = String(req.query.q ?? '').trim();
+    if (!query) {
+      return res.status(400).json({ error: 'q is required' });
+    }
+    
+    const limit = parseLimit(req.query.limit, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT);
+    const fields = parseFields(req.query.fields);
+    if (fields && 'error' in fields) {
+      return res.status(400).json({ error: fields.error });
+    }
+    
+    await responseCache.send(req, res, () => {
+      const results: Partial<IdeaSummary>[] = [];
+      let total = 0;
+      for (const hit of searchIndex.search(query, req.query.prefix === '1')) {
+        const idea = ideaIndex.get(hit.id);
+        if (!idea || !canViewIdea(idea, user?.username, user?.role)) continue;
+        total++;
+        if (results.length < limit) {
+          results.push(pickFields(ideaIndex.getSummary(idea.id)!, fields));
+        }
+      }
+      return { ideas: results, total };
+    });
+  } catch (error: any) {
+    res.status(500).json({ error: 'Failed to search ideas', message: error.message });
+  }
+});
+
+// Export the catalog, or part of it, as NDJSON or a ZIP (admin only)
+//   format    ndjson (default) or zip; see catalog-transfer.ts
+//   ids       comma-separated idea ids
+//   author    exact author
+//   ideaType  exact idea type
+//   approved  true or false
+//   since     ISO date; ideas created at or after it
+router.get('/export', requireAdmin, async (req, res) => {
+  try {
+    const format = String(req.query.format ?? 'ndjson');
+    if (format !== 'ndjson' && format !== 'zip') {
+      return res.status(400).json({ error: 'format must be "ndjson" or "zip"' });
+    }
+    
+    const ids = req.query.ids ? new Set(String(req.query.ids).split(',')) : null;
+    const since = req.query.since ? new Date(String(req.query.since)) : null;
+    if (since && isNaN(since.getTime())) {
+      return res.status(400).json({ error: 'since must be a date' });
+    }
+    
+    const ideas = (await loadIdeas()).filter(idea =>
+      (!ids || ids.has(idea.id)) &&
+      (!req.query.author || idea.author === req.query.author) &&
+      (!req.query.ideaType || idea.ideaType === req.query.ideaType) &&
+      (!req.query.approved || idea.approved === (req.query.approved === 'true')) &&
+      (!since || new Date(idea.createdAt) >= since)
     );
     
-    res.json(filteredIdeas);
+    if (format === 'zip') {
+      if (!fitsInArchive(ideas)) {
+        return res.status(400).json({ error: `A ZIP export holds at most ${MAX_ARCHIVE_ENTRIES} files; use format=ndjson or narrow the filter` });
+      }
+      await exportArchive(res, ideas);
+    } else {
+      await exportNdjson(res, ideas);
+    }
   } catch (error: any) {
-    res.status(500).json({ error: 'Failed to load ideas', message: error.message });
+    console.error('Export error:', error);
+    if (res.headersSent) {
+      // Part of the export went out already; cut it off so it isn't mistaken for a complete one
+      return res.destroy();
+    }
+    res.status(500).json({ error: 'Failed to export ideas', message: error.message });
+  }
+});
+
+// Import ideas from an export (admin only): a ZIP as multipart field
+// "archive", or NDJSON sent as the body with Content-Type
+// application/x-ndjson. Ideas are written in parallel batches and progress
+// streams back as NDJSON lines (start, progress..., done).
+//   importId  resume an interrupted import; the id is in its first line
+//   existing  replace (default) or skip ideas that already exist
+router.post('/import', requireAdmin, receiveFile(uploadArchive, 'archive', IMPORT_MAX_ARCHIVE_BYTES), async (req, res) => {
+  const importId = req.query.importId ? String(req.query.importId) : randomUUID();
+  const existing = String(req.query.existing ?? 'replace');
+  const archivePath = req.file?.path;
+  let zip: ZipReader | null = null;
+  try {
+    if (!isValidImportId(importId)) {
+      return res.status(400).json({ error: 'importId may only contain letters, digits, "-" and "_"' });
+    }
+    if (existing !== 'replace' && existing !== 'skip') {
+      return res.status(400).json({ error: 'existing must be "replace" or "skip"' });
+    }
+    if (!archivePath && !req.is('application/x-ndjson')) {
+      return res.status(400).json({ error: 'Send a ZIP as multipart field "archive" or NDJSON with Content-Type application/x-ndjson' });
+    }
+    
+    await ideaIndex.ready();
+    const completed = await loadCheckpoint(importId);
+    const skip = (id: string) => completed.has(id) || (existing === 'skip' && ideaIndex.get(id) !== undefined);
+    
+    let items;
+    if (archivePath) {
+      zip = await ZipReader.open(archivePath, MAX_ARCHIVE_ENTRIES);
+      items = ideasFromArchive(zip, skip);
+    } else {
+      items = ideasFromNdjson(req, skip);
+    }
+    
+    await runImport(res, items, idea => ideaWriter.replace(idea), importId);
+  } catch (error: any) {
+    console.error('Import error:', error);
+    if (res.headersSent) {
+      // Completed batches are checkpointed; rerunning with the same importId picks up from there
+      await writeLine(res, { type: 'error', importId, message: error.message });
+      return res.end();
+    }
+    if (error instanceof ZipFormatError || error instanceof ZipLimitError) {
+      return res.status(400).json({ error: 'Invalid ZIP archive', message: error.message });
+    }
+    res.status(500).json({ error: 'Failed to import ideas', message: error.message });
+  } finally {
+    await zip?.close();
+    if (archivePath) {
+      await fs.rm(archivePath, { force: true });
+    }
+  }
+});
+
+// Generation queue load and how often the generation cache saved a model call (admin only)
+router.get('/generation/stats', requireAdmin, (req, res) => {
+  res.json({ queue: generationQueue.stats(), cache: ideaGenerations.stats() });
+});
+
+// Current state of a generation job (its owner or an admin)
+router.get('/jobs/:jobId', requireAuth, async (req, res) => {
+  const job = await generationQueue.find(req.params.jobId);
+  const user = req.session.user!;
+  if (!job || (job.owner !== user.username && user.role !== 'admin')) {
+    return res.status(404).json({ error: 'Job not found' });
+  }
+  res.json(job);
+});
+
+// Server-sent events with the job's state after every change, ending once
+// it has succeeded or failed. Streamed model output arrives as "output"
+// events; a client joining late first gets everything so far in one.
+router.get('/jobs/:jobId/events', requireAuth, async (req, res) => {
+  const job = await generationQueue.find(req.params.jobId);
+  const user = req.session.user!;
+  if (!job || (job.owner !== user.username && user.role !== 'admin')) {
+    return res.status(404).json({ error: 'Job not found' });
+  }
+  
+  res.writeHead(200, {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive'
+  });
+  
+  const send = (snapshot: JobSnapshot) => {
+    res.write(`data: ${JSON.stringify(snapshot)}\n\n`);
+    if (isFinished(snapshot.status)) {
+      res.end();
+    }
+  };
+  
+  // Comments keep proxies from closing a stream that is quiet during a long generation
+  const heartbeat = setInterval(() => res.write(': keep-alive\n\n'), SSE_HEARTBEAT_MS);
+  const sendOutput = (text: string) => {
+    res.write(`event: output\ndata: ${JSON.stringify({ text })}\n\n`);
+  };
+  const unsubscribe = generationQueue.subscribe(job.id, send, sendOutput);
+  res.on('close', () => {
+    clearInterval(heartbeat);
+    unsubscribe();
+  });
+  
+  send(job);
+  const partial = generationQueue.partial(job.id);
+  if (partial && !isFinished(job.status)) {
+    sendOutput(partial);
   }
 });
 
 // Get single idea (public route - no auth required)
+// With ?summary=1 the pages are listed without their HTML; fetch each one
+// from GET /:id/pages/:filename instead
 router.get('/:id', async (req, res) => {
   try {
-    const ideas = await loadIdeas();
-    const idea = ideas.find(i => i.id === req.params.id);
+    const idea = await findIdea(req.params.id);
     
     if (!idea) {
       return res.status(404).json({ error: 'Idea not found' });
@@ -206,75 +469,124 @@ router.get('/:id', async (req, res) => {
       return res.status(403).json({ error: 'You do not have permission to view this idea' });
     }
     
-    res.json(idea);
+    await responseCache.send(req, res, () => req.query.summary === '1' ? ideaIndex.getSummary(idea.id) : idea);
   } catch (error: any) {
     res.status(500).json({ error: 'Failed to load idea', message: error.message });
   }
 });
 
-// Upload new idea
-router.post('/upload', requireAuth, upload.single('zip'), async (req, res) => {
+// Get a single page of an idea (public route - no auth required)
+router.get('/:id/pages/:filename', async (req, res) => {
   try {
-    if (!req.file) {
-      return res.status(400).json({ error: 'No file uploaded' });
+    const idea = await findIdea(req.params.id);
+    
+    if (!idea) {
+      return res.status(404).json({ error: 'Idea not found' });
+    }
+    
+    const user = req.session.user;
+    if (!canViewIdea(idea, user?.username, user?.role)) {
+      return res.status(403).json({ error: 'You do not have permission to view this idea' });
+    }
+    
+    const page = idea.pages.find(p => p.filename === req.params.filename);
+    if (!page) {
+      return res.status(404).json({ error: 'Page not found' });
     }
     
+    await responseCache.send(req, res, () => page);
+  } catch (error: any) {
+    res.status(500).json({ error: 'Failed to load page', message: error.message });
+  }
+});
+
+// Accept a single file upload; multer's size limit surfaces as an error,
+// which is answered with 413
+function receiveFile(uploader: multer.Multer, field: string, maxBytes: number): express.RequestHandler {
+  return (req, res, next) => {
+    uploader.single(field)(req, res, error => {
+      if (error instanceof multer.MulterError && error.code === 'LIMIT_FILE_SIZE') {
+        return res.status(413).json({ error: `File must be at most ${maxBytes} bytes` });
+      }
+      next(error);
+    });
+  };
+}
+
+// Upload new idea
+//
+// The ZIP is spooled to a temp file and extracted one entry at a time into
+// a staging directory, which replaces project_ideas/<id> only once every
+// page has been validated. Memory use per upload is bounded by the size
+// limits in config.ts rather than by the archive.
+router.post('/upload', requireAuth, receiveFile(uploadZip, 'zip', UPLOAD_MAX_ZIP_BYTES), async (req, res) => {
+  if (!req.file) {
+    return res.status(400).json({ error: 'No file uploaded' });
+  }
+  
+  const zipPath = req.file.path;
+  const stagingDir = path.join(STAGING_DIR, randomUUID());
+  let zip: ZipReader | null = null;
+  try {
     const user = req.session.user!;
     const settings = await loadSettings();
     
-    // Load and validate zip
-    const zip = await JSZip.loadAsync(req.file.buffer);
+    zip = await ZipReader.open(zipPath, UPLOAD_MAX_ENTRIES);
+    if (zip.entries.length === 0) {
+      return res.status(400).json({ error: 'ZIP archive is empty' });
+    }
+    
+    // Reject obvious zip bombs up front; actual sizes are enforced while extracting
+    const declaredSize = zip.entries.reduce((total, entry) => total + entry.uncompressedSize, 0);
+    if (declaredSize > UPLOAD_MAX_EXTRACTED_BYTES) {
+      return res.status(413).json({ error: `ZIP contents must be at most ${UPLOAD_MAX_EXTRACTED_BYTES} bytes` });
+    }
     
     // Find root folder
-    const files = Object.keys(zip.files);
-    const rootFolder = files[0].split('/')[0];
+    const rootFolder = zip.entries[0].name.split('/')[0];
     
     // Validate structure
-    const metadataFile = zip.file(`${rootFolder}/metadata.json`);
-    if (!metadataFile) {
+    const metadataEntry = zip.getEntry(`${rootFolder}/metadata.json`);
+    if (!metadataEntry) {
       return res.status(400).json({ error: 'Missing metadata.json' });
     }
     
-    const metadataContent = await metadataFile.async('string');
-    const metadata = JSON.parse(metadataContent);
-    
-    if (!metadata.name || !metadata.author || !metadata.description || !metadata.visibility || !metadata.ideaType || !metadata.pages || !Array.isArray(metadata.pages)) {
-      return res.status(400).json({ error: 'Invalid metadata.json format. Required fields: name, author, description, visibility, ideaType, pages (array with title and filename)' });
-    }
-    
-    // Validate visibility
-    if (metadata.visibility !== 'public' && metadata.visibility !== 'private' && !Array.isArray(metadata.visibility)) {
-      return res.status(400).json({ error: 'visibility must be "public", "private", or an array of usernames' });
-    }
-    
-    // Validate ideaType
-    const validIdeaTypes = ['Hackathon idea', 'Project idea', 'Resume project idea'];
-    if (!validIdeaTypes.includes(metadata.ideaType)) {
-      return res.status(400).json({ error: 'ideaType must be one of: "Hackathon idea", "Project idea", "Resume project idea"' });
+    const metadataContent = await zip.readText(metadataEntry, UPLOAD_MAX_FILE_BYTES);
+    let metadata;
+    try {
+      metadata = JSON.parse(metadataContent);
+    } catch {
+      return res.status(400).json({ error: 'metadata.json is not valid JSON' });
     }
     
-    // Validate pages array
-    for (const page of metadata.pages) {
-      if (!page.title || !page.filename) {
-        return res.status(400).json({ error: 'Each page in metadata must have title and filename' });
-      }
+    const invalid = metadataError(metadata);
+    if (invalid) {
+      return res.status(400).json({ error: invalid });
     }
     
     // Check pages folder
-    const pagesFolder = zip.folder(`${rootFolder}/pages`);
-    if (!pagesFolder) {
+    if (!zip.entries.some(entry => entry.name.startsWith(`${rootFolder}/pages/`))) {
       return res.status(400).json({ error: 'Missing pages folder' });
     }
     
     // Extract pages in order specified by metadata
+    const stagedPagesDir = path.join(stagingDir, 'pages');
+    await fs.mkdir(stagedPagesDir, { recursive: true });
+    
+    let extractedBytes = metadataEntry.uncompressedSize;
     const pages = [];
     for (const pageMeta of metadata.pages) {
-      const pageFile = zip.file(`${rootFolder}/pages/${pageMeta.filename}`);
-      if (!pageFile) {
+      const pageEntry = zip.getEntry(`${rootFolder}/pages/${pageMeta.filename}`);
+      if (!pageEntry) {
         return res.status(400).json({ error: `Page file ${pageMeta.filename} specified in metadata not found` });
       }
       
-      const content = await pageFile.async('string');
+      const pagePath = path.join(stagedPagesDir, pageMeta.filename);
+      const maxBytes = Math.min(UPLOAD_MAX_FILE_BYTES, UPLOAD_MAX_EXTRACTED_BYTES - extractedBytes);
+      await pipeline(await zip.openReadStream(pageEntry, maxBytes), createWriteStream(pagePath));
+      
+      const content = await fs.readFile(pagePath, 'utf-8');
+      extractedBytes += Buffer.byteLength(content);
       
       // Validate HTML has h1 tag
       if (!content.match(/<h1[^>]*>.*?<\/h1>/i)) {
@@ -301,8 +613,7 @@ router.post('/upload', requireAuth, upload.single('zip'), async (req, res) => {
       pages
     };
     
-    // Save idea
-    await saveIdea(idea);
+    await ideaWriter.replace(idea, stagingDir);
     
     res.json({
       message: 'Idea uploaded successfully',
@@ -310,16 +621,29 @@ router.post('/upload', requireAuth, upload.single('zip'), async (req, res) => {
       requiresApproval: settings.requireAdminApproval && user.role !== 'admin'
     });
   } catch (error: any) {
+    if (error instanceof ZipLimitError) {
+      return res.status(413).json({ error: error.message });
+    }
+    if (error instanceof ZipFormatError || error.code === 'Z_DATA_ERROR') {
+      return res.status(400).json({ error: 'Invalid ZIP archive', message: error.message });
+    }
     console.error('Upload error:', error);
     res.status(500).json({ error: 'Failed to upload idea', message: error.message });
+  } finally {
+    await zip?.close();
+    await fs.rm(stagingDir, { recursive: true, force: true });
+    await fs.rm(zipPath, { force: true });
   }
 });
 
 // Generate idea with AI
+//
+// Runs as a background job: responds 202 with the job right away; follow it
+// with GET /jobs/:jobId/events. The job's result is what this route used to
+// return ({ message, idea, requiresApproval }).
 router.post('/generate', requireAuth, upload.single('file'), async (req, res) => {
   try {
     const user = req.session.user!;
-    const settings = await loadSettings();
     
     // Get description from either text or uploaded file
     let description = req.body.description || '';
@@ -386,88 +710,136 @@ IMPORTANT RULES:
 - Include technical details, features, and implementation ideas
 - Response must be VALID JSON only (no markdown code blocks)`;
 
-    const completion = await openai.chat.completions.create({
-      model: "gpt-4",
-      messages: [
-        {
-          role: "system",
-          content: `You are a project idea generator specializing in ${projectTypeContext}. Always respond with valid JSON only, no markdown formatting.`
-        },
-        {
-          role: "user",
-          content: prompt
-        }
-      ],
-      temperature: 0.8,
-      max_tokens: 3000
+    // A user's requests that differ only in case or spacing share one
+    // generation. Each user gets their own: the result becomes an idea
+    // named after it, which another author couldn't create again
+    const cacheKey = ideaGenerations.key({
+      author: user.username,
+      description: normalizePrompt(description),
+      ideaType,
+      ...IDEA_GENERATION_PARAMS
     });
     
-    const responseText = completion.choices[0]?.message?.content || '';
-    
-    // Parse AI response
-    let generatedData;
-    try {
-      // Remove markdown code blocks if present
-      const jsonText = responseText
-        .replace(/```json\n?/g, '')
-        .replace(/```\n?/g, '')
-        .trim();
-      generatedData = JSON.parse(jsonText);
-    } catch (parseError) {
-      console.error('Failed to parse AI response:', responseText);
-      return res.status(500).json({ error: 'AI generated invalid response format' });
-    }
-    
-    // Validate generated data
-    if (!generatedData.name || !generatedData.description || !Array.isArray(generatedData.pages) || generatedData.pages.length === 0) {
-      return res.status(500).json({ error: 'AI generated incomplete idea structure' });
-    }
-    
-    // Validate pages
-    for (const page of generatedData.pages) {
-      if (!page.title || !page.filename || !page.content) {
-        return res.status(500).json({ error: 'AI generated invalid page structure' });
-      }
-      if (!page.content.match(/<h1[^>]*>.*?<\/h1>/i)) {
-        return res.status(500).json({ error: `Generated page ${page.title} missing <h1> tag` });
-      }
+    // A cached result was saved as this user's idea; if that idea has since
+    // been deleted, or its name taken by someone else, generate a new one
+    const previous = await ideaGenerations.peek(cacheKey);
+    if (previous && (await findIdea(ideaIdFromName(previous.name)))?.author !== user.username) {
+      ideaGenerations.delete(cacheKey);
     }
     
-    // Create idea ID from name
-    const ideaId = generatedData.name.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-|-$/g, '');
+    // A cached result is only saved, so it needn't wait for a worker
+    const cached = await ideaGenerations.has(cacheKey);
     
-    // Check if idea with same ID already exists
-    const existingIdeas = await loadIdeas();
-    if (existingIdeas.some(i => i.id === ideaId)) {
-      return res.status(400).json({ error: 'An idea with a similar name already exists. Please try a different description.' });
+    // Submitting again while the first is still running follows that job
+    const activeKey = `${user.username} ${cacheKey}`;
+    const active = generationQueue.get(activeGenerateJobs.get(activeKey) ?? '');
+    if (active && !isFinished(active.status)) {
+      return res.status(202).json(active);
     }
     
-    // Create idea object
-    const idea: HackathonIdea = {
-      id: ideaId,
-      name: generatedData.name,
-      author: user.username,
-      description: generatedData.description,
-      visibility: 'public', // Default to public for AI-generated ideas
-      ideaType: ideaType,
-      approved: user.role === 'admin' || !settings.requireAdminApproval,
-      createdAt: new Date().toISOString(),
-      pages: generatedData.pages.map((p: any) => ({
-        title: p.title,
-        content: p.content,
-        filename: p.filename
-      }))
-    };
+    const job = generationQueue.enqueue('idea', user.username, async () => {
+      const generatedData = await ideaGenerations.get(cacheKey, async () => {
+        const completion = await openai.chat.completions.create({
+          ...IDEA_GENERATION_PARAMS,
+          messages: [
+            {
+              role: "system",
+              content: `You are a project idea generator specializing in ${projectTypeContext}. Always respond with valid JSON only, no markdown formatting.`
+            },
+            {
+              role: "user",
+              content: prompt
+            }
+          ]
+        });
+        
+        const responseText = completion.choices[0]?.message?.content || '';
+        
+        // Parse AI response
+        let generatedData;
+        try {
+          // Remove markdown code blocks if present
+          const jsonText = responseText
+            .replace(/```json\n?/g, '')
+            .replace(/```\n?/g, '')
+            .trim();
+          generatedData = JSON.parse(jsonText);
+        } catch (parseError) {
+          console.error('Failed to parse AI response:', responseText);
+          throw new Error('AI generated invalid response format');
+        }
+        
+        // Validate generated data
+        if (!generatedData.name || !generatedData.description || !Array.isArray(generatedData.pages) || generatedData.pages.length === 0) {
+          throw new Error('AI generated incomplete idea structure');
+        }
+        
+        // Validate pages
+        for (const page of generatedData.pages) {
+          if (!page.title || !isSafeName(page.filename) || !page.content) {
+            throw new Error('AI generated invalid page structure');
+          }
+          if (!page.content.match(/<h1[^>]*>.*?<\/h1>/i)) {
+            throw new Error(`Generated page ${page.title} missing <h1> tag`);
+          }
+        }
+        
+        return generatedData as GeneratedIdea;
+      });
+      
+      // Create idea ID from name
+      const ideaId = ideaIdFromName(generatedData.name);
+      
+      // Check if idea with same ID already exists
+      const existing = await findIdea(ideaId);
+      if (existing) {
+        // Asking again for an idea you already generated just returns it
+        if (existing.author === user.username && existing.name === generatedData.name) {
+          return {
+            message: 'Idea generated successfully',
+            idea: ideaIndex.getSummary(ideaId),
+            requiresApproval: !existing.approved
+          };
+        }
+        throw new PermanentJobError('An idea with a similar name already exists. Please try a different description.');
+      }
+      
+      // Create idea object
+      const settings = await loadSettings();
+      const idea: HackathonIdea = {
+        id: ideaId,
+        name: generatedData.name,
+        author: user.username,
+        description: generatedData.description,
+        visibility: 'public', // Default to public for AI-generated ideas
+        ideaType: ideaType,
+        approved: user.role === 'admin' || !settings.requireAdminApproval,
+        createdAt: new Date().toISOString(),
+        pages: generatedData.pages.map((p: any) => ({
+          title: p.title,
+          content: p.content,
+          filename: p.filename
+        }))
+      };
+      
+      // Save idea
+      await saveIdea(idea);
+      
+      return {
+        message: 'Idea generated successfully',
+        idea: ideaIndex.getSummary(idea.id),
+        requiresApproval: settings.requireAdminApproval && user.role !== 'admin'
+      };
+    }, { immediate: cached });
     
-    // Save idea
-    await saveIdea(idea);
+    trackGenerateJob(activeKey, job.id);
+    clusterBus.publish('generate-job', { activeKey, jobId: job.id });
     
-    res.json({
-      message: 'Idea generated successfully',
-      idea,
-      requiresApproval: settings.requireAdminApproval && user.role !== 'admin'
-    });
+    res.status(202).json(job);
   } catch (error: any) {
+    if (error instanceof QueueFullError) {
+      return res.status(503).json({ error: error.message });
+    }
     console.error('AI generation error:', error);
     res.status(500).json({ error: 'Failed to generate idea', message: error.message });
   }
@@ -476,13 +848,14 @@ IMPORTANT RULES:
 // Update idea (approve/unapprove)
 router.patch('/:id', requireAdmin, async (req, res) => {
   try {
-    const ideas = await loadIdeas();
-    const idea = ideas.find(i => i.id === req.params.id);
+    const existing = await findIdea(req.params.id);
     
-    if (!idea) {
+    if (!existing) {
       return res.status(404).json({ error: 'Idea not found' });
     }
     
+    // Edit a copy so readers never see a half-applied change
+    const idea = structuredClone(existing);
     if (req.body.approved !== undefined) {
       idea.approved = req.body.approved;
       await saveIdea(idea);
@@ -497,8 +870,7 @@ router.patch('/:id', requireAdmin, async (req, res) => {
 // Delete idea (admin or author)
 router.delete('/:id', requireAuth, async (req, res) => {
   try {
-    const ideas = await loadIdeas();
-    const idea = ideas.find(i => i.id === req.params.id);
+    const idea = await findIdea(req.params.id);
     
     if (!idea) {
       return res.status(404).json({ error: 'Idea not found' });
@@ -541,6 +913,9 @@ router.put('/settings/app', requireAdmin, async (req, res) => {
 });
 
 // Add a page to an idea with AI generation (author only)
+//
+// Runs as a background job like /generate; its result is
+// { message, page: { title, filename } }
 router.post('/:id/pages', requireAuth, async (req, res) => {
   try {
     const { description, title } = req.body;
@@ -549,8 +924,7 @@ router.post('/:id/pages', requireAuth, async (req, res) => {
       return res.status(400).json({ error: 'description and title are required' });
     }
     
-    const ideas = await loadIdeas();
-    const idea = ideas.find(i => i.id === req.params.id);
+    const idea = await findIdea(req.params.id);
     
     if (!idea) {
       return res.status(404).json({ error: 'Idea not found' });
@@ -562,49 +936,75 @@ router.post('/:id/pages', requireAuth, async (req, res) => {
       return res.status(403).json({ error: 'Only the author can add pages to this idea' });
     }
     
-    // Generate page content with OpenAI
-    const completion = await openai.chat.completions.create({
-      model: "gpt-4",
-      messages: [
-        {
-          role: "system",
-          content: "You are a helpful assistant that creates detailed, well-structured HTML content for hackathon project pages. Generate content using only HTML tags (h1, h2, h3, p, ul, li, ol, strong, em). Do not include <html>, <head>, or <body> tags. Start with an <h1> tag for the page title."
-        },
-        {
-          role: "user",
-          content: `Create a detailed page for a hackathon project called "${idea.name}". The project description is: "${idea.description}". 
+    const ideaId = idea.id;
+    const job = generationQueue.enqueue('page', user.username, async output => {
+      // Generate page content with OpenAI, passing it on as it streams in
+      const stream = await openai.chat.completions.create({
+        model: "gpt-4",
+        messages: [
+          {
+            role: "system",
+            content: "You are a helpful assistant that creates detailed, well-structured HTML content for hackathon project pages. Generate content using only HTML tags (h1, h2, h3, p, ul, li, ol, strong, em). Do not include <html>, <head>, or <body> tags. Start with an <h1> tag for the page title."
+          },
+          {
+            role: "user",
+            content: `Create a detailed page for a hackathon project called "${idea.name}". The project description is: "${idea.description}". 
 
 The page title should be: "${title}"
 
 The user wants this page to cover: ${description}
 
 Create comprehensive, engaging content that would be suitable for a hackathon project showcase.`
+          }
+        ],
+        temperature: 0.7,
+        max_tokens: 2000,
+        stream: true
+      });
+      
+      let generated = '';
+      for await (const chunk of stream) {
+        const text = chunk.choices[0]?.delta?.content;
+        if (text) {
+          generated += text;
+          output(text);
         }
-      ],
-      temperature: 0.7,
-      max_tokens: 2000
-    });
-    
-    const content = completion.choices[0].message.content || '<h1>Error</h1><p>Failed to generate content</p>';
-    
-    // Create filename from title
-    const filename = title.toLowerCase().replace(/[^a-z0-9]+/g, '-') + '.html';
-    
-    // Add page to idea
-    idea.pages.push({
-      title,
-      content,
-      filename
+      }
+      
+      // Only the finished page is saved
+      const content = generated || '<h1>Error</h1><p>Failed to generate content</p>';
+      
+      // Create filename from title
+      const filename = title.toLowerCase().replace(/[^a-z0-9]+/g, '-') + '.html';
+      
+      // The idea may have changed while the job waited; add the page to its current version
+      const current = await findIdea(ideaId);
+      if (!current) {
+        throw new PermanentJobError('Idea not found');
+      }
+      const updated = structuredClone(current);
+      
+      // Add page to idea
+      updated.pages.push({
+        title,
+        content,
+        filename
+      });
+      
+      // Save idea
+      await saveIdea(updated);
+      
+      return {
+        message: 'Page added successfully',
+        page: { title, filename }
+      };
     });
     
-    // Save idea
-    await saveIdea(idea);
-    
-    res.json({
-      message: 'Page added successfully',
-      page: { title, filename }
-    });
+    res.status(202).json(job);
   } catch (error: any) {
+    if (error instanceof QueueFullError) {
+      return res.status(503).json({ error: error.message });
+    }
     console.error('Add page error:', error);
     res.status(500).json({ error: 'Failed to add page', message: error.message });
   }
@@ -613,13 +1013,15 @@ Create comprehensive, engaging content that would be suitable for a hackathon pr
 // Delete a page from an idea (author only)
 router.delete('/:id/pages/:filename', requireAuth, async (req, res) => {
   try {
-    const ideas = await loadIdeas();
-    const idea = ideas.find(i => i.id === req.params.id);
+    const existing = await findIdea(req.params.id);
     
-    if (!idea) {
+    if (!existing) {
       return res.status(404).json({ error: 'Idea not found' });
     }
     
+    // Edit a copy so readers never see a half-applied change
+    const idea = structuredClone(existing);
+    
     const user = req.session.user!;
     // Only author can delete pages
     if (user.username !== idea.author) {
@@ -639,17 +1041,7 @@ router.delete('/:id/pages/:filename', requireAuth, async (req, res) => {
     // Remove page
     idea.pages.splice(pageIndex, 1);
     
-    // Delete the HTML file
-    const ideaDir = path.join(PROJECT_IDEAS_DIR, idea.id);
-    const pagePath = path.join(ideaDir, 'pages', req.params.filename);
-    try {
-      await fs.unlink(pagePath);
-    } catch (error) {
-      console.error('Error deleting page file:', error);
-      // Continue even if file deletion fails
-    }
-    
-    // Save updated idea
+    // Save updated idea (this also deletes the page's HTML file)
     await saveIdea(idea);
     
     res.json({ message: 'Page deleted successfully' });
@@ -0,0 +1,201 @@
+import type { HackathonIdea } from './types.js';
+
+// How much a term counts depending on where it appears
+const FIELD_WEIGHTS = {
+  name: 8,
+  author: 4,
+  description: 4,
+  ideaType: 2,
+  pageTitle: 3,
+  pageContent: 1
+};
+
+// Terms shorter than this are not indexed
+const MIN_TERM_LENGTH = 2;
+
+// Upper bound on the indexed terms a type-ahead prefix expands to (most common first)
+const MAX_PREFIX_EXPANSIONS = 64;
+
+const STOP_WORDS = new Set([
+  'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+  'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'was', 'will', 'with'
+]);
+
+export interface SearchHit {
+  id: string;
+  score: number;
+}
+
+function splitWords(text: string): string[] {
+  return text.toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(Boolean);
+}
+
+export function tokenize(text: string): string[] {
+  return splitWords(text).filter(term => term.length >= MIN_TERM_LENGTH && !STOP_WORDS.has(term));
+}
+
+// Visible text of a page: drop scripts, styles, tags and entities
+export function stripHtml(html: string): string {
+  return html
+    .replace(/<(script|style)[^>]*>[\s\S]*?<\/\1>/gi, ' ')
+    .replace(/<[^>]+>/g, ' ')
+    .replace(/&[#a-z0-9]+;/gi, ' ');
+}
+
+// Inverted index over idea metadata and page text, updated one idea at a
+// time by the idea index. Visibility is left to the caller (canViewIdea).
+class SearchIndex {
+  // term -> idea id -> weighted number of occurrences
+  private postings = new Map<string, Map<string, number>>();
+  // idea id -> its terms, so an idea can be removed without a full scan
+  private ideaTerms = new Map<string, string[]>();
+  // Sorted vocabulary for prefix lookups, rebuilt lazily when terms change
+  private sortedTerms: string[] | null = null;
+
+  get size(): number {
+    return this.ideaTerms.size;
+  }
+
+  add(idea: HackathonIdea) {
+    this.remove(idea.id);
+
+    const weights = new Map<string, number>();
+    const addText = (text: string | undefined, weight: number) => {
+      if (!text) return;
+      for (const term of tokenize(text)) {
+        weights.set(term, (weights.get(term) ?? 0) + weight);
+      }
+    };
+
+    addText(idea.name, FIELD_WEIGHTS.name);
+    addText(idea.author, FIELD_WEIGHTS.author);
+    addText(idea.description, FIELD_WEIGHTS.description);
+    addText(idea.ideaType, FIELD_WEIGHTS.ideaType);
+    for (const page of idea.pages) {
+      addText(page.title, FIELD_WEIGHTS.pageTitle);
+      addText(stripHtml(page.content), FIELD_WEIGHTS.pageContent);
+    }
+
+    for (const [term, weight] of weights) {
+      let posting = this.postings.get(term);
+      if (!posting) {
+        posting = new Map();
+        this.postings.set(term, posting);
+        this.sortedTerms = null;
+      }
+      posting.set(idea.id, weight);
+    }
+    this.ideaTerms.set(idea.id, [...weights.keys()]);
+  }
+
+  remove(id: string) {
+    const terms = this.ideaTerms.get(id);
+    if (!terms) return;
+
+    for (const term of terms) {
+      const posting = this.postings.get(term);
+      if (!posting) continue;
+      posting.delete(id);
+      if (posting.size === 0) {
+        this.postings.delete(term);
+        this.sortedTerms = null;
+      }
+    }
+    this.ideaTerms.delete(id);
+  }
+
+  // Ideas matching every word of the query, best first. With prefix set,
+  // the last word also matches longer terms ("hack" finds "hackathon").
+  search(query: string, prefix = false): SearchHit[] {
+    const words = splitWords(query);
+    const last = prefix ? words.pop() : undefined;
+
+    const termScores: Map<string, number>[] = [];
+    for (const word of words) {
+      if (word.length < MIN_TERM_LENGTH || STOP_WORDS.has(word)) continue;
+      termScores.push(this.scoreTerms([word]));
+    }
+    if (last) {
+      termScores.push(this.scoreTerms(this.expandPrefix(last)));
+    }
+    if (termScores.length === 0) {
+      return [];
+    }
+
+    // Intersect, starting from the rarest term
+    termScores.sort((a, b) => a.size - b.size);
+    const [rarest, ...others] = termScores;
+    const hits: SearchHit[] = [];
+    for (const [id, score] of rarest) {
+      let total = score;
+      let matchesAll = true;
+      for (const scores of others) {
+        const other = scores.get(id);
+        if (other === undefined) {
+          matchesAll = false;
+          break;
+        }
+        total += other;
+      }
+      if (matchesAll) {
+        hits.push({ id, score: total });
+      }
+    }
+
+    return hits.sort((a, b) => b.score - a.score || a.id.localeCompare(b.id));
+  }
+
+  // Per-idea score for a query word that may match any of the given terms
+  private scoreTerms(terms: string[]): Map<string, number> {
+    const scores = new Map<string, number>();
+    const ideaCount = this.ideaTerms.size;
+
+    for (const term of terms) {
+      const posting = this.postings.get(term);
+      if (!posting) continue;
+
+      const idf = Math.log(1 + ideaCount / posting.size);
+      for (const [id, weight] of posting) {
+        const score = (1 + Math.log(weight)) * idf;
+        if (score > (scores.get(id) ?? 0)) {
+          scores.set(id, score);
+        }
+      }
+    }
+    return scores;
+  }
+
+  private expandPrefix(prefix: string): string[] {
+    if (!this.sortedTerms) {
+      this.sortedTerms = [...this.postings.keys()].sort();
+    }
+    const terms = this.sortedTerms;
+
+    // Binary search for the first term >= prefix
+    let low = 0;
+    let high = terms.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (terms[middle] < prefix) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+
+    const matches: string[] = [];
+    for (let i = low; i < terms.length && terms[i].startsWith(prefix); i++) {
+      matches.push(terms[i]);
+    }
+
+    // Short prefixes can match thousands of terms; keep the most common ones
+    if (matches.length > MAX_PREFIX_EXPANSIONS) {
+      const ideaCount = (term: string) => this.postings.get(term)!.size;
+      matches.sort((a, b) => ideaCount(b) - ideaCount(a));
+      matches.length = MAX_PREFIX_EXPANSIONS;
+    }
+    return matches;
+  }
+}
+
+export const searchIndex = new SearchIndex();
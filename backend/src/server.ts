@@ -2,20 +2,19 @@ import 'dotenv/config';
 import express from 'express';
 import cors from 'cors';
 import session from 'express-session';
-import path from 'path';
-import { fileURLToPath } from 'url';
 import authRoutes from './routes/auth.js';
 import ideasRoutes from './routes/ideas.js';
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
+import { PORT, CORS_ORIGIN, PROJECT_IDEAS_DIR, STORAGE_ENGINE, SQLITE_FILE, SHUTDOWN_TIMEOUT_MS } from './config.js';
+import { ideaIndex } from './idea-index.js';
+import { sessionStore } from './session-store.js';
+import { settingsStore } from './settings-store.js';
+import { storage } from './storage.js';
 
 const app = express();
-const PORT = process.env.PORT || 3001;
 
 // Middleware
 app.use(cors({
-  origin: 'http://localhost:5173',
+  origin: CORS_ORIGIN,
   credentials: true
 }));
 app.use(express.json());
@@ -23,6 +22,8 @@ app.use(express.urlencoded({ extended: true }));
 
 // Session configuration
 app.use(session({
+  // Persisted through the storage engine, with recent sessions cached in memory
+  store: sessionStore,
   secret: 'hackathon-ideas-secret-key-2024',
   resave: false,
   saveUninitialized: false,
@@ -48,7 +49,41 @@ app.use((err: any, req: express.Request, res: express.Response, next: express.Ne
   res.status(500).json({ error: 'Internal server error', message: err.message });
 });
 
-app.listen(PORT, () => {
-  console.log(`🚀 Backend server running on http://localhost:${PORT}`);
-  console.log(`📁 Project ideas directory: ${path.join(__dirname, '../project_ideas')}`);
+const server = app.listen(PORT, () => {
+  console.log(`🚀 Backend server running on http://localhost:${PORT} (pid ${process.pid})`);
+  if (STORAGE_ENGINE === 'sqlite') {
+    console.log(`🗄️  SQLite database: ${SQLITE_FILE}`);
+  } else {
+    console.log(`📁 Project ideas directory: ${PROJECT_IDEAS_DIR}`);
+  }
+  
+  // Build the idea index now rather than on the first request
+  const started = Date.now();
+  ideaIndex.ready()
+    .then(() => console.log(`📚 Indexed ${ideaIndex.size} ideas in ${Date.now() - started}ms`))
+    .catch(error => console.error('Failed to index ideas:', error));
+  settingsStore.ready();
 });
+
+// Stop taking connections, let open requests finish (up to
+// SHUTDOWN_TIMEOUT_MS) and exit; cluster mode stops workers this way
+let shuttingDown = false;
+function shutdown() {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  console.log(`👋 Shutting down (pid ${process.pid})`);
+  server.close(async () => {
+    ideaIndex.close();
+    await storage.close();
+    process.exit(0);
+  });
+  // Idle keep-alive connections would otherwise hold the server open
+  server.closeIdleConnections();
+  setTimeout(() => {
+    // Event streams and slow uploads don't end on their own
+    server.closeAllConnections();
+  }, SHUTDOWN_TIMEOUT_MS).unref();
+}
+
+process.on('SIGTERM', shutdown);
+process.on('SIGINT', shutdown);
@@ -0,0 +1,128 @@
+import session, { type SessionData } from 'express-session';
+import { clusterBus } from './cluster-bus.js';
+import { SESSION_CACHE_MAX_ENTRIES, SESSION_SWEEP_INTERVAL_MS } from './config.js';
+import { storage, type StoredSession } from './storage.js';
+
+// Sessions are touched on every request; their new expiry is only written
+// out once it has moved at least this much
+const TOUCH_WRITE_INTERVAL_MS = 60 * 60 * 1000;
+
+// Lifetime of a session whose cookie doesn't say when it expires
+const DEFAULT_TTL_MS = 24 * 60 * 60 * 1000;
+
+type Callback = (error?: any) => void;
+
+function expiryOf(data: SessionData): number {
+  const expires = data.cookie?.expires;
+  return expires ? new Date(expires).getTime() : Date.now() + DEFAULT_TTL_MS;
+}
+
+// express-session store that keeps sessions in the storage engine (files or
+// SQLite), so logins survive restarts and can be shared between processes.
+// The most recently used sessions are cached in memory up to a fixed count,
+// and expired ones are swept from storage periodically.
+class PersistentSessionStore extends session.Store {
+  private cache = new Map<string, StoredSession>();
+  hits = 0;
+  misses = 0;
+
+  constructor(private maxCached: number, sweepIntervalMs: number) {
+    super();
+    setInterval(() => this.sweep(), sweepIntervalMs).unref();
+    // Another cluster worker logged this session in or out
+    clusterBus.subscribe('session', (sid: string) => this.cache.delete(sid));
+  }
+
+  get(sid: string, callback: (error: any, session?: SessionData | null) => void) {
+    this.load(sid).then(
+      stored => callback(null, stored ? JSON.parse(stored.data) : null),
+      error => callback(error)
+    );
+  }
+
+  set(sid: string, data: SessionData, callback?: Callback) {
+    const stored = { data: JSON.stringify(data), expiresAt: expiryOf(data) };
+    storage.saveSession(sid, stored).then(() => {
+      this.remember(sid, stored);
+      clusterBus.publish('session', sid);
+      callback?.();
+    }, error => callback?.(error));
+  }
+
+  touch(sid: string, data: SessionData, callback?: Callback) {
+    const cached = this.cache.get(sid);
+    if (cached && expiryOf(data) - cached.expiresAt < TOUCH_WRITE_INTERVAL_MS) {
+      callback?.();
+      return;
+    }
+    this.set(sid, data, callback);
+  }
+
+  destroy(sid: string, callback?: Callback) {
+    this.cache.delete(sid);
+    storage.deleteSession(sid).then(() => {
+      clusterBus.publish('session', sid);
+      callback?.();
+    }, error => callback?.(error));
+  }
+
+  length(callback: (error: any, length?: number) => void) {
+    storage.countSessions().then(count => callback(null, count), error => callback(error));
+  }
+
+  async stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      sessions: await storage.countSessions(),
+      cached: this.cache.size,
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups > 0 ? this.hits / lookups : 0
+    };
+  }
+
+  private async load(sid: string): Promise<StoredSession | null> {
+    let stored = this.cache.get(sid) ?? null;
+    if (stored) {
+      this.hits++;
+      // Move to the back so the least recently used session is evicted first
+      this.cache.delete(sid);
+      this.cache.set(sid, stored);
+    } else {
+      this.misses++;
+      stored = await storage.loadSession(sid);
+      if (stored) {
+        this.remember(sid, stored);
+      }
+    }
+
+    if (stored && stored.expiresAt <= Date.now()) {
+      this.destroy(sid);
+      return null;
+    }
+    return stored;
+  }
+
+  private remember(sid: string, stored: StoredSession) {
+    this.cache.delete(sid);
+    this.cache.set(sid, stored);
+    for (const oldest of this.cache.keys()) {
+      if (this.cache.size <= this.maxCached) break;
+      this.cache.delete(oldest);
+    }
+  }
+
+  private sweep() {
+    const now = Date.now();
+    for (const [sid, stored] of this.cache) {
+      if (stored.expiresAt <= now) {
+        this.cache.delete(sid);
+      }
+    }
+    storage.sweepSessions(now).catch(error => {
+      console.error('Failed to sweep expired sessions:', error);
+    });
+  }
+}
+
+export const sessionStore = new PersistentSessionStore(SESSION_CACHE_MAX_ENTRIES, SESSION_SWEEP_INTERVAL_MS);
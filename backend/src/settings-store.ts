@@ -0,0 +1,59 @@
+import { clusterBus } from './cluster-bus.js';
+import { storage } from './storage.js';
+import type { AppSettings } from './types.js';
+
+const DEFAULT_SETTINGS: AppSettings = { requireAdminApproval: false };
+
+// App settings held in memory: read from storage once at startup, then
+// changed only through update(), which saves them and tells the other
+// cluster workers. Requests read them without touching storage.
+class SettingsStore {
+  private settings: AppSettings = { ...DEFAULT_SETTINGS };
+  private loading: Promise<void> | null = null;
+  private writing: Promise<unknown> = Promise.resolve();
+
+  // Bumped on every change, so data derived from the settings can tell it is stale
+  version = 0;
+
+  constructor() {
+    // Another cluster worker saved new settings
+    clusterBus.subscribe('settings', (settings: AppSettings) => this.apply(settings));
+  }
+
+  // Resolves once the settings have been read (starting the read if needed)
+  ready(): Promise<void> {
+    if (!this.loading) {
+      this.loading = storage.loadSettings().then(
+        settings => this.apply(settings),
+        error => {
+          // Serve the defaults rather than failing every request
+          console.error('Failed to load settings, using defaults:', error);
+        }
+      );
+    }
+    return this.loading;
+  }
+
+  async get(): Promise<AppSettings> {
+    await this.ready();
+    return this.settings;
+  }
+
+  // Save new settings; concurrent updates are written in the order made
+  async update(settings: AppSettings): Promise<AppSettings> {
+    await this.ready();
+    const write = this.writing.then(() => storage.saveSettings(settings));
+    this.writing = write.catch(() => {});
+    await write;
+    this.apply(settings);
+    clusterBus.publish('settings', settings);
+    return settings;
+  }
+
+  private apply(settings: AppSettings) {
+    this.settings = { ...DEFAULT_SETTINGS, ...settings };
+    this.version++;
+  }
+}
+
+export const settingsStore = new SettingsStore();
@@ -0,0 +1,305 @@
+import fs from 'fs/promises';
+import path from 'path';
+import { ideaMetadata } from './idea-metadata.js';
+import type { StorageEngine, StoredSession } from './storage.js';
+import type { AppSettings, HackathonIdea, IdeaVisibility } from './types.js';
+
+// better-sqlite3 is only needed with STORAGE_ENGINE=sqlite, so it isn't a
+// dependency of the backend; keeping its name out of the import() call
+// keeps the build from requiring it too
+const SQLITE_MODULE = 'better-sqlite3';
+
+const SCHEMA = `
+  CREATE TABLE IF NOT EXISTS ideas (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    author TEXT NOT NULL,
+    description TEXT NOT NULL,
+    -- 'public', 'private' or a JSON array of usernames
+    visibility TEXT NOT NULL,
+    idea_type TEXT NOT NULL,
+    approved INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+  );
+  CREATE INDEX IF NOT EXISTS ideas_author ON ideas (author);
+  CREATE INDEX IF NOT EXISTS ideas_visibility_approved ON ideas (visibility, approved);
+  CREATE INDEX IF NOT EXISTS ideas_idea_type ON ideas (idea_type);
+  CREATE INDEX IF NOT EXISTS ideas_created_at ON ideas (created_at);
+
+  CREATE TABLE IF NOT EXISTS pages (
+    idea_id TEXT NOT NULL REFERENCES ideas (id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (idea_id, filename)
+  );
+
+  CREATE TABLE IF NOT EXISTS sessions (
+    sid TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at INTEGER NOT NULL
+  );
+  CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at);
+
+  CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+  );
+`;
+
+interface IdeaRow {
+  id: string;
+  name: string;
+  author: string;
+  description: string;
+  visibility: string;
+  idea_type: string;
+  approved: number;
+  created_at: string;
+}
+
+interface PageRow {
+  idea_id: string;
+  filename: string;
+  title: string;
+  content: string;
+}
+
+function encodeVisibility(visibility: IdeaVisibility): string {
+  return Array.isArray(visibility) ? JSON.stringify(visibility) : visibility;
+}
+
+function decodeVisibility(visibility: string): IdeaVisibility {
+  return visibility.startsWith('[') ? JSON.parse(visibility) : visibility as IdeaVisibility;
+}
+
+function ideaRow(idea: HackathonIdea): IdeaRow {
+  return {
+    id: idea.id,
+    name: idea.name,
+    author: idea.author,
+    description: idea.description,
+    visibility: encodeVisibility(idea.visibility),
+    idea_type: idea.ideaType,
+    approved: idea.approved ? 1 : 0,
+    created_at: idea.createdAt
+  };
+}
+
+function ideaFromRows(row: IdeaRow, pages: PageRow[]): HackathonIdea {
+  return {
+    id: row.id,
+    name: row.name,
+    author: row.author,
+    description: row.description,
+    visibility: decodeVisibility(row.visibility),
+    ideaType: row.idea_type as HackathonIdea['ideaType'],
+    approved: row.approved === 1,
+    createdAt: row.created_at,
+    pages: pages.map(page => ({ title: page.title, content: page.content, filename: page.filename }))
+  };
+}
+
+// Ideas, pages, settings and login sessions in one SQLite database (WAL
+// mode), through statements prepared once when it is opened. Loading every
+// idea takes two queries, and each save runs in a single transaction.
+// Nothing else writes to the database, so there is nothing to watch.
+export class SqliteStorage implements StorageEngine {
+  private opening: Promise<any> | null = null;
+
+  constructor(private file: string) {}
+
+  async loadIdeas(): Promise<HackathonIdea[]> {
+    const { statements } = await this.open();
+    const pagesByIdea = new Map<string, PageRow[]>();
+    for (const page of statements.allPages.all() as PageRow[]) {
+      let pages = pagesByIdea.get(page.idea_id);
+      if (!pages) {
+        pages = [];
+        pagesByIdea.set(page.idea_id, pages);
+      }
+      pages.push(page);
+    }
+    return (statements.allIdeas.all() as IdeaRow[]).map(row => ideaFromRows(row, pagesByIdea.get(row.id) ?? []));
+  }
+
+  async loadIdea(id: string): Promise<HackathonIdea | null> {
+    const { statements } = await this.open();
+    const row = statements.getIdea.get(id) as IdeaRow | undefined;
+    return row ? ideaFromRows(row, statements.getPages.all(id) as PageRow[]) : null;
+  }
+
+  async saveIdea(idea: HackathonIdea, stored: HackathonIdea | undefined): Promise<boolean> {
+    const { db, statements } = await this.open();
+    const metadataChanged = !stored || JSON.stringify(ideaMetadata(idea)) !== JSON.stringify(ideaMetadata(stored));
+
+    return db.transaction(() => {
+      if (metadataChanged) {
+        statements.upsertIdea.run(ideaRow(idea));
+      }
+
+      // Pages that are new, changed or moved
+      let pagesChanged = false;
+      idea.pages.forEach((page, position) => {
+        const before = stored?.pages[position];
+        if (before?.filename !== page.filename || before.title !== page.title || before.content !== page.content) {
+          statements.upsertPage.run({ idea_id: idea.id, filename: page.filename, position, title: page.title, content: page.content });
+          pagesChanged = true;
+        }
+      });
+
+      const kept = new Set(idea.pages.map(page => page.filename));
+      for (const page of stored?.pages ?? []) {
+        if (!kept.has(page.filename)) {
+          statements.deletePage.run(idea.id, page.filename);
+        }
+      }
+
+      return metadataChanged || pagesChanged;
+    })();
+  }
+
+  async replaceIdea(idea: HackathonIdea) {
+    await this.replaceIdeas([idea]);
+  }
+
+  // Store many complete ideas in one transaction (used by the migration)
+  async replaceIdeas(ideas: HackathonIdea[]) {
+    const { db, statements } = await this.open();
+    db.transaction(() => {
+      for (const idea of ideas) {
+        statements.deleteIdea.run(idea.id);
+        statements.upsertIdea.run(ideaRow(idea));
+        idea.pages.forEach((page, position) => {
+          statements.upsertPage.run({ idea_id: idea.id, filename: page.filename, position, title: page.title, content: page.content });
+        });
+      }
+    })();
+  }
+
+  async deleteIdea(id: string) {
+    const { statements } = await this.open();
+    // Its pages go with it (ON DELETE CASCADE)
+    statements.deleteIdea.run(id);
+  }
+
+  async loadSettings(): Promise<AppSettings> {
+    const { statements } = await this.open();
+    const row = statements.getSetting.get('app') as { value: string } | undefined;
+    return row ? JSON.parse(row.value) : { requireAdminApproval: false };
+  }
+
+  async saveSettings(settings: AppSettings) {
+    const { statements } = await this.open();
+    statements.putSetting.run('app', JSON.stringify(settings));
+  }
+
+  async loadSession(sid: string): Promise<StoredSession | null> {
+    const { statements } = await this.open();
+    const row = statements.getSession.get(sid) as { data: string; expires_at: number } | undefined;
+    return row ? { data: row.data, expiresAt: row.expires_at } : null;
+  }
+
+  async saveSession(sid: string, session: StoredSession) {
+    const { statements } = await this.open();
+    statements.putSession.run(sid, session.data, session.expiresAt);
+  }
+
+  async deleteSession(sid: string) {
+    const { statements } = await this.open();
+    statements.deleteSession.run(sid);
+  }
+
+  async sweepSessions(now: number): Promise<number> {
+    const { statements } = await this.open();
+    return statements.sweepSessions.run(now).changes;
+  }
+
+  async countSessions(): Promise<number> {
+    const { statements } = await this.open();
+    return (statements.countSessions.get() as { count: number }).count;
+  }
+
+  watch(): () => void {
+    return () => {};
+  }
+
+  async close() {
+    if (this.opening) {
+      const { db } = await this.opening;
+      db.close();
+      this.opening = null;
+    }
+  }
+
+  private open(): Promise<{ db: any; statements: Record<string, any> }> {
+    if (!this.opening) {
+      this.opening = this.connect().catch(error => {
+        this.opening = null;
+        throw error;
+      });
+    }
+    return this.opening;
+  }
+
+  private async connect() {
+    let Database;
+    try {
+      ({ default: Database } = await import(SQLITE_MODULE));
+    } catch (error: any) {
+      throw new Error(`STORAGE_ENGINE=sqlite needs the ${SQLITE_MODULE} package (npm install ${SQLITE_MODULE}): ${error.message}`);
+    }
+
+    await fs.mkdir(path.dirname(this.file), { recursive: true });
+    const db = new Database(this.file);
+    db.pragma('journal_mode = WAL');
+    // WAL keeps committed transactions safe without syncing on every commit
+    db.pragma('synchronous = NORMAL');
+    db.pragma('foreign_keys = ON');
+    db.exec(SCHEMA);
+
+    const statements = {
+      allIdeas: db.prepare('SELECT * FROM ideas ORDER BY id'),
+      allPages: db.prepare('SELECT idea_id, filename, title, content FROM pages ORDER BY idea_id, position'),
+      getIdea: db.prepare('SELECT * FROM ideas WHERE id = ?'),
+      getPages: db.prepare('SELECT idea_id, filename, title, content FROM pages WHERE idea_id = ? ORDER BY position'),
+      upsertIdea: db.prepare(`
+        INSERT INTO ideas (id, name, author, description, visibility, idea_type, approved, created_at)
+        VALUES (@id, @name, @author, @description, @visibility, @idea_type, @approved, @created_at)
+        ON CONFLICT (id) DO UPDATE SET
+          name = excluded.name,
+          author = excluded.author,
+          description = excluded.description,
+          visibility = excluded.visibility,
+          idea_type = excluded.idea_type,
+          approved = excluded.approved,
+          created_at = excluded.created_at
+      `),
+      deleteIdea: db.prepare('DELETE FROM ideas WHERE id = ?'),
+      upsertPage: db.prepare(`
+        INSERT INTO pages (idea_id, filename, position, title, content)
+        VALUES (@idea_id, @filename, @position, @title, @content)
+        ON CONFLICT (idea_id, filename) DO UPDATE SET
+          position = excluded.position,
+          title = excluded.title,
+          content = excluded.content
+      `),
+      deletePage: db.prepare('DELETE FROM pages WHERE idea_id = ? AND filename = ?'),
+      getSetting: db.prepare('SELECT value FROM settings WHERE key = ?'),
+      putSetting: db.prepare(`
+        INSERT INTO settings (key, value) VALUES (?, ?)
+        ON CONFLICT (key) DO UPDATE SET value = excluded.value
+      `),
+      getSession: db.prepare('SELECT data, expires_at FROM sessions WHERE sid = ?'),
+      putSession: db.prepare(`
+        INSERT INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)
+        ON CONFLICT (sid) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+      `),
+      deleteSession: db.prepare('DELETE FROM sessions WHERE sid = ?'),
+      sweepSessions: db.prepare('DELETE FROM sessions WHERE expires_at <= ?'),
+      countSessions: db.prepare('SELECT COUNT(*) AS count FROM sessions')
+    };
+    return { db, statements };
+  }
+}
@@ -0,0 +1,60 @@
+import { STORAGE_ENGINE, SQLITE_FILE } from './config.js';
+import { FileStorage } from './file-storage.js';
+import { SqliteStorage } from './sqlite-storage.js';
+import type { AppSettings, HackathonIdea } from './types.js';
+
+export interface StoredSession {
+  data: string;
+  expiresAt: number;
+}
+
+// Where ideas, settings and login sessions are persisted. Idea reads are
+// served by the idea index, so an engine is only read at startup and when it
+// reports a change; idea writes go through the idea writer, which orders
+// them per idea.
+export interface StorageEngine {
+  // Every stored idea
+  loadIdeas(): Promise<HackathonIdea[]>;
+
+  // One idea, or null if it isn't stored
+  loadIdea(id: string): Promise<HackathonIdea | null>;
+
+  // Store an idea given the version stored now (if any), writing only what
+  // differs; resolves to whether anything changed
+  saveIdea(idea: HackathonIdea, stored: HackathonIdea | undefined): Promise<boolean>;
+
+  // Store a complete idea in one step, replacing any previous version.
+  // stagedDir, if given, already holds its page files in pages/ (uploads
+  // are extracted there)
+  replaceIdea(idea: HackathonIdea, stagedDir?: string): Promise<void>;
+
+  deleteIdea(id: string): Promise<void>;
+
+  loadSettings(): Promise<AppSettings>;
+
+  saveSettings(settings: AppSettings): Promise<void>;
+
+  // A login session's data (serialized) and expiry time in ms, or null
+  loadSession(sid: string): Promise<StoredSession | null>;
+
+  saveSession(sid: string, session: StoredSession): Promise<void>;
+
+  deleteSession(sid: string): Promise<void>;
+
+  // Delete sessions that expired before now; resolves to how many
+  sweepSessions(now: number): Promise<number>;
+
+  countSessions(): Promise<number>;
+
+  // Call onChange with the id of each idea changed by something other than
+  // this engine; returns a function that stops watching
+  watch(onChange: (id: string) => void): () => void;
+
+  close(): Promise<void>;
+}
+
+export function createStorage(engine: string): StorageEngine {
+  return engine === 'sqlite' ? new SqliteStorage(SQLITE_FILE) : new FileStorage();
+}
+
+export const storage = createStorage(STORAGE_ENGINE);
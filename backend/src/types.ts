@@ -30,6 +30,11 @@ export interface HackathonIdea {
   pages: IdeaPage[];
 }
 
+// Idea metadata without page bodies, as returned by the summary listing
+export interface IdeaSummary extends Omit<HackathonIdea, 'pages'> {
+  pages: IdeaPageMetadata[];
+}
+
 export interface AppSettings {
   requireAdminApproval: boolean;
 }
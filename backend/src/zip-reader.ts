@@ -0,0 +1,193 @@
+import fs from 'fs/promises';
+import { createReadStream } from 'fs';
+import { pipeline, Readable, Transform } from 'stream';
+import zlib from 'zlib';
+
+// Minimal reader for ZIP archives on disk. Entries are listed from the
+// central directory and inflated one at a time as streams, so memory use
+// doesn't grow with the size of the archive. Encrypted and ZIP64 archives
+// aren't supported.
+
+const END_OF_CENTRAL_DIRECTORY = 0x06054b50;
+const CENTRAL_DIRECTORY_HEADER = 0x02014b50;
+const LOCAL_FILE_HEADER = 0x04034b50;
+
+const END_RECORD_SIZE = 22;
+const MAX_COMMENT_SIZE = 0xffff;
+
+const METHOD_STORED = 0;
+const METHOD_DEFLATE = 8;
+
+// The archive is not a ZIP we can read
+export class ZipFormatError extends Error {}
+
+// An entry (or the archive as a whole) is larger than allowed
+export class ZipLimitError extends Error {}
+
+export interface ZipEntry {
+  name: string;
+  isDirectory: boolean;
+  method: number;
+  compressedSize: number;
+  // As declared by the archive; enforced again while inflating
+  uncompressedSize: number;
+  localHeaderOffset: number;
+}
+
+// Fail the stream once more than maxBytes have passed through it
+function byteLimit(maxBytes: number, name: string): Transform {
+  let total = 0;
+  return new Transform({
+    transform(chunk: Buffer, _encoding, callback) {
+      total += chunk.length;
+      if (total > maxBytes) {
+        callback(new ZipLimitError(`${name} is larger than ${maxBytes} bytes`));
+      } else {
+        callback(null, chunk);
+      }
+    }
+  });
+}
+
+export class ZipReader {
+  private byName: Map<string, ZipEntry>;
+
+  private constructor(
+    private file: fs.FileHandle,
+    private filePath: string,
+    readonly entries: ZipEntry[]
+  ) {
+    this.byName = new Map(entries.map(entry => [entry.name, entry]));
+  }
+
+  static async open(filePath: string, maxEntries: number): Promise<ZipReader> {
+    const file = await fs.open(filePath, 'r');
+    try {
+      const entries = await readCentralDirectory(file, maxEntries);
+      return new ZipReader(file, filePath, entries);
+    } catch (error) {
+      await file.close();
+      throw error;
+    }
+  }
+
+  getEntry(name: string): ZipEntry | undefined {
+    return this.byName.get(name);
+  }
+
+  // Inflated contents of an entry, failing with ZipLimitError past maxBytes
+  async openReadStream(entry: ZipEntry, maxBytes: number): Promise<Readable> {
+    if (entry.uncompressedSize > maxBytes) {
+      throw new ZipLimitError(`${entry.name} is larger than ${maxBytes} bytes`);
+    }
+
+    const header = Buffer.alloc(30);
+    await this.file.read(header, 0, header.length, entry.localHeaderOffset);
+    if (header.readUInt32LE(0) !== LOCAL_FILE_HEADER) {
+      throw new ZipFormatError(`Invalid local header for ${entry.name}`);
+    }
+    const dataStart = entry.localHeaderOffset + 30 + header.readUInt16LE(26) + header.readUInt16LE(28);
+
+    const limit = byteLimit(maxBytes, entry.name);
+    if (entry.compressedSize === 0) {
+      limit.end();
+      return limit;
+    }
+
+    const raw = createReadStream(this.filePath, {
+      start: dataStart,
+      end: dataStart + entry.compressedSize - 1
+    });
+    // pipeline() tears every stage down and surfaces the error on the last
+    // one, which is what the caller reads from
+    const done = () => {};
+    return entry.method === METHOD_DEFLATE
+      ? pipeline(raw, zlib.createInflateRaw(), limit, done)
+      : pipeline(raw, limit, done);
+  }
+
+  async readText(entry: ZipEntry, maxBytes: number): Promise<string> {
+    const chunks: Buffer[] = [];
+    for await (const chunk of await this.openReadStream(entry, maxBytes)) {
+      chunks.push(chunk);
+    }
+    return Buffer.concat(chunks).toString('utf-8');
+  }
+
+  async close() {
+    await this.file.close();
+  }
+}
+
+async function readCentralDirectory(file: fs.FileHandle, maxEntries: number): Promise<ZipEntry[]> {
+  const { size } = await file.stat();
+  if (size < END_RECORD_SIZE) {
+    throw new ZipFormatError('Not a ZIP archive');
+  }
+
+  // The end record sits at the very end, followed only by an optional comment
+  const tailSize = Math.min(size, END_RECORD_SIZE + MAX_COMMENT_SIZE);
+  const tail = Buffer.alloc(tailSize);
+  await file.read(tail, 0, tailSize, size - tailSize);
+
+  let end = -1;
+  for (let i = tailSize - END_RECORD_SIZE; i >= 0; i--) {
+    if (tail.readUInt32LE(i) === END_OF_CENTRAL_DIRECTORY) {
+      end = i;
+      break;
+    }
+  }
+  if (end < 0) {
+    throw new ZipFormatError('Not a ZIP archive');
+  }
+
+  const entryCount = tail.readUInt16LE(end + 10);
+  const directorySize = tail.readUInt32LE(end + 12);
+  const directoryOffset = tail.readUInt32LE(end + 16);
+  if (entryCount === 0xffff || directoryOffset === 0xffffffff) {
+    throw new ZipFormatError('ZIP64 archives are not supported');
+  }
+  if (entryCount > maxEntries) {
+    throw new ZipLimitError(`Archive has more than ${maxEntries} entries`);
+  }
+  if (directoryOffset + directorySize > size) {
+    throw new ZipFormatError('Truncated ZIP archive');
+  }
+
+  const directory = Buffer.alloc(directorySize);
+  await file.read(directory, 0, directorySize, directoryOffset);
+
+  const entries: ZipEntry[] = [];
+  let offset = 0;
+  for (let i = 0; i < entryCount; i++) {
+    if (offset + 46 > directory.length || directory.readUInt32LE(offset) !== CENTRAL_DIRECTORY_HEADER) {
+      throw new ZipFormatError('Invalid central directory');
+    }
+
+    const flags = directory.readUInt16LE(offset + 8);
+    const method = directory.readUInt16LE(offset + 10);
+    const nameLength = directory.readUInt16LE(offset + 28);
+    const extraLength = directory.readUInt16LE(offset + 30);
+    const commentLength = directory.readUInt16LE(offset + 32);
+    const name = directory.toString('utf-8', offset + 46, offset + 46 + nameLength);
+
+    if (flags & 0x1) {
+      throw new ZipFormatError(`${name} is encrypted`);
+    }
+    if (method !== METHOD_STORED && method !== METHOD_DEFLATE) {
+      throw new ZipFormatError(`${name} uses an unsupported compression method`);
+    }
+
+    entries.push({
+      name,
+      isDirectory: name.endsWith('/'),
+      method,
+      compressedSize: directory.readUInt32LE(offset + 20),
+      uncompressedSize: directory.readUInt32LE(offset + 24),
+      localHeaderOffset: directory.readUInt32LE(offset + 42)
+    });
+    offset += 46 + nameLength + extraLength + commentLength;
+  }
+
+  return entries;
+}
@@ -4,6 +4,7 @@ import { Button } from '@/components/ui/button'
 import { Textarea } from '@/components/ui/textarea'
 import { Download, Upload as UploadIcon, CheckCircle, AlertCircle, Sparkles, FileText } from 'lucide-react'
 import { ideasAPI } from '@/lib/api'
+import { describeGenerationJob } from '@/lib/utils'
 import type { IdeaType } from '@/types'
 
 interface CreateModalProps {
@@ -17,6 +18,7 @@ export const CreateModal: React.FC<CreateModalProps> = ({ open, onOpenChange })
   const [activeTab, setActiveTab] = useState<Tab>('generate')
   const [uploading, setUploading] = useState(false)
   const [generating, setGenerating] = useState(false)
+  const [generationProgress, setGenerationProgress] = useState<string | null>(null)
   const [uploadStatus, setUploadStatus] = useState<{ type: 'success' | 'error', message: string } | null>(null)
   const [description, setDescription] = useState('')
   const [descriptionFile, setDescriptionFile] = useState<File | null>(null)
@@ -85,10 +87,14 @@ export const CreateModal: React.FC<CreateModalProps> = ({ open, onOpenChange })
     }
 
     setGenerating(true)
+    setGenerationProgress(null)
     setUploadStatus(null)
 
     try {
-      const response = await ideasAPI.generate(description, ideaType, descriptionFile || undefined)
+      // Generation runs as a queued job on the server; show where it is
+      const response = await ideasAPI.generate(description, ideaType, descriptionFile || undefined, (job) => {
+        setGenerationProgress(describeGenerationJob(job))
+      })
       
       const message = response.requiresApproval 
         ? 'Idea generated successfully! It will appear after admin approval.'
@@ -109,6 +115,7 @@ export const CreateModal: React.FC<CreateModalProps> = ({ open, onOpenChange })
       })
     } finally {
       setGenerating(false)
+      setGenerationProgress(null)
     }
   }
 
@@ -238,7 +245,7 @@ export const CreateModal: React.FC<CreateModalProps> = ({ open, onOpenChange })
                   {generating ? (
                     <>
                       <div className="mr-2 h-4 w-4 animate-spin rounded-full border-2 border-current border-t-transparent" />
-                      Generating with AI...
+                      {generationProgress ?? 'Generating with AI...'}
                     </>
                   ) : (
                     <>
@@ -15,7 +15,7 @@ import { AdminSettingsModal } from '@/components/AdminSettingsModal'
 import { LoginModal } from '@/components/LoginModal'
 import { Lightbulb, ChevronDown, Plus, Settings, LogOut, LogIn } from 'lucide-react'
 import { ideasAPI } from '@/lib/api'
-import { HackathonIdea } from '@/types'
+import { IdeaSummary } from '@/types'
 import { Input } from './ui/input'
 
 export const Navbar: React.FC = () => {
@@ -25,18 +25,22 @@ export const Navbar: React.FC = () => {
   const [adminModalOpen, setAdminModalOpen] = useState(false)
   const [loginModalOpen, setLoginModalOpen] = useState(false)
   const [ideaSearchQuery, setIdeaSearchQuery] = useState('')
-  const [ideas, setIdeas] = useState<HackathonIdea[]>([])
+  const [ideas, setIdeas] = useState<IdeaSummary[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [searchResults, setSearchResults] = useState<IdeaSummary[] | null>(null)
 
-  useEffect(() => {
-    const loadIdeas = async () => {
-      try {
-        const fetchedIdeas = await ideasAPI.getAll()
-        setIdeas(fetchedIdeas)
-      } catch (error) {
-        console.error('Failed to load ideas:', error)
-      }
+  // The dropdown only shows name, description and author
+  const loadIdeas = async (cursor: string | null = null) => {
+    try {
+      const page = await ideasAPI.list({ cursor, limit: 50, fields: ['name', 'description', 'author'] })
+      setIdeas(prev => cursor ? [...prev, ...page.ideas] : page.ideas)
+      setNextCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Failed to load ideas:', error)
     }
+  }
 
+  useEffect(() => {
     loadIdeas()
   }, [user])
 
@@ -49,10 +53,31 @@ export const Navbar: React.FC = () => {
     navigate('/dashboard')
   }
 
-  const filteredIdeas = ideas.filter(idea =>
-    idea.name.toLowerCase().includes(ideaSearchQuery.toLowerCase()) ||
-    idea.description.toLowerCase().includes(ideaSearchQuery.toLowerCase())
-  )
+  // Type-ahead search on the server
+  useEffect(() => {
+    const query = ideaSearchQuery.trim()
+    if (!query) {
+      setSearchResults(null)
+      return
+    }
+
+    let cancelled = false
+    const timer = setTimeout(async () => {
+      try {
+        const results = await ideasAPI.search(query, { prefix: true, limit: 20, fields: ['name', 'description', 'author'] })
+        if (!cancelled) setSearchResults(results.ideas)
+      } catch (error) {
+        console.error('Failed to search ideas:', error)
+      }
+    }, 150)
+
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
+  }, [ideaSearchQuery, user])
+
+  const filteredIdeas = searchResults ?? ideas
 
   return (
     <>
@@ -109,6 +134,18 @@ export const Navbar: React.FC = () => {
                     </DropdownMenuItem>
                   ))
                 )}
+                {nextCursor && !searchResults && (
+                  <DropdownMenuItem
+                    onSelect={(e) => {
+                      // Keep the menu open while more ideas load
+                      e.preventDefault()
+                      loadIdeas(nextCursor)
+                    }}
+                    className="cursor-pointer justify-center text-sm text-muted-foreground"
+                  >
+                    Show more ideas
+                  </DropdownMenuItem>
+                )}
               </DropdownMenuContent>
             </DropdownMenu>
 
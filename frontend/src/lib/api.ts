@@ -1,6 +1,6 @@
-import type { User, HackathonIdea, AppSettings } from '../types';
+import type { User, HackathonIdea, IdeaPage, IdeaSummary, IdeaSummaryPage, IdeaSearchResults, GenerationJob, AppSettings } from '../types';
 
-const API_BASE_URL = 'http://localhost:3001/api';
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:3001/api';
 
 // Helper function for API calls
 async function apiCall<T>(
@@ -24,6 +24,65 @@ async function apiCall<T>(
   return response.json();
 }
 
+// Page bodies fetched by the idea viewer, keyed by `${ideaId}/${filename}`.
+// Promises are cached so a prefetch and a real fetch of the same page share one request.
+const PAGE_CACHE_SIZE = 100;
+const pageCache = new Map<string, Promise<IdeaPage>>();
+
+function invalidatePages(ideaId: string) {
+  for (const key of pageCache.keys()) {
+    if (key.startsWith(`${ideaId}/`)) {
+      pageCache.delete(key);
+    }
+  }
+}
+
+// Follow a generation job over server-sent events until it finishes,
+// resolving with its result. onOutput gets the model output streamed so
+// far, starting over if the job is retried.
+function waitForJob<T>(
+  jobId: string,
+  onProgress?: (job: GenerationJob<T>) => void,
+  onOutput?: (output: string) => void
+): Promise<T> {
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}/ideas/jobs/${jobId}/events`, { withCredentials: true });
+    let attempt = 0;
+    let output = '';
+
+    source.addEventListener('output', (event) => {
+      output += JSON.parse((event as MessageEvent).data).text;
+      onOutput?.(output);
+    });
+
+    source.onmessage = (event) => {
+      const job: GenerationJob<T> = JSON.parse(event.data);
+      if (job.attempts !== attempt) {
+        attempt = job.attempts;
+        if (output) {
+          output = '';
+          onOutput?.(output);
+        }
+      }
+      onProgress?.(job);
+      if (job.status === 'succeeded') {
+        source.close();
+        resolve(job.result as T);
+      } else if (job.status === 'failed') {
+        source.close();
+        reject(new Error(job.error || 'Generation failed'));
+      }
+    };
+
+    source.onerror = () => {
+      // EventSource reconnects by itself unless the server turned it away
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error('Lost track of the generation; check the dashboard before trying again'));
+      }
+    };
+  });
+}
+
 // Auth API
 export const authAPI = {
   login: async (username: string, password: string): Promise<{ user: User }> => {
@@ -48,10 +107,56 @@ export const ideasAPI = {
     return apiCall('/ideas');
   },
 
+  // Metadata-only listing, one page at a time; pass nextCursor to continue
+  list: async (options: { cursor?: string | null; limit?: number; fields?: (keyof IdeaSummary)[] } = {}): Promise<IdeaSummaryPage> => {
+    const params = new URLSearchParams({ summary: '1' });
+    if (options.cursor) params.set('cursor', options.cursor);
+    if (options.limit) params.set('limit', String(options.limit));
+    if (options.fields) params.set('fields', options.fields.join(','));
+    return apiCall(`/ideas?${params}`);
+  },
+
   getById: async (id: string): Promise<HackathonIdea> => {
     return apiCall(`/ideas/${id}`);
   },
 
+  // Ranked full-text search; prefix makes the last word match as you type
+  search: async (query: string, options: { prefix?: boolean; limit?: number; fields?: (keyof IdeaSummary)[] } = {}): Promise<IdeaSearchResults> => {
+    const params = new URLSearchParams({ q: query });
+    if (options.prefix) params.set('prefix', '1');
+    if (options.limit) params.set('limit', String(options.limit));
+    if (options.fields) params.set('fields', options.fields.join(','));
+    return apiCall(`/ideas/search?${params}`);
+  },
+
+  // Idea metadata with page titles and filenames, but no page HTML
+  getSummary: async (id: string): Promise<IdeaSummary> => {
+    return apiCall(`/ideas/${id}?summary=1`);
+  },
+
+  getPage: (id: string, filename: string): Promise<IdeaPage> => {
+    const key = `${id}/${filename}`;
+    let page = pageCache.get(key);
+    if (page) {
+      // Move to the back so the least recently used page is evicted first
+      pageCache.delete(key);
+    } else {
+      page = apiCall<IdeaPage>(`/ideas/${id}/pages/${encodeURIComponent(filename)}`);
+      page.catch(() => pageCache.delete(key));
+    }
+    pageCache.set(key, page);
+
+    if (pageCache.size > PAGE_CACHE_SIZE) {
+      pageCache.delete(pageCache.keys().next().value!);
+    }
+    return page;
+  },
+
+  // Warm the cache for a page the user is likely to open next
+  prefetchPage: (id: string, filename: string): void => {
+    ideasAPI.getPage(id, filename).catch(() => {});
+  },
+
   upload: async (file: File): Promise<{ message: string; idea: HackathonIdea; requiresApproval: boolean }> => {
     const formData = new FormData();
     formData.append('zip', file);
@@ -70,7 +175,12 @@ export const ideasAPI = {
     return response.json();
   },
 
-  generate: async (description: string, ideaType: string, file?: File): Promise<{ message: string; idea: HackathonIdea; requiresApproval: boolean }> => {
+  generate: async (
+    description: string,
+    ideaType: string,
+    file?: File,
+    onProgress?: (job: GenerationJob) => void
+  ): Promise<{ message: string; idea: IdeaSummary; requiresApproval: boolean }> => {
     const formData = new FormData();
     
     formData.append('ideaType', ideaType);
@@ -92,7 +202,8 @@ export const ideasAPI = {
       throw new Error(error.error || 'Generation failed');
     }
 
-    return response.json();
+    const job: GenerationJob = await response.json();
+    return waitForJob<{ message: string; idea: IdeaSummary; requiresApproval: boolean }>(job.id, onProgress);
   },
 
   updateApproval: async (id: string, approved: boolean): Promise<{ message: string; idea: HackathonIdea }> => {
@@ -103,18 +214,43 @@ export const ideasAPI = {
   },
 
   delete: async (id: string): Promise<{ message: string }> => {
-    return apiCall(`/ideas/${id}`, { method: 'DELETE' });
+    const result = await apiCall<{ message: string }>(`/ideas/${id}`, { method: 'DELETE' });
+    invalidatePages(id);
+    return result;
   },
 
-  addPage: async (id: string, title: string, description: string): Promise<{ message: string; page: { title: string; filename: string } }> => {
-    return apiCall(`/ideas/${id}/pages`, {
+  // onOutput receives the page's HTML as it is generated
+  addPage: async (
+    id: string,
+    title: string,
+    description: string,
+    onProgress?: (job: GenerationJob) => void,
+    onOutput?: (content: string) => void
+  ): Promise<{ message: string; page: { title: string; filename: string } }> => {
+    const job = await apiCall<GenerationJob>(`/ideas/${id}/pages`, {
       method: 'POST',
       body: JSON.stringify({ title, description }),
     });
+
+    let content = '';
+    const result = await waitForJob<{ message: string; page: { title: string; filename: string } }>(job.id, onProgress, (output) => {
+      content = output;
+      onOutput?.(output);
+    });
+
+    // Adding a page with an existing title replaces that page's file
+    invalidatePages(id);
+    // The streamed output is what was saved, so the viewer needn't fetch it again
+    if (content) {
+      pageCache.set(`${id}/${result.page.filename}`, Promise.resolve({ ...result.page, content }));
+    }
+    return result;
   },
 
   deletePage: async (id: string, filename: string): Promise<{ message: string }> => {
-    return apiCall(`/ideas/${id}/pages/${filename}`, { method: 'DELETE' });
+    const result = await apiCall<{ message: string }>(`/ideas/${id}/pages/${filename}`, { method: 'DELETE' });
+    invalidatePages(id);
+    return result;
   },
 
   downloadContextFile: (): string => {
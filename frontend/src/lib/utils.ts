@@ -1,6 +1,25 @@
 import { type ClassValue, clsx } from "clsx"
 import { twMerge } from "tailwind-merge"
+import type { GenerationJob } from "@/types"
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+// Short status line for an AI generation in progress
+export function describeGenerationJob(job: GenerationJob): string {
+  switch (job.status) {
+    case "queued":
+      return job.position && job.position > 1
+        ? `Waiting for a free slot (${job.position - 1} ahead)...`
+        : "Starting shortly..."
+    case "retrying":
+      return `The AI service hiccuped, retrying (attempt ${job.attempts + 1} of ${job.maxAttempts})...`
+    case "running":
+      return job.attempts > 1
+        ? `Generating with AI (attempt ${job.attempts} of ${job.maxAttempts})...`
+        : "Generating with AI..."
+    default:
+      return "Finishing up..."
+  }
+}
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { HackathonIdea, User } from '@/types'
+import { IdeaSummary, User } from '@/types'
 import { ideasAPI } from '@/lib/api'
 import { useAuth } from '@/contexts/AuthContext'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
@@ -8,13 +8,22 @@ import { Input } from '@/components/ui/input'
 import { Badge } from '@/components/ui/badge'
 import { Search, Calendar, User as UserIcon } from 'lucide-react'
 
+// Ideas fetched per request; more are loaded as the user scrolls
+const PAGE_SIZE = 48
+
+// Wait for typing to pause before searching
+const SEARCH_DEBOUNCE_MS = 200
+
 export const DashboardPage: React.FC = () => {
-  const [ideas, setIdeas] = useState<HackathonIdea[]>([])
+  const [ideas, setIdeas] = useState<IdeaSummary[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [searchQuery, setSearchQuery] = useState('')
+  const [searchResults, setSearchResults] = useState<IdeaSummary[] | null>(null)
   const [loading, setLoading] = useState(true)
   const { user } = useAuth()
   const navigate = useNavigate()
   const prevUserRef = useRef<User | null>(null)
+  const sentinelRef = useRef<HTMLDivElement>(null)
 
   useEffect(() => {
     loadIdeas()
@@ -34,8 +43,9 @@ export const DashboardPage: React.FC = () => {
   const loadIdeas = async () => {
     try {
       setLoading(true)
-      const fetchedIdeas = await ideasAPI.getAll()
-      setIdeas(fetchedIdeas)
+      const page = await ideasAPI.list({ limit: PAGE_SIZE })
+      setIdeas(page.ideas)
+      setNextCursor(page.nextCursor)
     } catch (error) {
       console.error('Failed to load ideas:', error)
     } finally {
@@ -43,11 +53,59 @@ export const DashboardPage: React.FC = () => {
     }
   }
 
-  const filteredIdeas = ideas.filter(idea =>
-    idea.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-    idea.author.toLowerCase().includes(searchQuery.toLowerCase()) ||
-    idea.description.toLowerCase().includes(searchQuery.toLowerCase())
-  )
+  const loadMoreIdeas = async () => {
+    if (!nextCursor || loading) return
+    try {
+      setLoading(true)
+      const page = await ideasAPI.list({ cursor: nextCursor, limit: PAGE_SIZE })
+      setIdeas(prev => [...prev, ...page.ideas])
+      setNextCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Failed to load more ideas:', error)
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  // Fetch the next page when the end of the grid scrolls into view
+  useEffect(() => {
+    const sentinel = sentinelRef.current
+    if (!sentinel || !nextCursor) return
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) {
+        loadMoreIdeas()
+      }
+    }, { rootMargin: '400px' })
+    observer.observe(sentinel)
+    return () => observer.disconnect()
+  }, [nextCursor, loading])
+
+  // Search runs on the server, over every idea's text and pages
+  useEffect(() => {
+    const query = searchQuery.trim()
+    if (!query) {
+      setSearchResults(null)
+      return
+    }
+
+    let cancelled = false
+    const timer = setTimeout(async () => {
+      try {
+        const results = await ideasAPI.search(query, { prefix: true, limit: 100 })
+        if (!cancelled) setSearchResults(results.ideas)
+      } catch (error) {
+        console.error('Failed to search ideas:', error)
+      }
+    }, SEARCH_DEBOUNCE_MS)
+
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
+  }, [searchQuery, user])
+
+  const filteredIdeas = searchResults ?? ideas
 
   const handleIdeaClick = (ideaId: string) => {
     navigate(`/idea/${ideaId}`)
@@ -66,7 +124,7 @@ export const DashboardPage: React.FC = () => {
         <div className="relative max-w-md">
           <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 h-4 w-4 text-muted-foreground" />
           <Input
-            placeholder="Search ideas by name or author..."
+            placeholder="Search ideas by name, author or content..."
             value={searchQuery}
             onChange={(e) => setSearchQuery(e.target.value)}
             className="pl-10"
@@ -125,6 +183,8 @@ export const DashboardPage: React.FC = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && !searchResults && <div ref={sentinelRef} className="h-1" aria-hidden="true" />}
     </div>
   )
 }
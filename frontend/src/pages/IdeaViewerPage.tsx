@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
-import { HackathonIdea } from '@/types'
+import { IdeaSummary } from '@/types'
 import { ideasAPI } from '@/lib/api'
+import { describeGenerationJob } from '@/lib/utils'
 import { useAuth } from '@/contexts/AuthContext'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent } from '@/components/ui/card'
@@ -13,8 +14,9 @@ import { ArrowLeft, User, Calendar, Plus, Settings as SettingsIcon, Trash2, Load
 
 export const IdeaViewerPage: React.FC = () => {
   const { ideaId } = useParams<{ ideaId: string }>()
-  const [idea, setIdea] = useState<HackathonIdea | null>(null)
+  const [idea, setIdea] = useState<IdeaSummary | null>(null)
   const [currentPageIndex, setCurrentPageIndex] = useState(0)
+  const [pageContent, setPageContent] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
   const { user } = useAuth()
   const navigate = useNavigate()
@@ -30,6 +32,9 @@ export const IdeaViewerPage: React.FC = () => {
   const [pageTitle, setPageTitle] = useState('')
   const [pageDescription, setPageDescription] = useState('')
   const [adding, setAdding] = useState(false)
+  const [addingProgress, setAddingProgress] = useState<string | null>(null)
+  // Page being generated, shown as an extra tab while its HTML streams in
+  const [streamingPage, setStreamingPage] = useState<{ title: string; content: string } | null>(null)
   const [deleting, setDeleting] = useState(false)
   const [error, setError] = useState('')
 
@@ -45,7 +50,7 @@ export const IdeaViewerPage: React.FC = () => {
 
     try {
       setLoading(true)
-      const fetchedIdea = await ideasAPI.getById(ideaId)
+      const fetchedIdea = await ideasAPI.getSummary(ideaId)
       setIdea(fetchedIdea)
     } catch (error) {
       console.error('Failed to load idea:', error)
@@ -55,24 +60,67 @@ export const IdeaViewerPage: React.FC = () => {
     }
   }
 
+  // Load the visible page's HTML on demand, then prefetch the next tab's
+  const currentFilename = idea?.pages[currentPageIndex]?.filename
+  useEffect(() => {
+    if (!idea || !currentFilename) return
+
+    let cancelled = false
+    setPageContent(null)
+    ideasAPI.getPage(idea.id, currentFilename)
+      .then((page) => {
+        if (!cancelled) setPageContent(page.content)
+      })
+      .catch((error) => {
+        console.error('Failed to load page:', error)
+        if (!cancelled) setPageContent('<p>Failed to load this page.</p>')
+      })
+
+    const nextPage = idea.pages[currentPageIndex + 1]
+    if (nextPage) {
+      ideasAPI.prefetchPage(idea.id, nextPage.filename)
+    }
+
+    return () => {
+      cancelled = true
+    }
+  }, [idea, currentFilename])
+
   const handleAddPage = async () => {
     if (!pageTitle.trim() || !pageDescription.trim()) {
       setError('Both title and description are required')
       return
     }
 
+    // Close the dialog and watch the page being written in its own tab;
+    // it lands at the end, so the same index shows it once it's saved
+    const title = pageTitle
+    const previousPageIndex = currentPageIndex
+    setStreamingPage({ title, content: '' })
+    setCurrentPageIndex(idea!.pages.length)
+    setAddPageModalOpen(false)
+
     try {
       setAdding(true)
       setError('')
-      await ideasAPI.addPage(ideaId!, pageTitle, pageDescription)
+      await ideasAPI.addPage(
+        ideaId!,
+        title,
+        pageDescription,
+        (job) => setAddingProgress(describeGenerationJob(job)),
+        (content) => setStreamingPage({ title, content })
+      )
       await loadIdea()
-      setAddPageModalOpen(false)
       setPageTitle('')
       setPageDescription('')
     } catch (error: any) {
       setError(error.message || 'Failed to add page')
+      setCurrentPageIndex(previousPageIndex)
+      setAddPageModalOpen(true)
     } finally {
       setAdding(false)
+      setAddingProgress(null)
+      setStreamingPage(null)
     }
   }
 
@@ -120,6 +168,8 @@ export const IdeaViewerPage: React.FC = () => {
   }
 
   const currentPage = idea.pages[currentPageIndex]
+  const showingStreamingPage = streamingPage !== null && currentPageIndex === idea.pages.length
+  const pageTabs = streamingPage ? [...idea.pages, { title: streamingPage.title, filename: '' }] : idea.pages
   const isAuthor = user?.username === idea.author
   const canDelete = isAuthor || user?.role === 'admin'
 
@@ -156,15 +206,16 @@ export const IdeaViewerPage: React.FC = () => {
           </div>
 
           <div className="flex flex-wrap gap-2 items-center">
-            {idea.pages.length > 1 && (
+            {pageTabs.length > 1 && (
               <div className="flex flex-wrap gap-2">
-                {idea.pages.map((page, index) => (
+                {pageTabs.map((page, index) => (
                   <Button
                     key={index}
                     variant={currentPageIndex === index ? 'default' : 'outline'}
                     onClick={() => setCurrentPageIndex(index)}
                     size="sm"
                   >
+                    {index === idea.pages.length && <Loader2 className="h-3 w-3 mr-2 animate-spin" />}
                     {page.title}
                   </Button>
                 ))}
@@ -178,6 +229,7 @@ export const IdeaViewerPage: React.FC = () => {
                   variant="outline"
                   size="sm"
                   onClick={() => setAddPageModalOpen(true)}
+                  disabled={adding}
                 >
                   <Plus className="h-4 w-4 mr-2" />
                   Add Page
@@ -209,10 +261,29 @@ export const IdeaViewerPage: React.FC = () => {
 
       <Card>
         <CardContent className="pt-6">
-          <div 
-            className="prose prose-slate dark:prose-invert max-w-none"
-            dangerouslySetInnerHTML={{ __html: currentPage.content }}
-          />
+          {showingStreamingPage ? (
+            streamingPage.content ? (
+              <div
+                className="prose prose-slate dark:prose-invert max-w-none"
+                dangerouslySetInnerHTML={{ __html: streamingPage.content }}
+              />
+            ) : (
+              <div className="flex items-center gap-2 text-muted-foreground">
+                <Loader2 className="h-4 w-4 animate-spin" />
+                <span>{addingProgress ?? `Generating ${streamingPage.title}...`}</span>
+              </div>
+            )
+          ) : pageContent === null ? (
+            <div className="flex items-center gap-2 text-muted-foreground">
+              <Loader2 className="h-4 w-4 animate-spin" />
+              <span>Loading {currentPage?.title ?? 'page'}...</span>
+            </div>
+          ) : (
+            <div 
+              className="prose prose-slate dark:prose-invert max-w-none"
+              dangerouslySetInnerHTML={{ __html: pageContent }}
+            />
+          )}
         </CardContent>
       </Card>
 
@@ -256,7 +327,7 @@ export const IdeaViewerPage: React.FC = () => {
             </Button>
             <Button onClick={handleAddPage} disabled={adding}>
               {adding && <Loader2 className="h-4 w-4 mr-2 animate-spin" />}
-              {adding ? 'Generating...' : 'Generate Page'}
+              {adding ? (addingProgress ?? 'Generating...') : 'Generate Page'}
             </Button>
           </DialogFooter>
         </DialogContent>
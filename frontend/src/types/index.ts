@@ -30,6 +30,39 @@ export interface HackathonIdea {
   createdAt: string
 }
 
+// Idea metadata without page bodies, from the summary listing
+export interface IdeaSummary extends Omit<HackathonIdea, 'pages'> {
+  pages: IdeaPageMetadata[]
+}
+
+export interface IdeaSummaryPage {
+  ideas: IdeaSummary[]
+  nextCursor: string | null
+}
+
+export interface IdeaSearchResults {
+  ideas: IdeaSummary[]
+  total: number
+}
+
+export type GenerationJobStatus = 'queued' | 'running' | 'retrying' | 'succeeded' | 'failed'
+
+// A background AI generation, as reported by /api/ideas/jobs
+export interface GenerationJob<T = unknown> {
+  id: string
+  kind: 'idea' | 'page'
+  owner: string
+  status: GenerationJobStatus
+  position: number | null
+  attempts: number
+  maxAttempts: number
+  retryAt: string | null
+  error: string | null
+  result: T | null
+  createdAt: string
+  updatedAt: string
+}
+
 export interface AppSettings {
   requireAdminApproval: boolean
 }
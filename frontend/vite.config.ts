@@ -2,6 +2,11 @@ import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 import path from 'path'
 
+// Backend that /api is proxied to. Builds made with VITE_API_URL=/api talk to
+// whichever backend the server they are served from points at, which lets
+// parallel test workers share one build.
+const backendUrl = process.env.BACKEND_URL || 'http://localhost:3001'
+
 // https://vitejs.dev/config/
 export default defineConfig({
   plugins: [react()],
@@ -10,4 +15,14 @@ export default defineConfig({
       '@': path.resolve(__dirname, './src'),
     },
   },
+  server: {
+    proxy: {
+      '/api': backendUrl,
+    },
+  },
+  preview: {
+    proxy: {
+      '/api': backendUrl,
+    },
+  },
 })
@@ -0,0 +1,40 @@
+"""
+Backend sessions obtained over HTTP, for skipping the login form in tests
+"""
+import json
+import urllib.request
+from http.cookies import SimpleCookie
+
+# express-session's default cookie name
+SESSION_COOKIE = 'connect.sid'
+
+def api_login(api_url, username, password):
+    """POST /api/auth/login and return the raw session cookie value"""
+    request = urllib.request.Request(
+        f'{api_url}/api/auth/login',
+        data=json.dumps({'username': username, 'password': password}).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        for header in response.headers.get_all('Set-Cookie') or []:
+            cookie = SimpleCookie(header)
+            if SESSION_COOKIE in cookie:
+                return cookie[SESSION_COOKIE].value
+
+    raise RuntimeError(f"Login as {username} did not return a {SESSION_COOKIE} cookie")
+
+class SessionCookieCache:
+    """Logs in once per role and hands out the same session cookie after that"""
+
+    def __init__(self, api_url, credentials):
+        self.api_url = api_url
+        self.credentials = credentials
+        self._cookies = {}
+
+    def get(self, role):
+        if role not in self._cookies:
+            username, password = self.credentials[role]
+            self._cookies[role] = api_login(self.api_url, username, password)
+        return self._cookies[role]
+
@@ -0,0 +1,148 @@
+"""
+Session-scoped pool of warm Chrome instances shared by the test suite
+"""
+import time
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+
+class BrowserPool:
+    """Hands out warm Chrome drivers and resets their state between tests.
+
+    Starting Chrome is the most expensive part of a test, so instead of a
+    cold start per test per screen size we keep idle browsers around and
+    only resize the window when a test asks for a different screen.
+    """
+
+    def __init__(self, origins, init_scripts=(), max_idle=1, headless=False):
+        self.origins = origins
+        self.init_scripts = list(init_scripts)
+        self.max_idle = max_idle
+        self.headless = headless
+        self._idle = []
+        self._live = []
+
+        # Stats for the end-of-session summary
+        self.cold_starts = 0
+        self.cold_start_time = 0.0
+        self.reuses = 0
+        self.reset_time = 0.0
+
+    def _start_browser(self):
+        options = Options()
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        if self.headless:
+            # Flags CI containers usually need alongside headless
+            options.add_argument('--headless=new')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
+
+        started = time.perf_counter()
+        driver = webdriver.Chrome(options=options)
+        self.cold_start_time += time.perf_counter() - started
+        self.cold_starts += 1
+
+        # Scripts that must run before any page script, on every navigation
+        for source in self.init_scripts:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+
+        self._live.append(driver)
+        return driver
+
+    def acquire(self, screen_name, size, profile=None):
+        """Return a clean driver sized and throttled for the given screen"""
+        if self._idle:
+            driver = self._idle.pop()
+            self.reuses += 1
+        else:
+            driver = self._start_browser()
+
+        width, height = size
+        driver.set_window_size(width, height)
+        self.throttle(driver, profile or {})
+        driver.screen_name = screen_name
+        return driver
+
+    def throttle(self, driver, profile):
+        """Apply a device profile's network and CPU limits (empty profile: none)"""
+        network = profile.get('network')
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.emulateNetworkConditions', {
+            'offline': False,
+            'latency': network['latency_ms'] if network else 0,
+            # CDP takes bytes per second; -1 disables throttling
+            'downloadThroughput': network['download_kbps'] * 1000 / 8 if network else -1,
+            'uploadThroughput': network['upload_kbps'] * 1000 / 8 if network else -1,
+        })
+        driver.execute_cdp_cmd('Emulation.setCPUThrottlingRate', {'rate': profile.get('cpu_slowdown', 1)})
+
+    def release(self, driver):
+        """Reset a driver and put it back in the pool"""
+        try:
+            self.reset(driver)
+        except WebDriverException as e:
+            # A crashed or wedged browser is not worth keeping around
+            print(f"  ⚠️  Dropping browser from pool: {e.msg}")
+            self._quit(driver)
+            return
+
+        if len(self._idle) < self.max_idle:
+            self._idle.append(driver)
+        else:
+            self._quit(driver)
+
+    def reset(self, driver):
+        """Clear cookies, storage and theme so the next test starts fresh"""
+        started = time.perf_counter()
+
+        # Leave the app first so nothing writes storage back while we clear it
+        driver.get('about:blank')
+
+        # Cookies are shared across ports on localhost, so clear them all
+        # (delete_all_cookies only covers the current document's domain)
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+
+        # localStorage holds the ThemeContext theme, so clearing it also
+        # puts the next page load back on the default light theme
+        for origin in self.origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': origin,
+                'storageTypes': 'local_storage,session_storage,indexeddb,cache_storage,service_workers',
+            })
+
+        self.reset_time += time.perf_counter() - started
+
+    def _quit(self, driver):
+        if driver in self._live:
+            self._live.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def close(self):
+        """Quit every browser the pool started"""
+        for driver in list(self._live):
+            self._quit(driver)
+        self._idle.clear()
+
+    @property
+    def average_cold_start(self):
+        if not self.cold_starts:
+            return 0.0
+        return self.cold_start_time / self.cold_starts
+
+    @property
+    def time_saved(self):
+        """Estimated startup time saved by reusing warm browsers"""
+        return max(0.0, self.reuses * self.average_cold_start - self.reset_time)
+
+    def summary(self):
+        return (
+            f"{self.cold_starts} cold start(s) "
+            f"(avg {self.average_cold_start:.2f}s), "
+            f"{self.reuses} reuse(s), "
+            f"{self.reset_time:.2f}s spent resetting, "
+            f"~{self.time_saved:.1f}s of startup saved"
+        )
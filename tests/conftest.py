@@ -2,10 +2,27 @@
 Pytest configuration and fixtures for integration tests
 """
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import os
 import time
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from browser_pool import BrowserPool
+from api_session import SessionCookieCache, SESSION_COOKIE
+from screenshot_pipeline import ScreenshotPipeline
+from perf_metrics import PerfRecorder, LCP_OBSERVER_JS, load_budgets
+
+# App origins under test (run_parallel.py points each worker at its own servers)
+BASE_URL = os.environ.get('TEST_BASE_URL', 'http://localhost:5173')
+API_URL = os.environ.get('TEST_API_URL', 'http://localhost:3001')
+
+# Set when the backend talks to mock_openai.py, so tests may trigger AI generation
+OPENAI_MOCKED = os.environ.get('TEST_OPENAI_MOCK') == '1'
+
+# Test accounts, matching the hardcoded users in backend/src/routes/auth.ts
+CREDENTIALS = {
+    'admin': ('admin', 'chiru'),
+    'hacker': ('hacker', 'pragmanchiru'),
+}
 
 # Screen sizes to test
 SCREEN_SIZES = {
@@ -15,6 +32,90 @@ SCREEN_SIZES = {
     'mobile': (375, 812),     # iPhone X
 }
 
+# Network and CPU conditions each screen size runs under, so the smaller
+# devices see roughly what real phones and tablets on mobile data do
+DEVICE_PROFILES = {
+    'desktop': {},
+    'laptop': {},
+    'tablet': {
+        'network': {'latency_ms': 60, 'download_kbps': 9000, 'upload_kbps': 1500},   # Fast 4G
+        'cpu_slowdown': 2,
+    },
+    'mobile': {
+        'network': {'latency_ms': 150, 'download_kbps': 1600, 'upload_kbps': 750},   # Slow 4G
+        'cpu_slowdown': 4,
+    },
+}
+
+# Optionally restrict the run to some screen sizes, e.g. TEST_SCREENS=mobile,tablet
+if os.environ.get('TEST_SCREENS'):
+    SCREEN_SIZES = {
+        name: size for name, size in SCREEN_SIZES.items()
+        if name in os.environ['TEST_SCREENS'].split(',')
+    }
+
+# Upper bound for condition waits; they return as soon as the condition holds
+WAIT_TIMEOUT = 10
+WAIT_POLL_INTERVAL = 0.05
+
+# How long the page must stay quiet before the network counts as idle
+NETWORK_QUIET_PERIOD = 0.3
+
+# Counts in-flight fetch/XHR requests; installed before any app script runs
+NETWORK_TRACKER_JS = """
+(() => {
+  if (window.__pendingRequests !== undefined) return;
+  window.__pendingRequests = 0;
+
+  const originalFetch = window.fetch;
+  window.fetch = function (...args) {
+    window.__pendingRequests++;
+    return originalFetch.apply(this, args).finally(() => { window.__pendingRequests--; });
+  };
+
+  const originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function (...args) {
+    window.__pendingRequests++;
+    this.addEventListener('loadend', () => { window.__pendingRequests--; }, { once: true });
+    return originalSend.apply(this, args);
+  };
+})();
+"""
+
+# The app has rendered once #root has content and the auth spinner is gone
+REACT_RENDERED_JS = """
+const root = document.getElementById('root');
+return !!root && root.childElementCount > 0 && !root.querySelector('.animate-spin');
+"""
+
+# Every wait performed this session as (description, seconds waited)
+wait_log = []
+
+def pytest_addoption(parser):
+    group = parser.getgroup('screenshots', 'visual regression screenshots')
+    group.addoption('--update-baselines', action='store_true',
+                    help='store this run\'s screenshots as the new baselines')
+    group.addoption('--screenshot-threshold', type=float, default=0.001,
+                    help='fraction of changed pixels that counts as a regression (default: 0.001)')
+    group.addoption('--screenshot-tolerance', type=int, default=16,
+                    help='per-pixel difference (0-255) ignored as noise (default: 16)')
+    group.addoption('--perceptual-diff', action='store_true',
+                    help='compare downscaled grayscale images instead of raw pixels')
+    group.addoption('--skip-unchanged', action='store_true',
+                    help='do not rewrite screenshots identical to their baseline')
+
+    group = parser.getgroup('browser')
+    group.addoption('--headless', action='store_true', default=os.environ.get('TEST_HEADLESS') == '1',
+                    help='run Chrome headless (also TEST_HEADLESS=1)')
+    group.addoption('--no-throttling', action='store_true',
+                    help='ignore DEVICE_PROFILES network and CPU throttling')
+
+    group = parser.getgroup('performance')
+    group.addoption('--perf-budgets', default=os.path.join(os.path.dirname(__file__), 'perf_budgets.json'),
+                    help='JSON file of page load budgets (default: perf_budgets.json)')
+    group.addoption('--no-perf-budgets', action='store_true',
+                    help='record page load metrics without failing on budgets')
+
 @pytest.fixture(scope='session')
 def screenshots_dir():
     """Create and return screenshots directory"""
@@ -22,72 +123,253 @@ def screenshots_dir():
     os.makedirs(dir_path, exist_ok=True)
     return dir_path
 
+screenshot_pipeline_key = pytest.StashKey[ScreenshotPipeline]()
+
+@pytest.fixture(scope='session')
+def screenshot_pipeline(request, screenshots_dir):
+    """Background writer that compares screenshots against stored baselines"""
+    config = request.config
+    pipeline = ScreenshotPipeline(
+        output_dir=screenshots_dir,
+        baseline_dir=os.path.join(screenshots_dir, 'baselines'),
+        diff_dir=os.path.join(screenshots_dir, 'diffs'),
+        threshold=config.getoption('--screenshot-threshold'),
+        tolerance=config.getoption('--screenshot-tolerance'),
+        perceptual=config.getoption('--perceptual-diff'),
+        skip_unchanged=config.getoption('--skip-unchanged'),
+        update_baselines=config.getoption('--update-baselines'),
+    )
+    config.stash[screenshot_pipeline_key] = pipeline
+
+    yield pipeline
+
+    pipeline.close()
+
+browser_pool_key = pytest.StashKey[BrowserPool]()
+
+@pytest.fixture(scope='session')
+def browser_pool(request):
+    """Warm Chrome instances reused across tests and screen sizes"""
+    pool = BrowserPool(
+        origins=[BASE_URL, API_URL],
+        init_scripts=[NETWORK_TRACKER_JS, LCP_OBSERVER_JS],
+        headless=request.config.getoption('--headless'),
+    )
+    request.config.stash[browser_pool_key] = pool
+
+    yield pool
+
+    pool.close()
+
+perf_recorder_key = pytest.StashKey[PerfRecorder]()
+
+@pytest.fixture(scope='session')
+def perf_recorder(request):
+    """Page load metrics per screen size, checked against --perf-budgets"""
+    config = request.config
+    budgets = None if config.getoption('--no-perf-budgets') else load_budgets(config.getoption('--perf-budgets'))
+    recorder = PerfRecorder(os.path.join(os.path.dirname(__file__), 'perf_results'), budgets)
+    config.stash[perf_recorder_key] = recorder
+
+    yield recorder
+
+    recorder.save()
+
 @pytest.fixture(params=SCREEN_SIZES.keys())
-def driver(request, screenshots_dir):
-    """Create WebDriver with specified screen size"""
+def driver(request, browser_pool, screenshot_pipeline):
+    """Pooled WebDriver resized and throttled to the specified screen's device"""
     screen_name = request.param
-    width, height = SCREEN_SIZES[screen_name]
-    
-    options = Options()
-    options.add_argument(f'--window-size={width},{height}')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    
-    driver = webdriver.Chrome(options=options)
-    driver.implicitly_wait(3)
-    
-    # Store screen name for test methods
-    driver.screen_name = screen_name
-    driver.screenshots_dir = screenshots_dir
-    
+    profile = {} if request.config.getoption('--no-throttling') else DEVICE_PROFILES[screen_name]
+
+    # Screen name is stored on the driver for test methods
+    driver = browser_pool.acquire(screen_name, SCREEN_SIZES[screen_name], profile)
+    driver.screenshot_pipeline = screenshot_pipeline
+
     yield driver
-    
-    driver.quit()
 
-@pytest.fixture
-def login_admin(driver):
-    """Login as admin user"""
-    driver.get('http://localhost:5173/login')
-    time.sleep(1)
-    
-    username = driver.find_element('id', 'username')
-    password = driver.find_element('id', 'password')
-    
-    username.send_keys('admin')
-    password.send_keys('chiru')
-    
-    submit = driver.find_element('css selector', 'button[type="submit"]')
-    submit.click()
-    
-    # Wait for redirect to dashboard
-    time.sleep(2)
-    assert '/dashboard' in driver.current_url
-    
+    browser_pool.release(driver)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Fail the run when screenshots regressed or pages went over their budgets"""
+    pipeline = session.config.stash.get(screenshot_pipeline_key, None)
+    recorder = session.config.stash.get(perf_recorder_key, None)
+    regressed = pipeline is not None and pipeline.regressions_by_screen()
+    over_budget = recorder is not None and recorder.violations
+    if (regressed or over_budget) and exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report visual regressions, page load metrics, browser pool savings and waits"""
+    pipeline = config.stash.get(screenshot_pipeline_key, None)
+    if pipeline is not None:
+        terminalreporter.write_sep('-', 'screenshots')
+        for line in pipeline.summary_lines():
+            terminalreporter.write_line(line)
+
+    recorder = config.stash.get(perf_recorder_key, None)
+    if recorder is not None:
+        terminalreporter.write_sep('-', 'performance')
+        for line in recorder.summary_lines():
+            terminalreporter.write_line(line)
+
+    pool = config.stash.get(browser_pool_key, None)
+    if pool is not None:
+        terminalreporter.write_sep('-', 'browser pool')
+        terminalreporter.write_line(pool.summary())
+
+    if wait_log:
+        total = sum(elapsed for _, elapsed in wait_log)
+        slowest, slowest_elapsed = max(wait_log, key=lambda entry: entry[1])
+        terminalreporter.write_sep('-', 'waits')
+        terminalreporter.write_line(
+            f"{len(wait_log)} waits, {total:.2f}s total, "
+            f"slowest {slowest_elapsed:.2f}s ({slowest})"
+        )
+
+@pytest.fixture(scope='session')
+def session_cookies():
+    """Backend session cookies per role, logged in once per test session"""
+    return SessionCookieCache(API_URL, CREDENTIALS)
+
+def inject_session(driver, session_id):
+    """Give the browser an existing backend session without loading a page"""
+    driver.execute_cdp_cmd('Network.setCookie', {
+        'name': SESSION_COOKIE,
+        'value': session_id,
+        'url': API_URL,
+        'path': '/',
+        'httpOnly': True,
+    })
+
+def login_via_api(driver, session_cookies, role):
+    inject_session(driver, session_cookies.get(role))
+    load_page(driver, '/dashboard')
+
+    # The navbar shows the user menu once AuthContext has picked up the session
+    wait_for_element(driver, 'xpath', "//button[@aria-label='User menu']")
     return driver
 
 @pytest.fixture
-def login_hacker(driver):
-    """Login as hacker user"""
-    driver.get('http://localhost:5173/login')
-    time.sleep(1)
-    
-    username = driver.find_element('id', 'username')
-    password = driver.find_element('id', 'password')
-    
-    username.send_keys('hacker')
-    password.send_keys('pragmanchiru')
-    
-    submit = driver.find_element('css selector', 'button[type="submit"]')
-    submit.click()
-    
+def login_admin(driver, session_cookies):
+    """Driver on the dashboard with an admin session"""
+    return login_via_api(driver, session_cookies, 'admin')
+
+@pytest.fixture
+def login_hacker(driver, session_cookies):
+    """Driver on the dashboard with a hacker session"""
+    return login_via_api(driver, session_cookies, 'hacker')
+
+def login_via_form(driver, username, password):
+    driver.get(f'{BASE_URL}/login')
+    wait_for_element(driver, 'id', 'username')
+
+    driver.find_element('id', 'username').send_keys(username)
+    driver.find_element('id', 'password').send_keys(password)
+    driver.find_element('css selector', 'button[type="submit"]').click()
+
     # Wait for redirect to dashboard
-    time.sleep(2)
+    wait_for_url(driver, '/dashboard')
+    wait_for_network_idle(driver)
     assert '/dashboard' in driver.current_url
-    
+
     return driver
 
+@pytest.fixture
+def form_login_admin(driver):
+    """Login as admin through the login form
+
+    Only for tests of the form itself; everything else should use the
+    login_admin fast path.
+    """
+    return login_via_form(driver, *CREDENTIALS['admin'])
+
 def take_screenshot(driver, name):
-    """Helper function to take screenshot"""
+    """Capture a screenshot; encoding and baseline diffing happen in the background"""
     screen = driver.screen_name
-    filepath = os.path.join(driver.screenshots_dir, f"{screen}_{name}.png")
-    driver.save_screenshot(filepath)
+    driver.screenshot_pipeline.submit(screen, name, driver.get_screenshot_as_png())
     print(f"  📸 Screenshot: {screen}_{name}.png")
+
+# Wait helpers
+#
+# Each wait polls its condition and returns as soon as it holds, so tests
+# never sleep longer than necessary. The return value is the number of
+# seconds actually waited.
+
+def wait_until(driver, condition, description, timeout=WAIT_TIMEOUT):
+    """Wait for an arbitrary condition(driver) to become truthy"""
+    started = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(
+            condition, message=f"Timed out after {timeout}s waiting for {description}"
+        )
+    finally:
+        elapsed = time.perf_counter() - started
+        wait_log.append((description, elapsed))
+
+    print(f"  ⏱️  {description}: {elapsed:.2f}s")
+    return elapsed
+
+def wait_for_url(driver, fragment, timeout=WAIT_TIMEOUT):
+    """Wait until the current URL contains fragment"""
+    return wait_until(
+        driver, lambda d: fragment in d.current_url, f"URL containing {fragment!r}", timeout
+    )
+
+def wait_for_element(driver, by, value, visible=True, timeout=WAIT_TIMEOUT):
+    """Wait until an element is present (and visible, by default)"""
+    locator = (by, value)
+    condition = EC.visibility_of_element_located(locator) if visible else EC.presence_of_element_located(locator)
+    return wait_until(driver, condition, f"element {value!r}", timeout)
+
+def wait_for_clickable(driver, by, value, timeout=WAIT_TIMEOUT):
+    """Wait until an element is visible and enabled"""
+    return wait_until(
+        driver, EC.element_to_be_clickable((by, value)), f"clickable {value!r}", timeout
+    )
+
+def wait_for_text(driver, *texts, timeout=WAIT_TIMEOUT):
+    """Wait until any of the given texts appears in the page source"""
+    return wait_until(
+        driver,
+        lambda d: any(text in d.page_source for text in texts),
+        f"text {' or '.join(repr(t) for t in texts)}",
+        timeout,
+    )
+
+def wait_for_network_idle(driver, quiet_period=NETWORK_QUIET_PERIOD, timeout=WAIT_TIMEOUT):
+    """Wait until the document has loaded and no fetch/XHR has run for quiet_period"""
+    state = {'idle_since': None}
+
+    def network_idle(d):
+        busy = d.execute_script(
+            "return document.readyState !== 'complete' || (window.__pendingRequests || 0) > 0"
+        )
+        now = time.perf_counter()
+        if busy:
+            state['idle_since'] = None
+            return False
+        if state['idle_since'] is None:
+            state['idle_since'] = now
+        return now - state['idle_since'] >= quiet_period
+
+    return wait_until(driver, network_idle, 'network idle', timeout)
+
+def wait_for_react_render(driver, timeout=WAIT_TIMEOUT):
+    """Wait until React has committed the app and the browser has painted it"""
+    started = time.perf_counter()
+    wait_until(driver, lambda d: d.execute_script(REACT_RENDERED_JS), 'React render', timeout)
+
+    # Two animation frames guarantee the committed tree has been painted
+    driver.execute_async_script(
+        "const done = arguments[arguments.length - 1];"
+        "requestAnimationFrame(() => requestAnimationFrame(() => done()));"
+    )
+    return time.perf_counter() - started
+
+def load_page(driver, path, timeout=WAIT_TIMEOUT):
+    """Navigate to an app path and wait until it has rendered and settled"""
+    started = time.perf_counter()
+    driver.get(f'{BASE_URL}{path}')
+    wait_for_react_render(driver, timeout)
+    wait_for_network_idle(driver, timeout=timeout)
+    return time.perf_counter() - started
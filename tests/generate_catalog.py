@@ -0,0 +1,226 @@
+"""
+Generate a large synthetic catalog of ideas for scale testing
+
+Writes ideas in the same on-disk layout as the file storage engine
+(FileStorage in backend/src/file-storage.ts):
+
+    project_ideas/<id>/metadata.json
+    project_ideas/<id>/pages/<filename>.html
+
+Output is fully determined by --seed, regardless of --workers.
+
+Usage:
+    python3 generate_catalog.py --count 10000
+    python3 generate_catalog.py --count 500 --pages 1-8 --page-size 20000 --approved 0.7
+    python3 generate_catalog.py --count 10000 --output /tmp/ideas --visibility public=6,private=2,users=2
+    python3 generate_catalog.py --clean
+"""
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.environ.get(
+    'PROJECT_IDEAS_DIR', os.path.join(os.path.dirname(TESTS_DIR), 'backend', 'project_ideas')
+)
+
+# Every generated idea id starts with this, so --clean can find them again
+ID_PREFIX = 'synthetic'
+
+IDEA_TYPES = ['Hackathon idea', 'Project idea', 'Resume project idea']
+USERNAMES = ['admin', 'hacker', 'alice', 'bob', 'carol', 'dave', 'erin', 'frank']
+
+ADJECTIVES = [
+    'Smart', 'Collaborative', 'Decentralized', 'Real-time', 'Adaptive', 'Green',
+    'Personal', 'Open', 'Autonomous', 'Secure', 'Social', 'Predictive', 'Accessible',
+]
+SUBJECTS = [
+    'Campus', 'Recipe', 'Fitness', 'Carbon', 'Study', 'Music', 'Travel', 'Finance',
+    'Health', 'Garden', 'Parking', 'Volunteer', 'Language', 'Energy', 'Library',
+]
+PRODUCTS = [
+    'Tracker', 'Assistant', 'Marketplace', 'Planner', 'Dashboard', 'Network',
+    'Generator', 'Companion', 'Platform', 'Navigator', 'Coach', 'Hub',
+]
+PAGE_TITLES = [
+    'Overview', 'Hackathon Pitch', 'Implementation', 'Architecture', 'Features',
+    'Roadmap', 'Business Model', 'Tech Stack', 'User Research', 'Demo Script',
+]
+WORDS = (
+    'users app data model api react node python realtime dashboard machine learning '
+    'recommendation privacy mobile cloud database sensor map schedule community feedback '
+    'analytics notification payment search ranking latency cache stream upload security '
+    'authentication prototype demo judges team weekend scalable open source integration '
+    'workflow automation insight metric goal impact students campus energy carbon health'
+).split()
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def parse_range(value):
+    """Parse 'N' or 'MIN-MAX' into a (min, max) tuple"""
+    low, _, high = value.partition('-')
+    low, high = int(low), int(high or low)
+    if low < 1 or high < low:
+        raise argparse.ArgumentTypeError(f"invalid range {value!r}")
+    return low, high
+
+def parse_weights(value):
+    """Parse 'public=6,private=2,users=2' into a dict of weights"""
+    weights = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('public', 'private', 'users'):
+            raise argparse.ArgumentTypeError(f"unknown visibility {name!r}")
+        weights[name] = float(weight or 1)
+    return weights
+
+def sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 18))]
+    return ' '.join(words).capitalize() + '.'
+
+def page_html(rng, title, target_size):
+    """HTML page of roughly target_size bytes, starting with an <h1> as uploads require"""
+    parts = [f'<h1>{title}</h1>']
+    size = len(parts[0])
+    while size < target_size:
+        roll = rng.random()
+        if roll < 0.15:
+            block = f'<h2>{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}</h2>'
+        elif roll < 0.3:
+            items = ''.join(f'\n  <li>{sentence(rng)}</li>' for _ in range(rng.randint(3, 6)))
+            block = f'<ul>{items}\n</ul>'
+        else:
+            block = '<p>' + ' '.join(sentence(rng) for _ in range(rng.randint(2, 5))) + '</p>'
+        parts.append(block)
+        size += len(block) + 2
+    return '\n\n'.join(parts)
+
+def build_idea(index, args):
+    """Deterministic idea for this index: same seed and index, same idea"""
+    rng = random.Random(f'{args.seed}:{index}')
+
+    name = f'{rng.choice(ADJECTIVES)} {rng.choice(SUBJECTS)} {rng.choice(PRODUCTS)} {index}'
+    author = rng.choice(USERNAMES)
+
+    kinds = list(args.visibility)
+    kind = rng.choices(kinds, [args.visibility[k] for k in kinds])[0]
+    if kind == 'users':
+        visibility = sorted(rng.sample(USERNAMES, rng.randint(1, 3)))
+    else:
+        visibility = kind
+
+    page_count = rng.randint(*args.pages)
+    titles = rng.sample(PAGE_TITLES, min(page_count, len(PAGE_TITLES)))
+    while len(titles) < page_count:
+        titles.append(f'{rng.choice(PAGE_TITLES)} {len(titles) + 1}')
+
+    pages = []
+    for title in titles:
+        size = max(200, int(rng.gauss(args.page_size, args.page_size * 0.25)))
+        pages.append({
+            'title': title,
+            'filename': f'{slugify(title)}.html',
+            'content': page_html(rng, title, size),
+        })
+
+    created = time.gmtime(args.start_time - index * 3600)
+    return {
+        'id': f'{ID_PREFIX}-{index:06d}-{slugify(name)}',
+        'name': name,
+        'author': author,
+        'description': sentence(rng),
+        'visibility': visibility,
+        'ideaType': rng.choice(IDEA_TYPES),
+        'approved': rng.random() < args.approved,
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', created),
+        'pages': pages,
+    }
+
+def write_idea(output_dir, idea):
+    """Write one idea exactly the way saveIdea does; returns bytes written"""
+    idea_dir = os.path.join(output_dir, idea['id'])
+    pages_dir = os.path.join(idea_dir, 'pages')
+    os.makedirs(pages_dir, exist_ok=True)
+
+    metadata = {
+        'name': idea['name'],
+        'author': idea['author'],
+        'description': idea['description'],
+        'visibility': idea['visibility'],
+        'ideaType': idea['ideaType'],
+        'approved': idea['approved'],
+        'createdAt': idea['createdAt'],
+        'pages': [{'title': p['title'], 'filename': p['filename']} for p in idea['pages']],
+    }
+    metadata_json = json.dumps(metadata, indent=2, ensure_ascii=False)
+    with open(os.path.join(idea_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+        f.write(metadata_json)
+
+    written = len(metadata_json)
+    for page in idea['pages']:
+        with open(os.path.join(pages_dir, page['filename']), 'w', encoding='utf-8') as f:
+            f.write(page['content'])
+        written += len(page['content'])
+    return written
+
+def generate(args):
+    os.makedirs(args.output, exist_ok=True)
+
+    def task(index):
+        return write_idea(args.output, build_idea(index, args))
+
+    started = time.perf_counter()
+    written = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for done, size in enumerate(executor.map(task, range(args.count)), start=1):
+            written += size
+            if done % 1000 == 0 or done == args.count:
+                print(f"  {done}/{args.count} ideas", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Wrote {args.count} ideas ({written / 1e6:.1f} MB) to {args.output} in {elapsed:.1f}s")
+
+def clean(output_dir):
+    removed = 0
+    if os.path.isdir(output_dir):
+        for entry in os.listdir(output_dir):
+            if entry.startswith(f'{ID_PREFIX}-'):
+                shutil.rmtree(os.path.join(output_dir, entry))
+                removed += 1
+    print(f"🧹 Removed {removed} synthetic ideas from {output_dir}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--count', type=int, default=1000, help='ideas to generate (default: 1000)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help='project_ideas directory (default: PROJECT_IDEAS_DIR or backend/project_ideas)')
+    parser.add_argument('--pages', type=parse_range, default=(2, 4),
+                        help='pages per idea, N or MIN-MAX (default: 2-4)')
+    parser.add_argument('--page-size', type=int, default=4000,
+                        help='average page HTML size in bytes (default: 4000)')
+    parser.add_argument('--visibility', type=parse_weights, default={'public': 8, 'private': 1, 'users': 1},
+                        help='visibility mix as kind=weight (default: public=8,private=1,users=1)')
+    parser.add_argument('--approved', type=float, default=0.9,
+                        help='fraction of ideas that are approved (default: 0.9)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--workers', type=int, default=16, help='parallel writer threads (default: 16)')
+    parser.add_argument('--clean', action='store_true', help='remove previously generated ideas and exit')
+    args = parser.parse_args()
+
+    if args.clean:
+        clean(args.output)
+        return
+
+    # Fixed reference time keeps createdAt deterministic for a given seed
+    args.start_time = 1735689600  # 2025-01-01T00:00:00Z
+    generate(args)
+
+if __name__ == '__main__':
+    main()
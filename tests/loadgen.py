@@ -0,0 +1,262 @@
+"""
+Load generator for the ideas API
+
+Simulates concurrent virtual users hitting GET /api/ideas, GET /api/ideas/:id
+and POST /api/auth/login over a shared, pooled set of connections, then
+reports throughput and latency percentiles as JSON so runs can be compared
+before and after backend changes.
+
+Usage:
+    python3 loadgen.py --concurrency 50 --duration 30
+    python3 loadgen.py --mix list=60,detail=35,login=5 --roles anonymous=2,hacker=1,admin=1
+    python3 loadgen.py --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import aiohttp
+
+API_URL = os.environ.get('TEST_API_URL', 'http://localhost:3001')
+
+# Test accounts, matching the hardcoded users in backend/src/routes/auth.ts
+CREDENTIALS = {
+    'admin': ('admin', 'chiru'),
+    'hacker': ('hacker', 'pragmanchiru'),
+}
+
+OPERATIONS = ('list', 'detail', 'login')
+ROLES = ('anonymous', 'hacker', 'admin')
+
+def parse_weights(value, allowed):
+    """Parse 'a=3,b=1' into {'a': 3.0, 'b': 1.0}"""
+    weights = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in allowed:
+            raise argparse.ArgumentTypeError(f"unknown name {name!r} (expected one of {', '.join(allowed)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Stats:
+    """Latency samples and status counts for one operation"""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.bytes = 0
+
+    def record(self, latency_ms, status=None, size=0):
+        self.latencies.append(latency_ms)
+        self.bytes += size
+        if status is None or status >= 400:
+            self.errors += 1
+        key = str(status) if status is not None else 'error'
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.bytes += other.bytes
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+
+    def report(self, elapsed):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'count': count,
+            'errors': self.errors,
+            'throughput_rps': round(count / elapsed, 2) if elapsed else 0,
+            'bytes': self.bytes,
+            'status': self.statuses,
+            'latency_ms': {
+                'mean': round(sum(latencies) / count, 2) if count else None,
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1] if count else None,
+            },
+        }
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stats = {op: Stats() for op in OPERATIONS}
+        self.idea_ids = {}
+
+    async def login(self, session, role):
+        username, password = CREDENTIALS[role]
+        async with session.post(f'{self.args.base_url}/api/auth/login',
+                                json={'username': username, 'password': password}) as response:
+            await response.read()
+            return response.status
+
+    async def new_user_session(self, connector, role):
+        """Client session with its own cookie jar, sharing the pooled connector"""
+        session = aiohttp.ClientSession(
+            connector=connector, connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+        )
+        if role != 'anonymous':
+            status = await self.login(session, role)
+            if status != 200:
+                await session.close()
+                raise RuntimeError(f"Login as {role} failed with HTTP {status}")
+        return session
+
+    async def discover_ideas(self, connector):
+        """Ideas visible to each role, so detail requests hit real ids"""
+        for role in self.args.roles:
+            session = await self.new_user_session(connector, role)
+            try:
+                async with session.get(f'{self.args.base_url}/api/ideas') as response:
+                    ideas = await response.json()
+                self.idea_ids[role] = [idea['id'] for idea in ideas]
+            finally:
+                await session.close()
+
+    async def timed(self, op, request):
+        started = time.perf_counter()
+        status, size = None, 0
+        try:
+            async with request as response:
+                size = len(await response.read())
+                status = response.status
+        except aiohttp.ClientError:
+            pass
+        self.stats[op].record(round((time.perf_counter() - started) * 1000, 3), status, size)
+
+    async def virtual_user(self, connector, role, deadline):
+        session = await self.new_user_session(connector, role)
+        # Logins get a cookie-less session so they don't replace this user's session
+        login_session = aiohttp.ClientSession(
+            connector=connector, connector_owner=False, cookie_jar=aiohttp.DummyCookieJar(),
+        )
+        operations = list(self.args.mix)
+        weights = [self.args.mix[op] for op in operations]
+        base = self.args.base_url
+
+        try:
+            while time.perf_counter() < deadline:
+                op = self.rng.choices(operations, weights)[0]
+                if op == 'detail' and not self.idea_ids.get(role):
+                    # Nothing visible to this role, so there is no id to fetch
+                    op = 'list'
+
+                if op == 'list':
+                    await self.timed(op, session.get(f'{base}/api/ideas'))
+                elif op == 'detail':
+                    idea_id = self.rng.choice(self.idea_ids[role])
+                    await self.timed(op, session.get(f'{base}/api/ideas/{idea_id}'))
+                else:
+                    username, password = CREDENTIALS['hacker' if role == 'anonymous' else role]
+                    await self.timed(op, login_session.post(
+                        f'{base}/api/auth/login', json={'username': username, 'password': password},
+                    ))
+        finally:
+            await session.close()
+            await login_session.close()
+
+    async def run(self):
+        connector = aiohttp.TCPConnector(limit=self.args.concurrency)
+        try:
+            await self.discover_ideas(connector)
+
+            roles = list(self.args.roles)
+            role_weights = [self.args.roles[role] for role in roles]
+            user_roles = self.rng.choices(roles, role_weights, k=self.args.concurrency)
+
+            started = time.perf_counter()
+            deadline = started + self.args.duration
+            await asyncio.gather(*(
+                self.virtual_user(connector, role, deadline) for role in user_roles
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            await connector.close()
+
+        overall = Stats()
+        for stats in self.stats.values():
+            overall.merge(stats)
+
+        return {
+            'config': {
+                'base_url': self.args.base_url,
+                'concurrency': self.args.concurrency,
+                'duration_s': self.args.duration,
+                'mix': self.args.mix,
+                'roles': self.args.roles,
+                'users_by_role': {role: user_roles.count(role) for role in roles},
+                'seed': self.args.seed,
+            },
+            'elapsed_s': round(elapsed, 3),
+            'overall': overall.report(elapsed),
+            'operations': {
+                op: stats.report(elapsed) for op, stats in self.stats.items() if stats.latencies
+            },
+        }
+
+def compare(before, after):
+    """Print throughput and latency changes between two reports"""
+    def change(old, new):
+        if not old or new is None:
+            return 'n/a'
+        return f"{(new - old) / old:+.1%}"
+
+    sections = [('overall', before['overall'], after['overall'])]
+    for op, report in after['operations'].items():
+        if op in before['operations']:
+            sections.append((op, before['operations'][op], report))
+
+    for name, old, new in sections:
+        print(f"{name}:", file=sys.stderr)
+        print(f"  throughput {old['throughput_rps']} -> {new['throughput_rps']} rps "
+              f"({change(old['throughput_rps'], new['throughput_rps'])})", file=sys.stderr)
+        for key in ('p50', 'p95', 'p99'):
+            old_value, new_value = old['latency_ms'][key], new['latency_ms'][key]
+            print(f"  {key} {old_value} -> {new_value} ms ({change(old_value, new_value)})", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=API_URL, help=f'backend URL (default: {API_URL})')
+    parser.add_argument('-c', '--concurrency', type=int, default=20, help='virtual users (default: 20)')
+    parser.add_argument('-d', '--duration', type=float, default=30, help='seconds to run (default: 30)')
+    parser.add_argument('--mix', type=lambda v: parse_weights(v, OPERATIONS),
+                        default={'list': 70, 'detail': 25, 'login': 5},
+                        help='request mix as op=weight (default: list=70,detail=25,login=5)')
+    parser.add_argument('--roles', type=lambda v: parse_weights(v, ROLES),
+                        default={'anonymous': 1, 'hacker': 1, 'admin': 1},
+                        help='virtual user roles as role=weight (default: anonymous=1,hacker=1,admin=1)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for request selection')
+    parser.add_argument('-o', '--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='print changes relative to a previous report')
+    args = parser.parse_args()
+
+    report = asyncio.run(LoadTest(args).run())
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Local stand-in for the OpenAI chat completions API
+
+Point the backend at it with OPENAI_BASE_URL=http://localhost:8010/v1 to
+exercise and benchmark POST /api/ideas/generate and POST /api/ideas/:id/pages
+without network access or API costs.
+
+Usage:
+    python3 mock_openai.py
+    python3 mock_openai.py --latency lognormal:7.5:0.4 --token-delay 15
+    python3 mock_openai.py --error-rate 0.05 --malformed-rate 0.05 --max-concurrency 4 --reject-over-limit
+
+Latency distributions (milliseconds):
+    fixed:MS  uniform:MIN:MAX  normal:MEAN:STDDEV  lognormal:MU:SIGMA
+
+GET /stats returns request counts, injected failures and peak concurrency.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from aiohttp import web
+
+IDEA_WORDS = ['Smart', 'Open', 'Campus', 'Pulse', 'Nimbus', 'Forge', 'Beacon', 'Atlas', 'Orbit', 'Relay']
+
+def parse_latency(value):
+    """Turn 'kind:a:b' into a function returning a latency sample in seconds"""
+    kind, *params = value.split(':')
+    params = [float(p) for p in params]
+    samplers = {
+        'fixed': lambda rng: params[0],
+        'uniform': lambda rng: rng.uniform(params[0], params[1]),
+        'normal': lambda rng: rng.gauss(params[0], params[1]),
+        'lognormal': lambda rng: rng.lognormvariate(params[0], params[1]),
+    }
+    expected = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2}
+    if kind not in samplers or len(params) != expected[kind]:
+        raise argparse.ArgumentTypeError(f"invalid latency distribution {value!r}")
+    return lambda rng: max(0.0, samplers[kind](rng)) / 1000
+
+def openai_error(status, message, error_type, code=None):
+    return web.json_response(
+        {'error': {'message': message, 'type': error_type, 'param': None, 'code': code}},
+        status=status,
+    )
+
+def generated_idea(description, serial):
+    """JSON body in the shape /generate's prompt asks for"""
+    digest = hashlib.sha1(description.encode()).digest()
+    name = f"{IDEA_WORDS[digest[0] % len(IDEA_WORDS)]} {IDEA_WORDS[digest[1] % len(IDEA_WORDS)]} {serial}"
+    summary = ' '.join(description.split()[:20])
+    return json.dumps({
+        'name': name,
+        'description': f"A mock-generated project based on: {summary}",
+        'pages': [
+            {
+                'title': 'Overview',
+                'filename': 'overview.html',
+                'content': f"<h1>Overview</h1>\n<p>{summary}</p>\n<h2>Goals</h2>\n<ul>\n<li>Ship a demo</li>\n<li>Delight judges</li>\n</ul>",
+            },
+            {
+                'title': 'Implementation',
+                'filename': 'implementation.html',
+                'content': "<h1>Implementation</h1>\n<h2>Technical Stack</h2>\n<p>React, Node.js and a mock model.</p>",
+            },
+        ],
+    })
+
+def generated_page(prompt):
+    """HTML body in the shape /:id/pages asks for"""
+    title = 'Generated Page'
+    for line in prompt.splitlines():
+        if line.startswith('The page title should be:'):
+            title = line.split(':', 1)[1].strip().strip('"')
+    return f"<h1>{title}</h1>\n<p>Mock content for this page.</p>\n<h2>Details</h2>\n<ul>\n<li>First point</li>\n<li>Second point</li>\n</ul>"
+
+class MockOpenAI:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.semaphore = asyncio.Semaphore(args.max_concurrency) if args.max_concurrency else None
+        self.serial = 0
+        self.in_flight = 0
+        self.stats = {
+            'requests': 0,
+            'completed': 0,
+            'streamed': 0,
+            'errors_injected': 0,
+            'malformed_injected': 0,
+            'rejected_over_limit': 0,
+            'disconnected': 0,
+            'peak_concurrency': 0,
+        }
+
+    def completion_text(self, body):
+        messages = body.get('messages', [])
+        system = next((m['content'] for m in messages if m.get('role') == 'system'), '')
+        user = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), '')
+
+        self.serial += 1
+        if 'idea generator' in system:
+            description = user.split('USER IDEA DESCRIPTION:', 1)[-1].split('RESPOND WITH', 1)[0].strip()
+            text = generated_idea(description, self.serial)
+        else:
+            text = generated_page(user)
+
+        if self.rng.random() < self.args.malformed_rate:
+            # Cut the response off mid-way, like a model hitting max_tokens
+            self.stats['malformed_injected'] += 1
+            text = text[:len(text) // 2]
+        return text
+
+    async def chat_completions(self, request):
+        self.stats['requests'] += 1
+        body = await request.json()
+
+        if self.semaphore and self.semaphore.locked() and self.args.reject_over_limit:
+            self.stats['rejected_over_limit'] += 1
+            return openai_error(429, 'Rate limit reached for requests', 'requests', 'rate_limit_exceeded')
+
+        if self.semaphore:
+            await self.semaphore.acquire()
+        self.in_flight += 1
+        self.stats['peak_concurrency'] = max(self.stats['peak_concurrency'], self.in_flight)
+        try:
+            await asyncio.sleep(self.args.latency(self.rng))
+
+            if self.rng.random() < self.args.error_rate:
+                self.stats['errors_injected'] += 1
+                status = self.rng.choice(self.args.error_status)
+                return openai_error(status, f'Injected error ({status})', 'server_error')
+
+            text = self.completion_text(body)
+            model = body.get('model', 'gpt-4')
+            completion_id = f'chatcmpl-mock-{self.serial}'
+
+            if body.get('stream'):
+                self.stats['streamed'] += 1
+                return await self.stream(request, completion_id, model, text)
+
+            self.stats['completed'] += 1
+            return web.json_response({
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': text},
+                    'finish_reason': 'stop',
+                }],
+                'usage': {
+                    'prompt_tokens': sum(len(m.get('content', '')) for m in body.get('messages', [])) // 4,
+                    'completion_tokens': len(text) // 4,
+                    'total_tokens': 0,
+                },
+            })
+        finally:
+            self.in_flight -= 1
+            if self.semaphore:
+                self.semaphore.release()
+
+    async def stream(self, request, completion_id, model, text):
+        """Server-sent events in the chat.completion.chunk format"""
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        def chunk(delta, finish_reason=None):
+            payload = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            return f"data: {json.dumps(payload)}\n\n".encode()
+
+        try:
+            await response.write(chunk({'role': 'assistant', 'content': ''}))
+            size = self.args.chunk_size
+            for start in range(0, len(text), size):
+                await response.write(chunk({'content': text[start:start + size]}))
+                if self.args.token_delay:
+                    await asyncio.sleep(self.args.token_delay / 1000)
+            await response.write(chunk({}, 'stop'))
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        except ConnectionResetError:
+            # Client gave up mid-stream (e.g. a cancelled generation)
+            self.stats['disconnected'] += 1
+            return response
+
+        self.stats['completed'] += 1
+        return response
+
+    async def models(self, request):
+        return web.json_response({'object': 'list', 'data': [{'id': 'gpt-4', 'object': 'model', 'owned_by': 'mock'}]})
+
+    async def get_stats(self, request):
+        return web.json_response(dict(self.stats, in_flight=self.in_flight))
+
+def create_app(args):
+    mock = MockOpenAI(args)
+    app = web.Application()
+    app.add_routes([
+        web.post('/v1/chat/completions', mock.chat_completions),
+        web.get('/v1/models', mock.models),
+        web.get('/stats', mock.get_stats),
+    ])
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8010, help='port to listen on (default: 8010)')
+    parser.add_argument('--latency', type=parse_latency, default=parse_latency('uniform:200:800'),
+                        help='time before the first byte (default: uniform:200:800)')
+    parser.add_argument('--token-delay', type=float, default=5,
+                        help='milliseconds between streamed chunks (default: 5)')
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help='characters per streamed chunk (default: 16)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of requests answered with an error (default: 0)')
+    parser.add_argument('--error-status', type=lambda v: [int(s) for s in v.split(',')], default=[500, 503],
+                        help='statuses used for injected errors (default: 500,503)')
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='fraction of completions truncated into invalid JSON/HTML (default: 0)')
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help='requests processed at once, 0 for unlimited (default: 0)')
+    parser.add_argument('--reject-over-limit', action='store_true',
+                        help='answer 429 instead of queueing when at --max-concurrency')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    print(f"🤖 Mock OpenAI on http://localhost:{args.port}/v1")
+    web.run_app(create_app(args), port=args.port, print=None)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Page load metrics from window.performance, checked against budgets
+"""
+import json
+import os
+import threading
+
+# Installed on every new document so LCP candidates are captured as they happen
+LCP_OBSERVER_JS = """
+(() => {
+  window.__largestContentfulPaint = null;
+  try {
+    new PerformanceObserver(list => {
+      const entries = list.getEntries();
+      window.__largestContentfulPaint = entries[entries.length - 1].startTime;
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+  } catch (e) {}
+})();
+"""
+
+COLLECT_METRICS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const paints = Object.fromEntries(performance.getEntriesByType('paint').map(e => [e.name, e.startTime]));
+const resources = performance.getEntriesByType('resource');
+const sum = (entries, key) => entries.reduce((total, e) => total + (e[key] || 0), 0);
+const api = resources.filter(e => e.initiatorType === 'fetch' || e.initiatorType === 'xmlhttprequest');
+return {
+  ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+  dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+  load_ms: nav ? nav.loadEventEnd - nav.startTime : null,
+  first_paint_ms: paints['first-paint'] ?? null,
+  first_contentful_paint_ms: paints['first-contentful-paint'] ?? null,
+  largest_contentful_paint_ms: window.__largestContentfulPaint,
+  js_heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null,
+  resource_count: resources.length,
+  api_request_count: api.length,
+  transfer_kb: (sum(resources, 'transferSize') + (nav ? nav.transferSize : 0)) / 1024,
+  api_transfer_kb: sum(api, 'transferSize') / 1024,
+};
+"""
+
+def load_budgets(path):
+    """Budgets file: 'default' limits, overridden per screen, then per page"""
+    with open(path) as f:
+        return json.load(f)
+
+def budgets_for(budgets, screen, page):
+    limits = dict(budgets.get('default', {}))
+    limits.update(budgets.get('screens', {}).get(screen, {}))
+    limits.update(budgets.get('pages', {}).get(page, {}))
+    return limits
+
+class PerfRecorder:
+    """Collects metrics per screen and page and checks them against budgets"""
+
+    def __init__(self, output_dir, budgets=None):
+        self.output_dir = output_dir
+        self.budgets = budgets
+        self.metrics = {}           # screen -> page -> metrics
+        self.violations = []        # (screen, page, metric, value, limit)
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def measure(self, driver, page, **extra):
+        """Record metrics for the page the driver just loaded; returns its violations"""
+        metrics = dict(driver.execute_script(COLLECT_METRICS_JS), **extra)
+        metrics = {key: round(value, 2) if value is not None else None for key, value in metrics.items()}
+        return self.record(driver.screen_name, page, metrics)
+
+    def record(self, screen, page, metrics):
+        violations = []
+        if self.budgets is not None:
+            for metric, limit in budgets_for(self.budgets, screen, page).items():
+                value = metrics.get(metric)
+                if value is not None and value > limit:
+                    violations.append((screen, page, metric, value, limit))
+
+        with self._lock:
+            self.metrics.setdefault(screen, {})[page] = metrics
+            self.violations.extend(violations)
+        return violations
+
+    def save(self):
+        """Write one JSON file per screen so parallel shards don't collide"""
+        for screen, pages in self.metrics.items():
+            with open(os.path.join(self.output_dir, f'{screen}.json'), 'w') as f:
+                json.dump(pages, f, indent=2, sort_keys=True)
+
+    def summary_lines(self):
+        lines = []
+        for screen, pages in sorted(self.metrics.items()):
+            for page, metrics in sorted(pages.items()):
+                parts = [
+                    f"FCP {metrics['first_contentful_paint_ms']} ms",
+                    f"LCP {metrics['largest_contentful_paint_ms']} ms",
+                    f"load {metrics['load_ms']} ms",
+                    f"heap {metrics['js_heap_mb']} MB",
+                    f"{metrics['resource_count']} resources",
+                ]
+                if 'first_idea_card_ms' in metrics:
+                    parts.insert(0, f"first card {metrics['first_idea_card_ms']} ms")
+                lines.append(f"{screen:8} {page:12} " + ', '.join(parts))
+        for screen, page, metric, value, limit in self.violations:
+            lines.append(f"❌ {screen} {page}: {metric} {value} over budget {limit}")
+        return lines or ['no pages measured']
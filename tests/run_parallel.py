@@ -0,0 +1,244 @@
+"""
+Run the integration suite in parallel shards, each worker against its own servers
+
+Tests are sharded by (test file, screen size). Every worker gets its own
+backend on its own PORT with a freshly seeded copy of project_ideas and
+settings.json, plus its own `vite preview` of a shared frontend build, so
+tests that create or delete ideas can't interfere with each other.
+Backends talk to a shared mock_openai.py unless --real-openai is given.
+
+Usage:
+    python3 run_parallel.py                  # one worker per core
+    python3 run_parallel.py -n 4 -- -x       # 4 workers, extra pytest args after --
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+BACKEND_DIR = os.path.join(ROOT_DIR, 'backend')
+FRONTEND_DIR = os.path.join(ROOT_DIR, 'frontend')
+
+# Keep in sync with conftest.SCREEN_SIZES (not imported to avoid pulling in selenium here)
+SCREEN_NAMES = ['desktop', 'laptop', 'tablet', 'mobile']
+
+# Workers use BACKEND_BASE_PORT + n and PREVIEW_BASE_PORT + n
+BACKEND_BASE_PORT = 4100
+PREVIEW_BASE_PORT = 4500
+MOCK_OPENAI_PORT = 4900
+
+SERVER_START_TIMEOUT = 60
+
+print_lock = threading.Lock()
+
+def log(message):
+    with print_lock:
+        print(message, flush=True)
+
+def wait_for_http(url, timeout=SERVER_START_TIMEOUT):
+    """Poll url until it answers, raising if it never does"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def build_frontend():
+    """Build the frontend once, with API calls going through the preview proxy"""
+    log("🎨 Building frontend...")
+    env = dict(os.environ, VITE_API_URL='/api')
+    subprocess.run(['npm', 'run', 'build'], cwd=FRONTEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+class WorkerEnvironment:
+    """A private backend + frontend preview for one worker"""
+
+    def __init__(self, index, catalog_size=0, openai_url=None):
+        self.index = index
+        self.catalog_size = catalog_size
+        self.openai_url = openai_url
+        self.backend_port = BACKEND_BASE_PORT + index
+        self.preview_port = PREVIEW_BASE_PORT + index
+        self.base_url = f'http://localhost:{self.preview_port}'
+        self.api_url = f'http://localhost:{self.backend_port}'
+        self.data_dir = tempfile.mkdtemp(prefix=f'ideas-worker-{index}-')
+        self.ideas_dir = os.path.join(self.data_dir, 'project_ideas')
+        self.settings_file = os.path.join(self.data_dir, 'settings.json')
+        self.log_file = open(os.path.join(self.data_dir, 'servers.log'), 'w')
+        self.processes = []
+
+    def _spawn(self, command, cwd, env):
+        process = subprocess.Popen(
+            command, cwd=cwd, env=dict(os.environ, **env),
+            stdout=self.log_file, stderr=subprocess.STDOUT,
+        )
+        self.processes.append(process)
+        return process
+
+    def start(self):
+        backend_env = {
+            'PORT': str(self.backend_port),
+            'PROJECT_IDEAS_DIR': self.ideas_dir,
+            'SETTINGS_FILE': self.settings_file,
+            'GENERATION_CACHE_FILE': os.path.join(self.data_dir, 'generation-cache.json'),
+            'SESSIONS_DIR': os.path.join(self.data_dir, 'sessions'),
+            'CORS_ORIGIN': self.base_url,
+        }
+        if self.openai_url:
+            backend_env.update(OPENAI_BASE_URL=self.openai_url, OPENAI_API_KEY='mock')
+
+        # Seed this worker's catalog and settings
+        subprocess.run(['npx', 'tsx', 'src/init-ideas.ts'], cwd=BACKEND_DIR,
+                       env=dict(os.environ, **backend_env), check=True,
+                       stdout=self.log_file, stderr=subprocess.STDOUT)
+        with open(self.settings_file, 'w') as f:
+            json.dump({'requireAdminApproval': False}, f, indent=2)
+        if self.catalog_size:
+            subprocess.run([sys.executable, 'generate_catalog.py', '--count', str(self.catalog_size),
+                            '--output', self.ideas_dir], cwd=TESTS_DIR, check=True,
+                           stdout=self.log_file, stderr=subprocess.STDOUT)
+
+        self._spawn(['npx', 'tsx', 'src/server.ts'], BACKEND_DIR, backend_env)
+        self._spawn(
+            ['npx', 'vite', 'preview', '--port', str(self.preview_port), '--strictPort'],
+            FRONTEND_DIR, {'BACKEND_URL': self.api_url},
+        )
+
+        wait_for_http(f'{self.api_url}/api/health')
+        wait_for_http(self.base_url)
+        log(f"  ✓ Worker {self.index}: backend :{self.backend_port}, frontend :{self.preview_port}")
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.log_file.close()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def run_shard(self, test_file, screen, pytest_args):
+        env = dict(
+            os.environ,
+            TEST_BASE_URL=self.base_url,
+            TEST_API_URL=self.api_url,
+            TEST_SCREENS=screen,
+            TEST_OPENAI_MOCK='1' if self.openai_url else '',
+        )
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-m', 'pytest', test_file, '-q', '-p', 'no:cacheprovider', *pytest_args],
+            cwd=TESTS_DIR, env=env, capture_output=True, text=True,
+        )
+        return result, time.perf_counter() - started
+
+def start_mock_openai():
+    """One mock OpenAI server shared by every worker's backend"""
+    process = subprocess.Popen(
+        [sys.executable, 'mock_openai.py', '--port', str(MOCK_OPENAI_PORT)],
+        cwd=TESTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+    )
+    wait_for_http(f'http://localhost:{MOCK_OPENAI_PORT}/stats')
+    return process
+
+def run_worker(index, shards, pytest_args, results, catalog_size, openai_url):
+    worker = WorkerEnvironment(index, catalog_size, openai_url)
+    try:
+        try:
+            worker.start()
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+            # Leave this worker's shards in the queue for the others
+            log(f"  ❌ Worker {index} failed to start: {e}")
+            return
+
+        while True:
+            try:
+                test_file, screen = shards.get_nowait()
+            except queue.Empty:
+                return
+
+            result, elapsed = worker.run_shard(test_file, screen, pytest_args)
+            status = '✅' if result.returncode == 0 else '❌'
+            log(f"  {status} [{index}] {test_file} [{screen}] in {elapsed:.1f}s")
+            if result.returncode != 0:
+                log(result.stdout[-4000:])
+            results.append((test_file, screen, result.returncode, elapsed))
+    finally:
+        worker.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of parallel workers (default: CPU count)')
+    parser.add_argument('--skip-build', action='store_true',
+                        help='reuse the existing frontend/dist build')
+    parser.add_argument('--catalog-size', type=int, default=0,
+                        help='add this many synthetic ideas to each worker (see generate_catalog.py)')
+    parser.add_argument('--real-openai', action='store_true',
+                        help='let backends call the real OpenAI API instead of mock_openai.py')
+    parser.add_argument('pytest_args', nargs='*', help='extra arguments passed to each pytest run')
+    args = parser.parse_args()
+
+    test_files = sorted(os.path.basename(p) for p in glob.glob(os.path.join(TESTS_DIR, 'test_*.py')))
+    shards = queue.Queue()
+    for test_file in test_files:
+        for screen in SCREEN_NAMES:
+            shards.put((test_file, screen))
+
+    workers = max(1, min(args.workers, shards.qsize()))
+
+    if not args.skip_build:
+        build_frontend()
+
+    mock_openai = None
+    openai_url = None
+    if not args.real_openai:
+        mock_openai = start_mock_openai()
+        openai_url = f'http://localhost:{MOCK_OPENAI_PORT}/v1'
+
+    log(f"🚀 Running {shards.qsize()} shards on {workers} workers")
+    started = time.perf_counter()
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_worker, i, shards, args.pytest_args, results, args.catalog_size, openai_url)
+                for i in range(workers)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        if mock_openai:
+            mock_openai.terminate()
+            mock_openai.wait()
+    wall_time = time.perf_counter() - started
+
+    failed = [r for r in results if r[2] != 0]
+    serial_time = sum(r[3] for r in results)
+    log("")
+    log(f"{len(results) - len(failed)}/{len(results)} shards passed")
+    log(f"Wall time {wall_time:.1f}s vs {serial_time:.1f}s of shard time "
+        f"({serial_time / wall_time if wall_time else 0:.1f}x)")
+    for test_file, screen, _, _ in failed:
+        log(f"  ❌ {test_file} [{screen}]")
+
+    return 1 if failed or len(results) < len(test_files) * len(SCREEN_NAMES) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
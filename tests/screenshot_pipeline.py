@@ -0,0 +1,148 @@
+"""
+Background screenshot writer with baseline comparison for visual regressions
+"""
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from PIL import Image, ImageChops
+
+# Perceptual mode compares images shrunk by this factor, which smooths over
+# anti-aliasing and sub-pixel font rendering noise
+PERCEPTUAL_SCALE = 4
+
+@dataclass
+class ScreenshotResult:
+    screen: str
+    name: str
+    status: str             # 'new', 'match', 'unchanged', 'regression' or 'baseline-updated'
+    diff_ratio: float = None
+
+def diff_ratio(baseline, current, tolerance, perceptual=False):
+    """Fraction of pixels whose difference exceeds tolerance (0-255)"""
+    if baseline.size != current.size:
+        return 1.0
+
+    if perceptual:
+        size = (max(1, current.width // PERCEPTUAL_SCALE), max(1, current.height // PERCEPTUAL_SCALE))
+        baseline = baseline.convert('L').resize(size, Image.BOX)
+        current = current.convert('L').resize(size, Image.BOX)
+
+    difference = ImageChops.difference(baseline, current).convert('L')
+    histogram = difference.histogram()
+    changed = sum(histogram[tolerance + 1:])
+    return changed / (difference.width * difference.height)
+
+def highlight_differences(baseline, current, tolerance):
+    """Dimmed copy of current with changed pixels painted red"""
+    mask = ImageChops.difference(baseline, current).convert('L').point(
+        lambda value: 255 if value > tolerance else 0
+    )
+    dimmed = Image.blend(current, Image.new('RGB', current.size, 'white'), 0.6)
+    return Image.composite(Image.new('RGB', current.size, 'red'), dimmed, mask)
+
+class ScreenshotPipeline:
+    """Encodes, compresses and compares screenshots off the test thread.
+
+    Tests only pay for grabbing the PNG bytes from the browser; decoding,
+    diffing against the baseline and re-encoding happen on a small pool of
+    background threads.
+    """
+
+    def __init__(self, output_dir, baseline_dir, diff_dir, threshold=0.001, tolerance=16,
+                 perceptual=False, skip_unchanged=False, update_baselines=False, workers=2):
+        self.output_dir = output_dir
+        self.baseline_dir = baseline_dir
+        self.diff_dir = diff_dir
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.perceptual = perceptual
+        self.skip_unchanged = skip_unchanged
+        self.update_baselines = update_baselines
+
+        for directory in (output_dir, baseline_dir, diff_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshots')
+        self._futures = []
+        self._lock = threading.Lock()
+        self.results = []
+        self.errors = []
+
+    def submit(self, screen, name, png):
+        """Queue raw PNG bytes from the browser for processing"""
+        future = self._executor.submit(self._process, screen, name, png)
+        self._futures.append(future)
+        return future
+
+    def _process(self, screen, name, png):
+        filename = f"{screen}_{name}.png"
+        baseline_path = os.path.join(self.baseline_dir, filename)
+
+        try:
+            current = Image.open(io.BytesIO(png)).convert('RGB')
+
+            if self.update_baselines:
+                current.save(baseline_path, optimize=True)
+                result = ScreenshotResult(screen, name, 'baseline-updated')
+            elif not os.path.exists(baseline_path):
+                result = ScreenshotResult(screen, name, 'new')
+            else:
+                with Image.open(baseline_path) as stored:
+                    baseline = stored.convert('RGB')
+                ratio = diff_ratio(baseline, current, self.tolerance, self.perceptual)
+
+                if ratio == 0 and self.skip_unchanged:
+                    # Identical to the baseline, so skip the expensive re-encode
+                    result = ScreenshotResult(screen, name, 'unchanged', ratio)
+                elif ratio > self.threshold:
+                    result = ScreenshotResult(screen, name, 'regression', ratio)
+                    if baseline.size == current.size:
+                        highlight_differences(baseline, current, self.tolerance).save(
+                            os.path.join(self.diff_dir, filename), optimize=True
+                        )
+                else:
+                    result = ScreenshotResult(screen, name, 'match', ratio)
+
+            if result.status != 'unchanged':
+                current.save(os.path.join(self.output_dir, filename), optimize=True)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"{filename}: {e}")
+            raise
+
+        with self._lock:
+            self.results.append(result)
+        return result
+
+    def drain(self):
+        """Block until every queued screenshot has been processed"""
+        for future in self._futures:
+            future.exception()
+        self._futures.clear()
+
+    def close(self):
+        self.drain()
+        self._executor.shutdown(wait=True)
+
+    def regressions_by_screen(self):
+        regressions = {}
+        for result in self.results:
+            if result.status == 'regression':
+                regressions.setdefault(result.screen, []).append(result)
+        return regressions
+
+    def summary_lines(self):
+        counts = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        lines = [', '.join(f"{count} {status}" for status, count in sorted(counts.items())) or 'no screenshots']
+
+        for screen, regressions in sorted(self.regressions_by_screen().items()):
+            lines.append(f"❌ {screen}: {len(regressions)} regression(s)")
+            for result in sorted(regressions, key=lambda r: r.name):
+                lines.append(f"     {result.name}: {result.diff_ratio:.2%} of pixels differ")
+
+        lines.extend(f"⚠️  {error}" for error in self.errors)
+        return lines
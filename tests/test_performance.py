@@ -0,0 +1,46 @@
+"""
+Test page load performance against perf_budgets.json
+"""
+import time
+from urllib.parse import urlparse
+from conftest import BASE_URL, load_page, wait_for_element, wait_for_url
+from test_idea_viewer import IDEA_CARD, BACK_BUTTON, PAGE_CONTENT
+
+class TestPerformance:
+
+    def test_login_page_load(self, driver, perf_recorder):
+        """Test the anonymous landing page, where users log in"""
+        load_page(driver, '/')
+        wait_for_element(driver, 'xpath', "//button[contains(., 'Login')]")
+
+        violations = perf_recorder.measure(driver, 'login')
+        print(f"  ⏱️  login: {len(violations)} budget violation(s)")
+
+    def test_dashboard_load(self, login_admin, perf_recorder):
+        """Test the dashboard with every idea visible to an admin"""
+        driver = login_admin
+
+        # Time to first idea card, under this screen's network and CPU profile
+        started = time.perf_counter()
+        driver.get(f'{BASE_URL}/dashboard')
+        wait_for_element(driver, 'css selector', IDEA_CARD)
+        first_card_ms = (time.perf_counter() - started) * 1000
+
+        violations = perf_recorder.measure(driver, 'dashboard', first_idea_card_ms=first_card_ms)
+        print(f"  ⏱️  dashboard: {len(violations)} budget violation(s)")
+
+    def test_idea_viewer_load(self, login_admin, perf_recorder):
+        """Test opening an idea directly by URL"""
+        driver = login_admin
+
+        wait_for_element(driver, 'css selector', IDEA_CARD)
+        driver.find_elements('css selector', IDEA_CARD)[0].click()
+        wait_for_url(driver, '/idea/')
+
+        # Reload the viewer as a fresh navigation so its timing is its own
+        load_page(driver, urlparse(driver.current_url).path)
+        wait_for_element(driver, 'xpath', BACK_BUTTON)
+        wait_for_element(driver, 'css selector', PAGE_CONTENT)
+
+        violations = perf_recorder.measure(driver, 'idea_viewer')
+        print(f"  ⏱️  idea_viewer: {len(violations)} budget violation(s)")
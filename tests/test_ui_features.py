@@ -2,195 +2,190 @@
 Test UI features: themes, modals, navigation
 """
 import pytest
-import time
-from conftest import take_screenshot
+from selenium.webdriver.common.keys import Keys
+from conftest import OPENAI_MOCKED, login_via_api, take_screenshot, load_page, wait_until, wait_for_element, wait_for_clickable, wait_for_url, wait_for_text
+
+THEME_BUTTON = "//button[.//*[contains(@class, 'lucide-palette')]]"
+CREATE_BUTTON = "//button[contains(., 'Create')]"
+DIALOG = '[role="dialog"]'
 
 class TestUIFeatures:
-    
+
     def test_theme_switching(self, login_admin):
         """Test theme selector works"""
         driver = login_admin
-        time.sleep(1)
-        
-        # Find theme button (palette icon)
-        try:
-            buttons = driver.find_elements('css selector', 'button')
-            for btn in buttons:
-                # Look for button with SVG (icons)
-                svgs = btn.find_elements('tag name', 'svg')
-                if svgs:
-                    try:
-                        btn.click()
-                        time.sleep(0.5)
-                        
-                        # Check if theme menu opened
-                        if 'Dark' in driver.page_source or 'Ocean' in driver.page_source:
-                            take_screenshot(driver, 'ui_01_theme_menu')
-                            
-                            # Try clicking Dark theme
-                            dark_option = driver.find_element('xpath', "//*[contains(text(), 'Dark')]")
-                            dark_option.click()
-                            time.sleep(1)
-                            
-                            take_screenshot(driver, 'ui_02_dark_theme')
-                            break
-                    except:
-                        continue
-        except Exception as e:
-            print(f"Theme test note: {e}")
-            take_screenshot(driver, 'ui_theme_issue')
-    
+
+        # Open theme menu (palette icon)
+        wait_for_clickable(driver, 'xpath', THEME_BUTTON)
+        driver.find_element('xpath', THEME_BUTTON).click()
+        wait_for_text(driver, 'Ocean')
+
+        take_screenshot(driver, 'ui_01_theme_menu')
+        assert 'Dark' in driver.page_source
+
+        # Click Dark theme
+        driver.find_element('xpath', "//*[@role='menuitem'][contains(., 'Dark')]").click()
+        wait_until(
+            driver,
+            lambda d: 'dark' in d.find_element('tag name', 'html').get_attribute('class').split(),
+            'dark theme class',
+        )
+
+        take_screenshot(driver, 'ui_02_dark_theme')
+        assert driver.execute_script("return localStorage.getItem('theme')") == 'dark'
+
     def test_browse_ideas_dropdown(self, login_admin):
         """Test browse ideas dropdown shows descriptions"""
         driver = login_admin
-        time.sleep(1)
-        
-        try:
-            browse_btn = driver.find_element('xpath', "//button[contains(., 'Browse Ideas')]")
-            browse_btn.click()
-            time.sleep(0.5)
-            
-            take_screenshot(driver, 'ui_03_browse_dropdown')
-            
-            # Should show ideas with descriptions
-            assert 'Educational' in driver.page_source or 'Smart Campus' in driver.page_source
-            
-            # Check for descriptions in dropdown
-            page_text = driver.page_source.lower()
-            assert 'ai-powered' in page_text or 'educational' in page_text or 'transforms' in page_text
-            
-            # Close dropdown
-            driver.find_element('tag name', 'body').click()
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"Browse dropdown note: {e}")
-            take_screenshot(driver, 'ui_browse_issue')
-    
+
+        wait_for_clickable(driver, 'xpath', "//button[contains(., 'Browse Ideas')]")
+        driver.find_element('xpath', "//button[contains(., 'Browse Ideas')]").click()
+        wait_for_element(driver, 'css selector', '[role="menu"] [role="menuitem"]')
+
+        take_screenshot(driver, 'ui_03_browse_dropdown')
+
+        # Should show ideas with descriptions
+        assert 'Educational' in driver.page_source or 'Smart Campus' in driver.page_source
+
+        # Check for descriptions in dropdown
+        page_text = driver.page_source.lower()
+        assert 'ai-powered' in page_text or 'educational' in page_text or 'transforms' in page_text
+
+        # Close dropdown
+        driver.find_element('tag name', 'body').click()
+
     def test_login_modal(self, driver):
         """Test login modal opens from navbar"""
-        driver.get('http://localhost:5173/dashboard')
-        time.sleep(1)
-        
-        try:
-            login_btn = driver.find_element('xpath', "//button[contains(., 'Login')]")
-            login_btn.click()
-            time.sleep(0.5)
-            
-            take_screenshot(driver, 'ui_04_login_modal')
-            
-            # Should show login modal
-            assert 'Login to HackIdeas' in driver.page_source or 'Username' in driver.page_source
-            
-            # Close modal (ESC key)
-            driver.find_element('tag name', 'body').send_keys('\ue00c')  # ESC key
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"Login modal note: {e}")
-            take_screenshot(driver, 'ui_login_modal_issue')
-    
+        load_page(driver, '/dashboard')
+
+        driver.find_element('xpath', "//button[contains(., 'Login')]").click()
+        wait_for_element(driver, 'css selector', DIALOG)
+
+        take_screenshot(driver, 'ui_04_login_modal')
+
+        # Should show login modal
+        assert 'Login to HackIdeas' in driver.page_source or 'Username' in driver.page_source
+
+        # Close modal (ESC key)
+        driver.find_element('tag name', 'body').send_keys(Keys.ESCAPE)
+
     def test_create_modal(self, login_admin):
         """Test create modal opens with both tabs"""
         driver = login_admin
-        time.sleep(1)
-        
-        try:
-            create_btn = driver.find_element('xpath', "//button[contains(., 'Create')]")
-            create_btn.click()
-            time.sleep(0.5)
-            
-            take_screenshot(driver, 'ui_06_create_modal')
-            
-            # Should show AI Generate tab (default)
-            assert 'AI Generate' in driver.page_source or 'Describe' in driver.page_source
-            
-            # Check for Upload ZIP tab
-            assert 'Upload ZIP' in driver.page_source or 'zip' in driver.page_source.lower()
-            
-            # Close modal
-            driver.find_element('tag name', 'body').send_keys('\ue00c')
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"Create modal note: {e}")
-            take_screenshot(driver, 'ui_create_issue')
-    
+
+        wait_for_clickable(driver, 'xpath', CREATE_BUTTON)
+        driver.find_element('xpath', CREATE_BUTTON).click()
+        wait_for_element(driver, 'css selector', DIALOG)
+
+        take_screenshot(driver, 'ui_06_create_modal')
+
+        # Should show AI Generate tab (default)
+        assert 'AI Generate' in driver.page_source or 'Describe' in driver.page_source
+
+        # Check for Upload ZIP tab
+        assert 'Upload ZIP' in driver.page_source or 'zip' in driver.page_source.lower()
+
+        # Close modal
+        driver.find_element('tag name', 'body').send_keys(Keys.ESCAPE)
+
     def test_ai_generate_tab(self, login_admin):
         """Test AI generate tab in create modal"""
         driver = login_admin
-        time.sleep(1)
-        
-        try:
-            create_btn = driver.find_element('xpath', "//button[contains(., 'Create')]")
-            create_btn.click()
-            time.sleep(0.5)
-            
-            # Should be on AI Generate tab by default
-            assert 'Describe Your Idea' in driver.page_source or 'AI' in driver.page_source
-            
-            take_screenshot(driver, 'ui_07_ai_generate_tab')
-            
-            # Check for textarea
-            textareas = driver.find_elements('tag name', 'textarea')
-            assert len(textareas) > 0
-            
-            # Check for Generate button
-            assert 'Generate' in driver.page_source
-            
-            # Close modal
-            driver.find_element('tag name', 'body').send_keys('\ue00c')
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"AI generate tab note: {e}")
-            take_screenshot(driver, 'ui_ai_generate_issue')
-    
+
+        wait_for_clickable(driver, 'xpath', CREATE_BUTTON)
+        driver.find_element('xpath', CREATE_BUTTON).click()
+        wait_for_element(driver, 'css selector', f'{DIALOG} textarea')
+
+        # Should be on AI Generate tab by default
+        assert 'Describe Your Idea' in driver.page_source or 'AI' in driver.page_source
+
+        take_screenshot(driver, 'ui_07_ai_generate_tab')
+
+        # Check for textarea
+        textareas = driver.find_elements('tag name', 'textarea')
+        assert len(textareas) > 0
+
+        # Check for Generate button
+        assert 'Generate' in driver.page_source
+
+        # Close modal
+        driver.find_element('tag name', 'body').send_keys(Keys.ESCAPE)
+
+    @pytest.mark.skipif(not OPENAI_MOCKED, reason='backend is not using mock_openai.py')
+    def test_ai_generate_submit(self, login_admin):
+        """Test submitting an AI generation end to end"""
+        driver = login_admin
+
+        wait_for_clickable(driver, 'xpath', CREATE_BUTTON)
+        driver.find_element('xpath', CREATE_BUTTON).click()
+        wait_for_element(driver, 'css selector', f'{DIALOG} textarea')
+
+        driver.find_element('css selector', f'{DIALOG} textarea').send_keys(
+            'An app that matches students with study partners for upcoming exams'
+        )
+        driver.find_element('xpath', "//button[contains(., 'Generate Idea')]").click()
+        wait_for_text(driver, 'Idea generated successfully', timeout=30)
+
+        take_screenshot(driver, 'ui_07b_ai_generate_success')
+
+        assert 'Idea generated successfully' in driver.page_source
+
+    @pytest.mark.skipif(not OPENAI_MOCKED, reason='backend is not using mock_openai.py')
+    def test_ai_generate_same_description_two_users(self, driver, session_cookies):
+        """Test that a second user can generate from a description another user already used"""
+        description = 'A shared calendar that finds free slots for group project meetings'
+
+        for role, text in (('admin', description), ('hacker', f'  {description.upper()} ')):
+            login_via_api(driver, session_cookies, role)
+
+            wait_for_clickable(driver, 'xpath', CREATE_BUTTON)
+            driver.find_element('xpath', CREATE_BUTTON).click()
+            wait_for_element(driver, 'css selector', f'{DIALOG} textarea')
+
+            driver.find_element('css selector', f'{DIALOG} textarea').send_keys(text)
+            driver.find_element('xpath', "//button[contains(., 'Generate Idea')]").click()
+            wait_for_text(driver, 'Idea generated successfully', 'similar name already exists', timeout=30)
+
+            take_screenshot(driver, f'ui_07c_ai_generate_shared_{role}')
+
+            assert 'similar name already exists' not in driver.page_source
+            assert 'Idea generated successfully' in driver.page_source
+
     def test_upload_zip_tab(self, login_admin):
         """Test Upload ZIP tab in create modal"""
         driver = login_admin
-        time.sleep(1)
-        
-        try:
-            create_btn = driver.find_element('xpath', "//button[contains(., 'Create')]")
-            create_btn.click()
-            time.sleep(0.5)
-            
-            # Click Upload ZIP tab
-            upload_tab = driver.find_element('xpath', "//button[contains(., 'Upload ZIP')]")
-            upload_tab.click()
-            time.sleep(0.5)
-            
-            take_screenshot(driver, 'ui_08_upload_zip_tab')
-            
-            # Should show upload instructions
-            assert 'Download' in driver.page_source or 'zip' in driver.page_source.lower()
-            assert 'metadata.json' in driver.page_source.lower()
-            
-            # Close modal
-            driver.find_element('tag name', 'body').send_keys('\ue00c')
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"Upload ZIP tab note: {e}")
-            take_screenshot(driver, 'ui_upload_zip_issue')
-    
+
+        wait_for_clickable(driver, 'xpath', CREATE_BUTTON)
+        driver.find_element('xpath', CREATE_BUTTON).click()
+        wait_for_element(driver, 'css selector', DIALOG)
+
+        # Click Upload ZIP tab
+        driver.find_element('xpath', "//button[contains(., 'Upload ZIP')]").click()
+        wait_for_text(driver, 'metadata.json')
+
+        take_screenshot(driver, 'ui_08_upload_zip_tab')
+
+        # Should show upload instructions
+        assert 'Download' in driver.page_source or 'zip' in driver.page_source.lower()
+        assert 'metadata.json' in driver.page_source.lower()
+
+        # Close modal
+        driver.find_element('tag name', 'body').send_keys(Keys.ESCAPE)
+
     def test_logo_navigation(self, login_admin):
         """Test clicking logo navigates to dashboard"""
         driver = login_admin
-        time.sleep(2)
-        
+
         # Navigate to an idea first
-        try:
-            idea_cards = driver.find_elements('css selector', '[class*="cursor-pointer"]')
-            if idea_cards:
-                idea_cards[0].click()
-                time.sleep(2)
-            
-            # Click logo
-            logo = driver.find_element('xpath', "//*[contains(@class, 'logo') or contains(., 'HackIdeas') or contains(., 'Lightbulb')]/..")
-            logo.click()
-            time.sleep(2)
-            
-            take_screenshot(driver, 'ui_09_logo_click')
-            
-            # Should be back on dashboard
-            assert '/dashboard' in driver.current_url
-        except Exception as e:
-            print(f"Logo navigation note: {e}")
-            take_screenshot(driver, 'ui_logo_issue')
+        wait_for_element(driver, 'css selector', '[class*="cursor-pointer"]')
+        driver.find_elements('css selector', '[class*="cursor-pointer"]')[0].click()
+        wait_for_url(driver, '/idea/')
+
+        # Click logo
+        driver.find_element('xpath', "//button[@aria-label='Go to dashboard']").click()
+        wait_for_url(driver, '/dashboard')
+
+        take_screenshot(driver, 'ui_09_logo_click')
+
+        # Should be back on dashboard
+        assert '/dashboard' in driver.current_url